@@ -0,0 +1,193 @@
+"""
+Penulis ActivityLog yang di-buffer dan ditulis secara batch
+
+View cukup memanggil log_activity(...) dengan argumen yang sama seperti
+ActivityLog.objects.create(...). Entri dikumpulkan di memori proses lalu
+ditulis sekaligus dengan bulk_create ketika:
+- jumlah entri mencapai ACTIVITY_LOG_BUFFER_SIZE,
+- sudah lewat ACTIVITY_LOG_FLUSH_INTERVAL detik (thread flusher di background),
+- request selesai (signal request_finished), atau
+- proses berhenti (atexit).
+
+Set ACTIVITY_LOG_ASYNC = False untuk menulis langsung secara sinkron seperti
+sebelumnya; ini default saat `manage.py test` karena TestCase tidak pernah
+menjalankan transaction.on_commit yang memasukkan entri ke buffer.
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+# Field relasi yang disimpan sebagai *_id agar buffer tidak menahan instance model
+RELATED_FIELDS = ('performed_by', 'related_order', 'related_member', 'related_device')
+
+
+def _is_async():
+    return getattr(settings, 'ACTIVITY_LOG_ASYNC', True)
+
+
+def _buffer_size():
+    return getattr(settings, 'ACTIVITY_LOG_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+
+
+def _flush_interval():
+    return getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+
+class ActivityLogBuffer:
+    """
+    Buffer thread-safe untuk entri ActivityLog di dalam satu proses
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, entry):
+        """Tambahkan satu entri (dict field ActivityLog) ke buffer"""
+        self._ensure_flusher()
+        with self._lock:
+            self._entries.append(entry)
+            should_flush = len(self._entries) >= _buffer_size()
+        if should_flush:
+            self.flush()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._entries)
+
+    def flush(self):
+        """
+        Tulis semua entri yang ada di buffer dengan satu bulk_create
+        Mengembalikan jumlah entri yang berhasil ditulis
+        """
+        with self._flush_lock:
+            with self._lock:
+                entries, self._entries = self._entries, []
+            if not entries:
+                return 0
+            return _write_entries(entries)
+
+    def _ensure_flusher(self):
+        """Jalankan thread flusher (sekali per proses, aman setelah fork)"""
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+                return
+            if self._pid != pid:
+                # Proses hasil fork tidak mewarisi entri milik proses induk
+                self._entries = []
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='activity-log-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(_flush_interval())
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Gagal menulis buffer ActivityLog')
+            finally:
+                # Thread ini punya koneksi database sendiri, jangan biarkan menggantung
+                connections.close_all()
+
+
+def _drop_deleted_relations(entries):
+    """
+    Kosongkan relasi ke objek yang sudah dihapus sebelum entri ditulis
+
+    FK ActivityLog memakai db_constraint=False (lihat migrasi 0015), jadi
+    database tidak menolak id yang sudah tidak ada. on_delete=SET_NULL hanya
+    berlaku untuk log yang sudah tertulis saat objek dihapus; entri yang masih
+    di buffer (mis. log 'member_deleted' dari member_delete) dicek di sini
+    dengan satu query per field relasi.
+    """
+    for name in RELATED_FIELDS:
+        key = f'{name}_id'
+        ids = {entry[key] for entry in entries if entry.get(key) is not None}
+        if not ids:
+            continue
+        model = ActivityLog._meta.get_field(name).related_model
+        existing = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        for entry in entries:
+            if entry.get(key) is not None and entry[key] not in existing:
+                entry[key] = None
+
+
+def _write_entries(entries):
+    """Tulis entri dengan satu bulk_create setelah relasi ke objek terhapus dikosongkan"""
+    _drop_deleted_relations(entries)
+    with transaction.atomic():
+        ActivityLog.objects.bulk_create([ActivityLog(**entry) for entry in entries])
+    return len(entries)
+
+
+_buffer = ActivityLogBuffer()
+
+
+def log_activity(**fields):
+    """
+    Catat aktivitas sistem
+
+    Menerima argumen yang sama dengan ActivityLog.objects.create(...).
+    Dalam mode async entri baru masuk buffer setelah transaksi yang sedang
+    berjalan di-commit, sehingga log dari transaksi yang di-rollback tidak ikut tertulis.
+    """
+    fields.setdefault('created_at', timezone.now())
+    fields.setdefault('metadata', {})
+
+    if not _is_async():
+        return ActivityLog.objects.create(**fields)
+
+    entry = {}
+    for key, value in fields.items():
+        if key in RELATED_FIELDS:
+            entry[f'{key}_id'] = value.pk if value is not None else None
+        else:
+            entry[key] = value
+
+    transaction.on_commit(lambda: _buffer.add(entry))
+    return None
+
+
+def flush_activity_logs():
+    """Paksa tulis semua ActivityLog yang masih ada di buffer"""
+    return _buffer.flush()
+
+
+def pending_activity_logs():
+    """Jumlah entri ActivityLog yang belum ditulis ke database"""
+    return _buffer.pending_count()
+
+
+def _flush_on_request_finished(sender, **kwargs):
+    if _buffer.pending_count():
+        try:
+            _buffer.flush()
+        except Exception:
+            logger.exception('Gagal menulis buffer ActivityLog di akhir request')
+
+
+request_finished.connect(_flush_on_request_finished, dispatch_uid='main.activity_log.flush')
+atexit.register(flush_activity_logs)
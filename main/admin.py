@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ForumUser, ForumPost, ForumComment, Admin, CustomerService, PurchaseOrder, Member, RangBotDevice, DetectionHistory, Notification, ProductInfo, FAQ, Article, ActivityLog
+from .models import ForumUser, ForumPost, ForumComment, Admin, CustomerService, PurchaseOrder, Member, RangBotDevice, DetectionHistory, DetectionJob, StoredImage, SensorReading, Notification, NotificationCounter, ProductInfo, FAQ, Article, ActivityLog, SequenceCounter
 
 
 @admin.register(ForumUser)
@@ -44,8 +44,8 @@ class MemberAdmin(admin.ModelAdmin):
 
 @admin.register(RangBotDevice)
 class RangBotDeviceAdmin(admin.ModelAdmin):
-    list_display = ('serial_number', 'device_name', 'covered_blocks', 'member', 'status', 'is_active', 'last_data_update', 'created_at')
-    list_filter = ('status', 'is_active', 'created_at')
+    list_display = ('serial_number', 'device_name', 'package_type', 'covered_blocks', 'member', 'status', 'is_active', 'last_data_update', 'created_at')
+    list_filter = ('package_type', 'status', 'is_active', 'created_at')
     search_fields = ('serial_number', 'device_name', 'covered_blocks', 'member__member_id', 'member__username')
     readonly_fields = ('created_at',)
 
@@ -56,6 +56,31 @@ class DetectionHistoryAdmin(admin.ModelAdmin):
     list_filter = ('detection_type', 'created_at')
     search_fields = ('device__serial_number', 'disease_detected', 'location')
     readonly_fields = ('created_at',)
+    raw_id_fields = ('image',)
+
+
+@admin.register(StoredImage)
+class StoredImageAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'width', 'height', 'size', 'created_at')
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'original', 'thumbnail', 'inference', 'width', 'height', 'size', 'created_at')
+
+
+@admin.register(DetectionJob)
+class DetectionJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'device', 'member', 'status', 'detection_type', 'created_at', 'finished_at')
+    list_filter = ('status', 'detection_type', 'created_at')
+    search_fields = ('device__serial_number', 'member__member_id')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
+    raw_id_fields = ('member', 'device', 'image', 'detection')
+
+
+@admin.register(SensorReading)
+class SensorReadingAdmin(admin.ModelAdmin):
+    list_display = ('device', 'recorded_at', 'temperature', 'humidity', 'position')
+    list_filter = ('recorded_at',)
+    search_fields = ('device__serial_number',)
+    raw_id_fields = ('device',)
 
 
 @admin.register(Notification)
@@ -66,6 +91,13 @@ class NotificationAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
 
 
+@admin.register(NotificationCounter)
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ('member', 'unread_count')
+    search_fields = ('member__member_id', 'member__full_name')
+    readonly_fields = ('member', 'unread_count')
+
+
 @admin.register(Admin)
 class AdminAdmin(admin.ModelAdmin):
     list_display = ('username', 'full_name', 'email', 'is_active', 'created_at', 'last_login')
@@ -122,3 +154,18 @@ class ActivityLogAdmin(admin.ModelAdmin):
     search_fields = ('description', 'performed_by__full_name', 'performed_by__username')
     readonly_fields = ('created_at',)
     date_hierarchy = 'created_at'
+
+
+@admin.register(SequenceCounter)
+class SequenceCounterAdmin(admin.ModelAdmin):
+    list_display = ('name', 'value')
+    search_fields = ('name',)
+    # Hanya untuk dilihat: mengubah, menambah, atau menghapus counter bisa menerbitkan
+    # ulang Member ID / nomor seri yang sudah dipakai. Counter diisi lewat reserve_sequence
+    readonly_fields = ('name', 'value')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,276 @@
+"""
+Pencarian Member dan PurchaseOrder untuk halaman admin dan CS
+
+Sebelumnya setiap pencarian menjalankan OR dari banyak `icontains`
+(LIKE '%x%' di beberapa kolom plus JOIN ke perangkat) yang selalu full scan.
+Sekarang setiap Member/PurchaseOrder punya token yang sudah dinormalisasi di
+tabel SearchToken:
+
+- ID member, nomor seri, dan ID order: hanya cocok persis
+  (MBR-2025-00492, RBT-SN-01-88401, #15)
+- nama, username, email, telepon, nama perangkat, perusahaan: cocok awalan
+  per kata ("bud" menemukan "Budi Santoso", "santoso" juga)
+
+Setiap kata query menjadi satu semi-join `pk IN (SELECT object_id ...)` yang
+dijawab lewat range scan index (entity, token, object_id), semua kata harus
+cocok. Token diperbarui lewat signal; bangun ulang seluruhnya dengan
+`python manage.py rebuild_admin_search_index`.
+"""
+
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+from .models import Member, PurchaseOrder, RangBotDevice, SearchToken
+
+MAX_TOKEN_LENGTH = 100
+MAX_QUERY_WORDS = 5
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+PHONE_RE = re.compile(r'^\+?[\d\s().-]{6,}$')
+# Kata yang diindex utuh sebagai token persis: ID member dan nomor seri (MBR-2025-00492, RBT-SN-01-88401)
+ID_RE = re.compile(r'^(?=.*[a-z])(?=.*\d)[a-z0-9]+(?:-[a-z0-9]+)+$')
+
+# Field yang memengaruhi token; save(update_fields=[...]) lain (mis. last_login) tidak perlu re-index
+MEMBER_FIELDS = {'member_id', 'username', 'full_name', 'email', 'phone'}
+ORDER_FIELDS = {'customer_name', 'customer_email', 'customer_phone', 'company_name', 'member_id'}
+DEVICE_FIELDS = {'serial_number', 'device_name', 'member'}
+
+
+# ==================== TOKENS ====================
+
+def normalize(text):
+    """Huruf kecil tanpa aksen"""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower().strip()
+
+
+def _phone_variants(phone):
+    """Nomor telepon sebagai digit saja, dengan variasi 08.. / 628.."""
+    digits = re.sub(r'\D', '', phone or '')
+    if not digits:
+        return []
+    variants = [digits]
+    if digits.startswith('62'):
+        variants.append('0' + digits[2:])
+    elif digits.startswith('0'):
+        variants.append('62' + digits[1:])
+    return variants
+
+
+def _text_tokens(*texts):
+    tokens = set()
+    for text in texts:
+        tokens.update(WORD_RE.findall(normalize(text)))
+    return tokens
+
+
+def _email_tokens(email):
+    email = normalize(email)
+    if not email:
+        return set()
+    # Email utuh untuk pencarian "budi@g", plus kata-katanya untuk "santoso"
+    return {email} | _text_tokens(email.split('@')[0])
+
+
+def build_tokens(exact=(), prefix=()):
+    """
+    Gabungkan token persis dan token awalan
+
+    Returns:
+        dict {token: is_prefix}; token yang muncul di keduanya dianggap awalan
+    """
+    tokens = {}
+    for token in exact:
+        token = normalize(token)[:MAX_TOKEN_LENGTH]
+        if token:
+            tokens[token] = False
+    for token in prefix:
+        token = token[:MAX_TOKEN_LENGTH]
+        if token:
+            tokens[token] = True
+    return tokens
+
+
+def member_tokens(member_id, username, full_name, email, phone, devices=()):
+    """
+    Token untuk satu member
+
+    Args:
+        devices: iterable (serial_number, device_name)
+    """
+    devices = list(devices)
+    return build_tokens(
+        exact=[member_id] + [serial for serial, _ in devices],
+        prefix=(
+            _text_tokens(username, full_name, *[name for _, name in devices])
+            | _email_tokens(email)
+            | set(_phone_variants(phone))
+            | ({normalize(username)} if username else set())
+        ),
+    )
+
+
+def order_tokens(order_id, member_id, customer_name, customer_email, customer_phone, company_name):
+    return build_tokens(
+        exact=[str(order_id)] + ([member_id] if member_id else []),
+        prefix=(
+            _text_tokens(customer_name, company_name)
+            | _email_tokens(customer_email)
+            | set(_phone_variants(customer_phone))
+        ),
+    )
+
+
+# ==================== INDEXING ====================
+
+def _replace_tokens(entity, object_id, tokens):
+    with transaction.atomic():
+        SearchToken.objects.filter(entity=entity, object_id=object_id).delete()
+        SearchToken.objects.bulk_create([
+            SearchToken(entity=entity, object_id=object_id, token=token, is_prefix=is_prefix)
+            for token, is_prefix in tokens.items()
+        ], batch_size=1000)
+
+
+def index_member(member_pk):
+    member = Member.objects.filter(pk=member_pk).first()
+    if member is None:
+        SearchToken.objects.filter(entity='member', object_id=member_pk).delete()
+        return
+    devices = member.rangbot_devices.values_list('serial_number', 'device_name')
+    _replace_tokens('member', member.pk, member_tokens(
+        member.member_id, member.username, member.full_name, member.email, member.phone, devices,
+    ))
+
+
+def index_members(member_pks):
+    """Index ulang banyak member sekaligus (dipakai setelah bulk_create perangkat)"""
+    for member_pk in set(member_pks):
+        index_member(member_pk)
+
+
+def index_order(order_pk):
+    order = PurchaseOrder.objects.filter(pk=order_pk).first()
+    if order is None:
+        SearchToken.objects.filter(entity='order', object_id=order_pk).delete()
+        return
+    _replace_tokens('order', order.pk, order_tokens(
+        order.pk, order.member_id, order.customer_name, order.customer_email,
+        order.customer_phone, order.company_name,
+    ))
+
+
+def rebuild_index():
+    """Bangun ulang seluruh token member dan purchase order"""
+    SearchToken.objects.all().delete()
+    members = orders = 0
+    for member_pk in Member.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=1000):
+        index_member(member_pk)
+        members += 1
+    for order_pk in PurchaseOrder.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=1000):
+        index_order(order_pk)
+        orders += 1
+    return members, orders
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or bool(fields & set(update_fields))
+
+
+def _member_saved(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, MEMBER_FIELDS):
+        transaction.on_commit(lambda: index_member(instance.pk))
+
+
+def _member_deleted(sender, instance, **kwargs):
+    SearchToken.objects.filter(entity='member', object_id=instance.pk).delete()
+
+
+def _device_changed(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, DEVICE_FIELDS):
+        member_pk = instance.member_id
+        transaction.on_commit(lambda: index_member(member_pk))
+
+
+def _order_saved(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, ORDER_FIELDS):
+        transaction.on_commit(lambda: index_order(instance.pk))
+
+
+def _order_deleted(sender, instance, **kwargs):
+    SearchToken.objects.filter(entity='order', object_id=instance.pk).delete()
+
+
+post_save.connect(_member_saved, sender=Member, dispatch_uid='main.admin_search.member_save')
+post_delete.connect(_member_deleted, sender=Member, dispatch_uid='main.admin_search.member_delete')
+post_save.connect(_device_changed, sender=RangBotDevice, dispatch_uid='main.admin_search.device_save')
+post_delete.connect(_device_changed, sender=RangBotDevice, dispatch_uid='main.admin_search.device_delete')
+post_save.connect(_order_saved, sender=PurchaseOrder, dispatch_uid='main.admin_search.order_save')
+post_delete.connect(_order_deleted, sender=PurchaseOrder, dispatch_uid='main.admin_search.order_delete')
+
+
+# ==================== QUERY ====================
+
+def prefix_range(field, value):
+    """
+    Q untuk `field` diawali `value` sebagai range (>= value AND < value berikutnya)
+    Berbeda dengan LIKE, range selalu bisa memakai index B-tree di semua database
+    """
+    upper = value[:-1] + chr(ord(value[-1]) + 1)
+    return Q(**{f'{field}__gte': value, f'{field}__lt': upper})
+
+
+def _query_tokens(word):
+    """Token untuk satu kata query, dipecah dengan aturan yang sama seperti saat indexing"""
+    word = word.strip('#,;:()"\'.')
+    if ID_RE.match(word) or '@' in word:
+        # ID member/nomor seri cocok persis, email diindex utuh
+        return [word]
+    if PHONE_RE.match(word):
+        return [re.sub(r'\D', '', word)]
+    # "nur-aini" -> nur, aini; "pt." -> pt; "o'brien" -> o, brien; "#15" -> 15
+    return WORD_RE.findall(word)
+
+
+def parse_query(query):
+    """Pecah query menjadi token ternormalisasi; nomor telepon digabung menjadi digit"""
+    query = (query or '').strip()
+    if PHONE_RE.match(query):
+        return [re.sub(r'\D', '', query)]
+    words = []
+    for word in normalize(query).split():
+        for token in _query_tokens(word):
+            token = token[:MAX_TOKEN_LENGTH]
+            if token and token not in words:
+                words.append(token)
+    return words[:MAX_QUERY_WORDS]
+
+
+def search_filter(entity, query):
+    """
+    Q untuk primary key objek `entity` yang cocok dengan semua kata query
+
+    Returns:
+        Q, atau None jika query kosong
+    """
+    words = parse_query(query)
+    if not words:
+        return None
+    condition = Q()
+    for word in words:
+        matches = SearchToken.objects.filter(
+            Q(token=word) | (Q(is_prefix=True) & prefix_range('token', word)),
+            entity=entity,
+        ).values('object_id')
+        condition &= Q(pk__in=matches)
+    return condition
+
+
+def apply_search(queryset, entity, query):
+    """Filter queryset Member ('member') atau PurchaseOrder ('order') dengan query pencarian"""
+    condition = search_filter(entity, query)
+    return queryset if condition is None else queryset.filter(condition)
@@ -3,25 +3,37 @@ Admin views untuk sistem admin RangBot
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import JsonResponse
 from django.contrib import messages
 from django.urls import reverse
 from django.utils import timezone
+from django.conf import settings
 from django.db import transaction, models
+from asgiref.sync import sync_to_async
 from urllib.parse import urlencode
-from .models import Admin, PurchaseOrder, Member, RangBotDevice, CustomerService, ProductInfo, FAQ, Article, ActivityLog, ForumPost, ForumComment, Notification
-from .utils import generate_member_id, generate_serial_number, get_next_serial_sequence
-from django.contrib.auth.hashers import make_password
+import logging
+from .models import Admin, PurchaseOrder, Member, RangBotDevice, DetectionHistory, CustomerService, ProductInfo, FAQ, Article, ActivityLog, ForumPost, ForumComment, Notification
+from .utils import arender, generate_member_id, device_stats_by_member
+from .provisioning import provision_devices
+from .pagination import paginate_keyset
+from .activity_log import log_activity, flush_activity_logs
+from .retention import delete_activity_logs_chunked
+from .dashboard_stats import get_dashboard_stats, invalidate_dashboard_stats
+from .admin_search import apply_search, prefix_range
+from .content_cache import FAQS, PRODUCTS, invalidate_content
+from .identity import get_principal
+from .exports import (
+    ACTIVITY_LOG_EXPORT_FIELDS, PURCHASE_ORDER_EXPORT_FIELDS, ExportError,
+    export_detections, export_queryset, filter_date_range,
+)
+from .password_hashing import BUSY_MESSAGE as HASHING_BUSY_MESSAGE, PasswordHashingBusy, amake_password, hashing_stats
+
+logger = logging.getLogger(__name__)
 
 
 def get_admin(request):
-    """Helper function untuk mendapatkan admin dari session"""
-    admin_id = request.session.get('admin_id')
-    if admin_id:
-        try:
-            return Admin.objects.get(id=admin_id, is_active=True)
-        except Admin.DoesNotExist:
-            return None
-    return None
+    """Helper function untuk mendapatkan admin dari session (sekali per request, lihat main/identity.py)"""
+    return get_principal(request, 'admin')
 
 
 # admin_login function removed - now using unified login at /login/
@@ -46,21 +58,8 @@ def admin_dashboard(request):
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
-    # Get statistics
-    pending_orders = PurchaseOrder.objects.filter(status='pending').count()
-    verified_orders = PurchaseOrder.objects.filter(status='verified').count()
-    rejected_orders = PurchaseOrder.objects.filter(status='rejected').count()
-    total_orders = PurchaseOrder.objects.count()
-    from django.db.models import Sum
-    total_revenue = PurchaseOrder.objects.filter(status='verified').aggregate(total=Sum('total_price'))['total'] or 0
-    total_members = Member.objects.count()
-    registered_members = Member.objects.filter(is_registered=True).count()
-    unregistered_members = Member.objects.filter(is_registered=False).count()
-    total_devices = RangBotDevice.objects.count()
-    active_devices = RangBotDevice.objects.filter(status='active', is_active=True).count()
-    inactive_devices = RangBotDevice.objects.filter(status='inactive').count()
-    total_admins = Admin.objects.filter(is_active=True).count()
-    total_cs = CustomerService.objects.filter(is_active=True).count()
+    # Statistik dari cache (satu query conditional aggregation per tabel saat cache kosong)
+    stats = get_dashboard_stats()
     
     # Recent data - ensure queries are evaluated properly
     try:
@@ -99,19 +98,7 @@ def admin_dashboard(request):
     context = {
         'page_title': 'Dashboard Admin - RangBot',
         'admin': admin,
-        'pending_orders': pending_orders,
-        'verified_orders': verified_orders,
-        'rejected_orders': rejected_orders,
-        'total_orders': total_orders,
-        'total_revenue': total_revenue,
-        'total_members': total_members,
-        'registered_members': registered_members,
-        'unregistered_members': unregistered_members,
-        'total_devices': total_devices,
-        'active_devices': active_devices,
-        'inactive_devices': inactive_devices,
-        'total_admins': total_admins,
-        'total_cs': total_cs,
+        **stats,
         'recent_orders': recent_orders,
         'recent_activities': recent_activities,
         'recent_members': recent_members,
@@ -121,6 +108,16 @@ def admin_dashboard(request):
     return render(request, 'admin/dashboard.html', context)
 
 
+def filter_purchase_orders(orders, status_filter, search_query):
+    """Filter status dan pencarian untuk daftar dan export purchase order"""
+    if status_filter:
+        orders = orders.filter(status=status_filter)
+    
+    if search_query:
+        orders = apply_search(orders, 'order', search_query)
+    return orders
+
+
 def purchase_orders_list(request):
     """
     View untuk menampilkan daftar purchase orders
@@ -136,69 +133,67 @@ def purchase_orders_list(request):
     
     # Get orders - ensure we get all orders with proper error handling
     try:
-        orders_queryset = PurchaseOrder.objects.all().order_by('-created_at')
+        # Status member di-resolve lewat subquery dalam satu query (bukan 1 query per order)
+        # Jika member sudah dihapus, order.member_id akan tetap ada tapi member tidak ada di database
+        member_qs = Member.objects.filter(member_id=models.OuterRef('member_id'))
+        orders_queryset = PurchaseOrder.objects.annotate(
+            member_exists=models.Exists(member_qs),
+            member_is_active=models.Subquery(member_qs.values('is_active')[:1]),
+        )
         
         # Apply filters
-        if status_filter:
-            orders_queryset = orders_queryset.filter(status=status_filter)
-        
-        if search_query:
-            orders_queryset = orders_queryset.filter(
-                models.Q(customer_name__icontains=search_query) |
-                models.Q(customer_email__icontains=search_query) |
-                models.Q(customer_phone__icontains=search_query) |
-                models.Q(member_id__icontains=search_query) |
-                models.Q(id__icontains=search_query)
-            )
+        orders_queryset = filter_purchase_orders(orders_queryset, status_filter, search_query)
         
-        # Evaluate queryset to list to ensure data is retrieved
-        orders = list(orders_queryset)
+        # Keyset pagination server-side - jumlah query tetap berapapun jumlah order
+        def with_member_status(orders):
+            return [
+                {
+                    'order': order,
+                    'member_exists': bool(order.member_exists),
+                    'member_is_active': bool(order.member_is_active),
+                }
+                for order in orders
+            ]
         
-        # Check for each order if member exists
-        # Jika member sudah dihapus, order.member_id akan tetap ada tapi member tidak ada di database
-        orders_with_member_status = []
-        for order in orders:
-            member_exists = False
-            member_is_active = False
-            if order.member_id:
-                try:
-                    member = Member.objects.get(member_id=order.member_id)
-                    member_exists = True
-                    member_is_active = member.is_active
-                except Member.DoesNotExist:
-                    # Member sudah dihapus dari database
-                    member_exists = False
-                    member_is_active = False
-            orders_with_member_status.append({
-                'order': order,
-                'member_exists': member_exists,
-                'member_is_active': member_is_active
-            })
+        orders_with_member_status = paginate_keyset(orders_queryset, request, per_page=25, transform=with_member_status)
     except Exception as e:
         # If there's any error, log it and return empty list
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error fetching purchase orders: {str(e)}")
         orders_with_member_status = []
         messages.error(request, f'Terjadi kesalahan saat memuat data purchase orders: {str(e)}')
     
-    # Debug: Log the count of orders
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"Purchase Orders List - Total orders: {len(orders_with_member_status)}")
-    
     context = {
         'page_title': 'Daftar Purchase Orders - Admin',
         'admin': admin,
         'orders_with_status': orders_with_member_status,
         'status_filter': status_filter,
         'search_query': search_query,
-        'orders_count': len(orders_with_member_status),  # Add count for debugging
     }
     
     return render(request, 'admin/purchase_orders.html', context)
 
 
+def purchase_orders_export(request):
+    """
+    Export purchase order (streaming CSV/JSONL) dengan filter yang sama seperti daftar
+    Parameter: ?format=csv|jsonl, ?gzip=1, ?status, ?search
+    """
+    admin = get_admin(request)
+    if not admin:
+        messages.warning(request, 'Anda harus login terlebih dahulu.')
+        return redirect('main:login')
+    
+    orders = filter_purchase_orders(
+        PurchaseOrder.objects.all(),
+        request.GET.get('status', ''),
+        request.GET.get('search', '').strip(),
+    )
+    try:
+        return export_queryset(orders, PURCHASE_ORDER_EXPORT_FIELDS, request.GET, f'purchase-orders-{timezone.localdate():%Y%m%d}')
+    except ExportError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
 def purchase_order_detail(request, order_id):
     """
     View untuk menampilkan detail purchase order
@@ -239,7 +234,6 @@ def purchase_order_detail(request, order_id):
     return render(request, 'admin/purchase_order_detail.html', context)
 
 
-@transaction.atomic
 def verify_purchase(request, order_id):
     """
     View untuk verifikasi purchase order
@@ -256,126 +250,84 @@ def verify_purchase(request, order_id):
         messages.error(request, 'Order ini sudah diverifikasi atau ditolak.')
         return redirect('main:purchase_order_detail', order_id=order_id)
     
+    if order.get_total_units() == 0:
+        messages.error(request, 'Jumlah unit tidak valid.')
+        return redirect('main:purchase_order_detail', order_id=order_id)
+    
     try:
-        # Check if this is a reorder
-        is_reorder = False
-        original_member_id = None
-        
-        if order.is_reorder and order.original_member_id:
-            # This is a reorder - use existing member
-            is_reorder = True
-            original_member_id = order.original_member_id
-            try:
-                member = Member.objects.get(member_id=original_member_id)
-            except Member.DoesNotExist:
-                messages.error(request, f'Member ID {original_member_id} tidak ditemukan untuk pembelian ulang.')
+        # Semua perubahan dibatalkan bersama jika ada langkah yang gagal
+        with transaction.atomic():
+            # Kunci order agar dua admin tidak memverifikasi order yang sama bersamaan
+            order = PurchaseOrder.objects.select_for_update().get(id=order_id)
+            if order.status != 'pending':
+                messages.error(request, 'Order ini sudah diverifikasi atau ditolak.')
                 return redirect('main:purchase_order_detail', order_id=order_id)
-        else:
-            # New purchase - generate Member ID
-            member_id = generate_member_id()
             
-            # Check if Member ID already exists
-            if Member.objects.filter(member_id=member_id).exists():
-                # Regenerate if exists (shouldn't happen, but just in case)
+            # Check if this is a reorder
+            is_reorder = False
+            original_member_id = None
+            
+            if order.is_reorder and order.original_member_id:
+                # This is a reorder - use existing member
+                is_reorder = True
+                original_member_id = order.original_member_id
+                try:
+                    member = Member.objects.get(member_id=original_member_id)
+                except Member.DoesNotExist:
+                    messages.error(request, f'Member ID {original_member_id} tidak ditemukan untuk pembelian ulang.')
+                    return redirect('main:purchase_order_detail', order_id=order_id)
+            else:
+                # New purchase - generate Member ID (dialokasikan atomik, tidak bisa bentrok)
                 member_id = generate_member_id()
+                
+                # Create Member record (belum registrasi)
+                member = Member.objects.create(
+                    member_id=member_id,
+                    full_name=order.customer_name,
+                    email=order.customer_email,
+                    phone=order.customer_phone,
+                    purchase_order=order,
+                    is_registered=False
+                )
+                
+                order.member_id = member_id
             
-            # Create Member record (belum registrasi)
-            member = Member.objects.create(
-                member_id=member_id,
-                full_name=order.customer_name,
-                email=order.customer_email,
-                phone=order.customer_phone,
-                purchase_order=order,
-                is_registered=False
-            )
+            # Update order status
+            order.status = 'verified'
+            order.verified_at = timezone.now()
+            order.verified_by = admin
+            if is_reorder:
+                order.original_member_id = original_member_id
+            order.save()
             
-            order.member_id = member_id
-        
-        # Generate Serial Numbers
-        total_units = order.get_total_units()
-        if total_units == 0:
-            messages.error(request, 'Jumlah unit tidak valid.')
-            return redirect('main:purchase_order_detail', order_id=order_id)
-        
-        # Get starting sequence
-        start_sequence = get_next_serial_sequence()
-        
-        # Generate devices
-        devices_created = []
-        sequence = start_sequence
-        
-        # Basic packages
-        for i in range(order.qty_basic):
-            serial_number = generate_serial_number(sequence)
-            device = RangBotDevice.objects.create(
-                serial_number=serial_number,
-                member=member,
-                purchase_order=order,
-                device_name=f'RangBot Basic {i+1}',
-                status='offline',
-                is_active=True
-            )
-            devices_created.append(device)
-            sequence += 1
-        
-        # Professional packages
-        for i in range(order.qty_professional):
-            serial_number = generate_serial_number(sequence)
-            device = RangBotDevice.objects.create(
-                serial_number=serial_number,
-                member=member,
-                purchase_order=order,
-                device_name=f'RangBot Pro {i+1}',
-                status='offline',
-                is_active=True
-            )
-            devices_created.append(device)
-            sequence += 1
-        
-        # Update order status
-        order.status = 'verified'
-        order.verified_at = timezone.now()
-        order.verified_by = admin
-        if is_reorder:
-            order.original_member_id = original_member_id
-        order.save()
-        
-        # Create activity log
-        ActivityLog.objects.create(
-            action_type='order_verified',
-            description=f'Order #{order.id} diverifikasi. Member ID: {order.member_id}, {len(devices_created)} device(s) dibuat.',
-            performed_by=admin,
-            related_order=order,
-            related_member=member,
-            metadata={
-                'member_id': order.member_id,
-                'devices_count': len(devices_created),
-                'is_reorder': is_reorder,
-            }
-        )
-        
-        # Log member creation if new
-        if not is_reorder:
-            ActivityLog.objects.create(
-                action_type='member_created',
-                description=f'Member ID {order.member_id} dibuat untuk {order.customer_name}',
-                performed_by=admin,
-                related_order=order,
-                related_member=member,
-            )
-        
-        # Log serial number creation
-        for device in devices_created:
-            ActivityLog.objects.create(
-                action_type='serial_created',
-                description=f'Nomor seri {device.serial_number} dibuat untuk Member {order.member_id}',
+            # Generate devices: nomor seri, perangkat, log, dan notifikasi ditulis per batch
+            devices_count = provision_devices(order, member, admin)
+            
+            # Create activity log
+            log_activity(
+                action_type='order_verified',
+                description=f'Order #{order.id} diverifikasi. Member ID: {order.member_id}, {devices_count} device(s) dibuat.',
                 performed_by=admin,
                 related_order=order,
                 related_member=member,
-                related_device=device,
+                metadata={
+                    'member_id': order.member_id,
+                    'devices_count': devices_count,
+                    'is_reorder': is_reorder,
+                }
             )
+            
+            # Log member creation if new
+            if not is_reorder:
+                log_activity(
+                    action_type='member_created',
+                    description=f'Member ID {order.member_id} dibuat untuk {order.customer_name}',
+                    performed_by=admin,
+                    related_order=order,
+                    related_member=member,
+                )
         
-        messages.success(request, f'Order berhasil diverifikasi! Member ID: {order.member_id}, {len(devices_created)} device(s) dibuat.')
+        messages.success(request, f'Order berhasil diverifikasi! Member ID: {order.member_id}, {devices_count} device(s) dibuat.')
         return redirect('main:purchase_order_detail', order_id=order_id)
         
     except Exception as e:
@@ -409,7 +361,7 @@ def reject_purchase(request, order_id):
         order.save()
         
         # Create activity log
-        ActivityLog.objects.create(
+        log_activity(
             action_type='order_rejected',
             description=f'Order #{order.id} ditolak. Alasan: {reason or "Tidak disebutkan"}',
             performed_by=admin,
@@ -447,24 +399,20 @@ def members_list(request):
     
     # Apply filters
     if search_query:
-        members = members.filter(
-            models.Q(member_id__icontains=search_query) |
-            models.Q(username__icontains=search_query) |
-            models.Q(full_name__icontains=search_query) |
-            models.Q(email__icontains=search_query)
-        )
+        members = apply_search(members, 'member', search_query)
     
     if registered_filter == 'yes':
         members = members.filter(is_registered=True)
     elif registered_filter == 'no':
         members = members.filter(is_registered=False)
     
-    members = members.order_by('-created_at')
+    # Keyset pagination berdasarkan (created_at, id)
+    members_page = paginate_keyset(members, request)
     
     context = {
         'page_title': 'Manajemen Member - Admin',
         'admin': admin,
-        'members': members,
+        'members': members_page,
         'search_query': search_query,
         'registered_filter': registered_filter,
     }
@@ -496,6 +444,31 @@ def member_detail(request, member_id):
     return render(request, 'admin/member_detail.html', context)
 
 
+def member_detections_export(request, member_id):
+    """
+    Export riwayat deteksi perangkat milik member (streaming CSV/NDJSON)
+    Parameter: ?device=<nomor seri>, ?format=csv|ndjson, ?gzip=1, ?date_from, ?date_to, ?disease, ?detection_type
+    """
+    admin = get_admin(request)
+    if not admin:
+        messages.warning(request, 'Anda harus login terlebih dahulu.')
+        return redirect('main:login')
+    
+    member = get_object_or_404(Member, member_id=member_id)
+    detections = DetectionHistory.objects.filter(device__member=member)
+    filename = f'deteksi-{member.member_id}'
+    serial_number = request.GET.get('device', '').strip()
+    if serial_number:
+        device = get_object_or_404(RangBotDevice, serial_number=serial_number, member=member)
+        detections = detections.filter(device=device)
+        filename = f'deteksi-{device.serial_number}'
+    
+    try:
+        return export_detections(detections, request.GET, filename)
+    except ExportError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
 def member_toggle_active(request, member_id):
     """
     View untuk freeze/activate member
@@ -515,7 +488,7 @@ def member_toggle_active(request, member_id):
         
         # Create activity log
         action_type = 'member_activated' if member.is_active else 'member_deactivated'
-        ActivityLog.objects.create(
+        log_activity(
             action_type=action_type,
             description=f'Member {member.member_id} ({member.full_name}) {"diaktifkan" if member.is_active else "dinonaktifkan"}',
             performed_by=admin,
@@ -552,7 +525,7 @@ def member_delete(request, member_id):
         devices.delete()
         
         # Create activity log sebelum menghapus member
-        ActivityLog.objects.create(
+        log_activity(
             action_type='member_deleted',
             description=f'Member {member_id_str} ({member_name}) dihapus secara permanen. {devices_count} device(s) dihapus.',
             performed_by=admin,
@@ -590,7 +563,7 @@ def remove_member_from_order(request, order_id):
         order.save()
         
         # Create activity log
-        ActivityLog.objects.create(
+        log_activity(
             action_type='order_updated',
             description=f'Member ID {old_member_id} dihapus dari Order #{order.id} ({order.customer_name})',
             performed_by=admin,
@@ -639,9 +612,11 @@ def delete_purchase_order_data(request, order_id):
         if member:
             member_devices = RangBotDevice.objects.filter(member=member)
             member_devices.update(is_active=False)
+        # QuerySet.update() tidak memicu post_save
+        invalidate_dashboard_stats('devices')
         
         # Create activity log sebelum menghapus
-        ActivityLog.objects.create(
+        log_activity(
             action_type='order_deleted',
             description=f'Purchase Order #{order.id} ({customer_name}) dihapus. Member {member_id_str or "N/A"} dinonaktifkan. {devices_count} device(s) dinonaktifkan.',
             performed_by=admin,
@@ -691,7 +666,7 @@ def member_edit(request, member_id):
                 member.save()
                 
                 # Create activity log
-                ActivityLog.objects.create(
+                log_activity(
                     action_type='member_updated',
                     description=f'Data member {member.member_id} diperbarui',
                     performed_by=admin,
@@ -726,44 +701,22 @@ def serial_numbers_list(request):
     search_query = request.GET.get('search', '').strip()
     member_filter = request.GET.get('member', '').strip()
     
-    # Get all members that have devices - use prefetch_related for optimization
-    members = Member.objects.filter(rangbot_devices__isnull=False).prefetch_related('rangbot_devices').distinct()
+    # Member yang punya perangkat (EXISTS, tanpa JOIN + DISTINCT)
+    members = Member.objects.filter(models.Exists(RangBotDevice.objects.filter(member=models.OuterRef('pk'))))
     
     # Apply filters
     if search_query:
-        members = members.filter(
-            models.Q(member_id__icontains=search_query) |
-            models.Q(full_name__icontains=search_query) |
-            models.Q(email__icontains=search_query) |
-            models.Q(username__icontains=search_query) |
-            models.Q(rangbot_devices__serial_number__icontains=search_query) |
-            models.Q(rangbot_devices__device_name__icontains=search_query)
-        ).distinct()
+        members = apply_search(members, 'member', search_query)
     
     if member_filter:
-        members = members.filter(member_id__icontains=member_filter)
-    
-    # Get member statistics (device counts by type)
-    members_with_stats = []
-    for member in members.order_by('-created_at'):
-        all_devices = member.rangbot_devices.all()
-        pro_count = 0
-        basic_count = 0
-        total_count = all_devices.count()
-        
-        for device in all_devices:
-            device_name_lower = (device.device_name or '').lower()
-            if 'pro' in device_name_lower or 'professional' in device_name_lower:
-                pro_count += 1
-            else:
-                basic_count += 1
-        
-        members_with_stats.append({
-            'member': member,
-            'total_devices': total_count,
-            'pro_count': pro_count,
-            'basic_count': basic_count,
-        })
+        members = members.filter(prefix_range('member_id', member_filter.upper()))
+    
+    def build_member_stats(page_members):
+        # Statistik perangkat satu halaman: satu query GROUP BY member, package_type
+        stats = device_stats_by_member([member.pk for member in page_members])
+        return [{'member': member, **stats[member.pk]} for member in page_members]
+    
+    members_with_stats = paginate_keyset(members, request, transform=build_member_stats)
     
     context = {
         'page_title': 'Manajemen Nomor Seri - Admin',
@@ -796,8 +749,7 @@ def serial_number_detail(request, member_id):
     basic_devices = []
     
     for device in all_devices:
-        device_name_lower = (device.device_name or '').lower()
-        if 'pro' in device_name_lower or 'professional' in device_name_lower:
+        if device.package_type == 'professional':
             pro_devices.append(device)
         else:
             basic_devices.append(device)
@@ -856,56 +808,87 @@ def cs_list(request):
     return render(request, 'admin/cs_list.html', context)
 
 
-def cs_add(request):
+def _account_form_error(model, username, email, full_name, password):
+    """
+    Validasi form tambah Admin/CS (tanpa hashing)
+
+    Returns:
+        pesan error, atau None jika valid
+    """
+    if not all([username, email, full_name, password]):
+        return 'Harap lengkapi semua field.'
+    if len(password) < 8:
+        return 'Password minimal 8 karakter.'
+    if model.objects.filter(username=username).exists():
+        return 'Username sudah digunakan.'
+    if model.objects.filter(email=email).exists():
+        return 'Email sudah terdaftar.'
+    return None
+
+
+def _account_form_data(request):
+    return (
+        request.POST.get('username', '').strip(),
+        request.POST.get('email', '').strip(),
+        request.POST.get('full_name', '').strip(),
+        request.POST.get('password', '').strip(),
+    )
+
+
+def _create_cs(admin, username, email, full_name, password_hash):
+    cs = CustomerService.objects.create(
+        username=username,
+        email=email,
+        full_name=full_name,
+        password=password_hash,
+        is_active=True
+    )
+    
+    # Create activity log
+    log_activity(
+        action_type='cs_created',
+        description=f'Customer Service {cs.full_name} ({cs.username}) berhasil ditambahkan',
+        performed_by=admin,
+        metadata={'cs_id': cs.id, 'username': cs.username}
+    )
+    return cs
+
+
+async def cs_add(request):
     """
     View untuk menambahkan Customer Service baru
+    Hash password dibuat di thread pool hashing (main/password_hashing.py)
     """
-    admin = get_admin(request)
+    admin = await sync_to_async(get_admin)(request)
     if not admin:
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
+    status = 200
     if request.method == 'POST':
-        username = request.POST.get('username', '').strip()
-        email = request.POST.get('email', '').strip()
-        full_name = request.POST.get('full_name', '').strip()
-        password = request.POST.get('password', '').strip()
+        username, email, full_name, password = _account_form_data(request)
         
         # Validation
-        if not all([username, email, full_name, password]):
-            messages.error(request, 'Harap lengkapi semua field.')
-        elif len(password) < 8:
-            messages.error(request, 'Password minimal 8 karakter.')
-        elif CustomerService.objects.filter(username=username).exists():
-            messages.error(request, 'Username sudah digunakan.')
-        elif CustomerService.objects.filter(email=email).exists():
-            messages.error(request, 'Email sudah terdaftar.')
+        error = await sync_to_async(_account_form_error)(CustomerService, username, email, full_name, password)
+        if error:
+            messages.error(request, error)
         else:
-            cs = CustomerService.objects.create(
-                username=username,
-                email=email,
-                full_name=full_name,
-                password=make_password(password),
-                is_active=True
-            )
-            
-            # Create activity log
-            ActivityLog.objects.create(
-                action_type='cs_created',
-                description=f'Customer Service {cs.full_name} ({cs.username}) berhasil ditambahkan',
-                performed_by=admin,
-                metadata={'cs_id': cs.id, 'username': cs.username}
-            )
-            
-            messages.success(request, f'Customer Service {cs.full_name} berhasil ditambahkan.')
-            return redirect('main:cs_list')
+            try:
+                password_hash = await amake_password(password)
+            except PasswordHashingBusy:
+                messages.error(request, HASHING_BUSY_MESSAGE)
+                status = 503
+            else:
+                cs = await sync_to_async(_create_cs)(admin, username, email, full_name, password_hash)
+                messages.success(request, f'Customer Service {cs.full_name} berhasil ditambahkan.')
+                return redirect('main:cs_list')
     
     context = {
         'page_title': 'Tambah Customer Service - Admin',
         'admin': admin,
     }
     
-    return render(request, 'admin/cs_add.html', context)
+    return await arender(request, 'admin/cs_add.html', context, status=status)
 
 
 def cs_delete(request, cs_id):
@@ -924,7 +907,7 @@ def cs_delete(request, cs_id):
         cs_username = cs.username
         
         # Create activity log before deletion
-        ActivityLog.objects.create(
+        log_activity(
             action_type='cs_deleted',
             description=f'Customer Service {cs_name} ({cs_username}) dihapus',
             performed_by=admin,
@@ -1003,7 +986,6 @@ def product_info_list(request):
     
     # Forum: Get posts with filters (similar to CS forum)
     from django.db.models import Q
-    from django.core.paginator import Paginator
     
     forum_posts = ForumPost.objects.select_related('author').prefetch_related('comments', 'comments__author', 'comments__replied_by_cs').all()
     
@@ -1021,19 +1003,8 @@ def product_info_list(request):
     if category_filter:
         forum_posts = forum_posts.filter(category=category_filter)
     
-    # Apply sorting
-    if sort_by == 'oldest':
-        forum_posts = forum_posts.order_by('created_at')
-    else:  # newest (default)
-        forum_posts = forum_posts.order_by('-created_at')
-    
-    # Pagination for forum posts
-    paginator = Paginator(forum_posts, 10)  # 10 posts per page
-    page = request.GET.get('page', 1)
-    try:
-        forum_posts_page = paginator.get_page(page)
-    except:
-        forum_posts_page = paginator.get_page(1)
+    # Pagination for forum posts (keyset, 10 posts per page)
+    forum_posts_page = paginate_keyset(forum_posts, request, per_page=10, descending=(sort_by != 'oldest'))
     
     # Get category choices for filter
     category_choices = ForumPost.CATEGORY_CHOICES
@@ -1145,6 +1116,7 @@ def product_info_edit(request, product_id):
                 product.is_active = is_active
                 product.updated_by = admin
                 product.save()
+                invalidate_content(PRODUCTS)
                 
                 messages.success(request, 'Informasi produk berhasil diperbarui.')
                 return redirect('main:product_info_list')
@@ -1251,6 +1223,7 @@ def faq_edit(request, faq_id):
                 faq.order = order_int
                 faq.is_active = is_active
                 faq.save()
+                invalidate_content(FAQS)
                 
                 messages.success(request, 'FAQ berhasil diperbarui.')
                 return redirect('main:faq_list')
@@ -1300,7 +1273,7 @@ def articles_list(request):
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
-    articles = Article.objects.all()
+    articles = paginate_keyset(Article.objects.select_related('created_by'), request)
     
     context = {
         'page_title': 'Manajemen Artikel - Admin',
@@ -1444,56 +1417,60 @@ def admin_list(request):
     return render(request, 'admin/admin_list.html', context)
 
 
-def admin_add(request):
+def _create_admin(admin, username, email, full_name, password_hash):
+    new_admin = Admin.objects.create(
+        username=username,
+        email=email,
+        full_name=full_name,
+        password=password_hash,
+        is_active=True
+    )
+    
+    # Create activity log
+    log_activity(
+        action_type='admin_created',
+        description=f'Admin {new_admin.full_name} ({new_admin.username}) berhasil ditambahkan',
+        performed_by=admin,
+        metadata={'admin_id': new_admin.id, 'username': new_admin.username}
+    )
+    return new_admin
+
+
+async def admin_add(request):
     """
     View untuk menambahkan Admin baru
+    Hash password dibuat di thread pool hashing (main/password_hashing.py)
     """
-    admin = get_admin(request)
+    admin = await sync_to_async(get_admin)(request)
     if not admin:
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
+    status = 200
     if request.method == 'POST':
-        username = request.POST.get('username', '').strip()
-        email = request.POST.get('email', '').strip()
-        full_name = request.POST.get('full_name', '').strip()
-        password = request.POST.get('password', '').strip()
+        username, email, full_name, password = _account_form_data(request)
         
         # Validation
-        if not all([username, email, full_name, password]):
-            messages.error(request, 'Harap lengkapi semua field.')
-        elif len(password) < 8:
-            messages.error(request, 'Password minimal 8 karakter.')
-        elif Admin.objects.filter(username=username).exists():
-            messages.error(request, 'Username sudah digunakan.')
-        elif Admin.objects.filter(email=email).exists():
-            messages.error(request, 'Email sudah terdaftar.')
+        error = await sync_to_async(_account_form_error)(Admin, username, email, full_name, password)
+        if error:
+            messages.error(request, error)
         else:
-            new_admin = Admin.objects.create(
-                username=username,
-                email=email,
-                full_name=full_name,
-                password=make_password(password),
-                is_active=True
-            )
-            
-            # Create activity log
-            ActivityLog.objects.create(
-                action_type='admin_created',
-                description=f'Admin {new_admin.full_name} ({new_admin.username}) berhasil ditambahkan',
-                performed_by=admin,
-                metadata={'admin_id': new_admin.id, 'username': new_admin.username}
-            )
-            
-            messages.success(request, f'Admin {new_admin.full_name} berhasil ditambahkan.')
-            return redirect('main:admin_list')
+            try:
+                password_hash = await amake_password(password)
+            except PasswordHashingBusy:
+                messages.error(request, HASHING_BUSY_MESSAGE)
+                status = 503
+            else:
+                new_admin = await sync_to_async(_create_admin)(admin, username, email, full_name, password_hash)
+                messages.success(request, f'Admin {new_admin.full_name} berhasil ditambahkan.')
+                return redirect('main:admin_list')
     
     context = {
         'page_title': 'Tambah Admin - Admin',
         'admin': admin,
     }
     
-    return render(request, 'admin/admin_add.html', context)
+    return await arender(request, 'admin/admin_add.html', context, status=status)
 
 
 def admin_toggle_active(request, admin_id):
@@ -1518,7 +1495,7 @@ def admin_toggle_active(request, admin_id):
         
         # Create activity log
         action_type = 'admin_deactivated' if not target_admin.is_active else 'admin_created'
-        ActivityLog.objects.create(
+        log_activity(
             action_type=action_type,
             description=f'Admin {target_admin.full_name} ({target_admin.username}) {"dinonaktifkan" if not target_admin.is_active else "diaktifkan"}',
             performed_by=admin,
@@ -1532,8 +1509,42 @@ def admin_toggle_active(request, admin_id):
     return redirect('main:admin_list')
 
 
+# ==================== METRICS ====================
+
+def password_hashing_metrics(request):
+    """
+    Metrik thread pool hashing password (JSON): jumlah worker, pekerjaan
+    yang sedang berjalan, kedalaman antrean, dan total yang ditolak/selesai
+    """
+    admin = get_admin(request)
+    if not admin:
+        return JsonResponse({'error': 'Anda harus login terlebih dahulu.'}, status=403)
+    
+    return JsonResponse(hashing_stats())
+
+
 # ==================== ACTIVITY LOG ====================
 
+def filter_activity_logs(logs, action_filter, search_query, date_from, date_to):
+    """Filter tipe aksi, pencarian, dan rentang tanggal untuk daftar dan export log aktivitas"""
+    if action_filter:
+        logs = logs.filter(action_type=action_filter)
+    
+    if search_query:
+        logs = logs.filter(
+            models.Q(description__icontains=search_query) |
+            models.Q(performed_by__full_name__icontains=search_query) |
+            models.Q(performed_by__username__icontains=search_query)
+        )
+    
+    # Tanggal tidak valid diabaikan; date_to inklusif sampai akhir hari
+    try:
+        logs = filter_date_range(logs, {'date_from': date_from, 'date_to': date_to})
+    except ExportError:
+        pass
+    return logs
+
+
 def activity_log_list(request):
     """
     View untuk menampilkan riwayat aktivitas sistem
@@ -1553,33 +1564,10 @@ def activity_log_list(request):
     logs = ActivityLog.objects.select_related('performed_by', 'related_order', 'related_member', 'related_device').all()
     
     # Apply filters
-    if action_filter:
-        logs = logs.filter(action_type=action_filter)
-    
-    if search_query:
-        logs = logs.filter(
-            models.Q(description__icontains=search_query) |
-            models.Q(performed_by__full_name__icontains=search_query) |
-            models.Q(performed_by__username__icontains=search_query)
-        )
-    
-    if date_from:
-        try:
-            from datetime import datetime
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-            logs = logs.filter(created_at__gte=date_from_obj)
-        except ValueError:
-            pass
-    
-    if date_to:
-        try:
-            from datetime import datetime
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
-            logs = logs.filter(created_at__lte=date_to_obj)
-        except ValueError:
-            pass
+    logs = filter_activity_logs(logs, action_filter, search_query, date_from, date_to)
     
-    logs = logs.order_by('-created_at')
+    # Keyset pagination - halaman ke-500 sama cepatnya dengan halaman pertama
+    logs = paginate_keyset(logs, request)
     
     context = {
         'page_title': 'Riwayat Aktivitas Sistem - Admin',
@@ -1595,6 +1583,31 @@ def activity_log_list(request):
     return render(request, 'admin/activity_log_list.html', context)
 
 
+def activity_log_export(request):
+    """
+    Export log aktivitas termasuk metadata (streaming CSV/JSONL) dengan filter yang sama seperti daftar
+    Parameter: ?format=csv|jsonl, ?gzip=1, ?action_type, ?search, ?date_from, ?date_to
+    """
+    admin = get_admin(request)
+    if not admin:
+        messages.warning(request, 'Anda harus login terlebih dahulu.')
+        return redirect('main:login')
+    
+    # Log yang masih di buffer ikut ter-export
+    flush_activity_logs()
+    logs = filter_activity_logs(
+        ActivityLog.objects.all(),
+        request.GET.get('action_type', ''),
+        request.GET.get('search', '').strip(),
+        request.GET.get('date_from', '').strip(),
+        request.GET.get('date_to', '').strip(),
+    )
+    try:
+        return export_queryset(logs, ACTIVITY_LOG_EXPORT_FIELDS, request.GET, f'activity-log-{timezone.localdate():%Y%m%d}')
+    except ExportError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
 def activity_log_delete(request, log_id):
     """
     View untuk menghapus log aktivitas
@@ -1626,8 +1639,9 @@ def activity_log_delete_all(request):
         return redirect('main:login')
     
     if request.method == 'POST':
-        count = ActivityLog.objects.count()
-        ActivityLog.objects.all().delete()
+        # DELETE mentah per chunk, tanpa memuat semua log ke memori lewat Collector
+        flush_activity_logs()
+        count = delete_activity_logs_chunked(chunk_size=settings.ACTIVITY_LOG_DELETE_CHUNK_SIZE)
         messages.success(request, f'Semua log aktivitas ({count} log) berhasil dihapus.')
         return redirect('main:activity_log_list')
     
@@ -1724,7 +1738,7 @@ def admin_notifications_list(request):
             models.Q(member__full_name__icontains=member_filter)
         )
     
-    notifications = notifications.order_by('-created_at')
+    notifications = paginate_keyset(notifications, request)
     
     # Get statistics
     total_notifications = Notification.objects.count()
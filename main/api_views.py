@@ -0,0 +1,35 @@
+"""
+Endpoint HTTP untuk perangkat RangBot (machine-to-machine, tanpa session/CSRF)
+Autentikasi memakai API key per perangkat: Authorization: Bearer <api_key>
+"""
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .models import RangBotDevice
+from .telemetry import TelemetryError, check_api_key, get_request_api_key, ingest_readings, parse_readings
+
+
+@csrf_exempt
+@require_POST
+def device_telemetry_ingest(request, serial_number):
+    """
+    API untuk menerima batch data sensor dari perangkat
+    Body: JSON (objek / list / {"readings": [...]}) atau NDJSON (application/x-ndjson)
+    """
+    device = RangBotDevice.objects.filter(serial_number=serial_number).only(
+        'id', 'serial_number', 'is_active', 'api_key_hash'
+    ).first()
+    if device is None or not check_api_key(device, get_request_api_key(request)):
+        return JsonResponse({'error': 'Perangkat atau API key tidak valid'}, status=401)
+    if not device.is_active:
+        return JsonResponse({'error': 'Perangkat dinonaktifkan'}, status=403)
+
+    try:
+        readings = parse_readings(request.body, request.content_type)
+    except TelemetryError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    ingest_readings(device, readings)
+    return JsonResponse({'accepted': len(readings)}, status=201)
@@ -5,3 +5,20 @@ class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
 
+    def ready(self):
+        # Daftarkan flush ActivityLog di akhir request dan saat proses berhenti
+        from . import activity_log  # noqa: F401
+        # Daftarkan signal invalidasi cache statistik dashboard admin
+        from . import dashboard_stats  # noqa: F401
+        # Daftarkan signal pemeliharaan index pencarian forum
+        from . import forum_search  # noqa: F401
+        # Daftarkan signal pemeliharaan token pencarian admin/CS
+        from . import admin_search  # noqa: F401
+        # Daftarkan signal invalidasi cache konten publik (FAQ, produk, forum)
+        from . import content_cache  # noqa: F401
+        # Daftarkan signal sinkronisasi index login gabungan
+        from . import credentials  # noqa: F401
+        # Daftarkan signal invalidasi cache identitas login
+        from . import identity  # noqa: F401
+        # Daftarkan peringatan deploy jika cache default tidak dibaca bersama antar worker
+        from . import shared_cache  # noqa: F401
@@ -0,0 +1,109 @@
+"""
+Pesan "Hubungi Customer Service" dan jumlahnya per status
+
+Sidebar CS menampilkan jumlah pesan baru di setiap halaman dan dashboard CS
+menampilkan ringkasan per status. Daripada COUNT(*) atas seluruh tabel
+ContactMessage setiap kali, jumlah per status disimpan di ContactMessageCounter
+(satu baris per status) dan diubah di transaksi yang sama dengan pembuatan,
+perubahan status, atau penghapusan pesan. Membaca semua jumlah cukup satu
+query atas paling banyak empat baris.
+
+Karena itu perubahan status pesan harus lewat create_message / set_status /
+delete_message, bukan message.save() langsung.
+"""
+
+from django.db import transaction
+from django.db.models import Case, Count, F, PositiveIntegerField, When
+
+from .models import ContactMessage, ContactMessageCounter
+
+STATUSES = [status for status, _ in ContactMessage.STATUS_CHOICES]
+
+
+def _adjust(deltas):
+    """Ubah jumlah beberapa status dengan satu UPDATE, mis. {'new': -1, 'read': 1}"""
+    deltas = {status: delta for status, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    whens = []
+    for status, delta in deltas.items():
+        if delta > 0:
+            whens.append(When(status=status, then=F('count') + delta))
+        else:
+            # Kolom UNSIGNED di MySQL: count - n tidak boleh dihitung saat hasilnya negatif (error 1690)
+            decrement = -delta
+            whens.append(When(status=status, count__gte=decrement, then=F('count') - decrement))
+            whens.append(When(status=status, then=0))
+    ContactMessageCounter.objects.filter(status__in=deltas).update(count=Case(
+        *whens,
+        default=F('count'),
+        output_field=PositiveIntegerField(),
+    ))
+
+
+def rebuild_counts():
+    """Hitung ulang ContactMessageCounter dari tabel ContactMessage"""
+    counts = dict(ContactMessage.objects.order_by().values_list('status').annotate(total=Count('id')))
+    with transaction.atomic():
+        ContactMessageCounter.objects.all().delete()
+        ContactMessageCounter.objects.bulk_create([
+            ContactMessageCounter(status=status, count=counts.get(status, 0)) for status in STATUSES
+        ])
+    return counts
+
+
+def get_message_counts():
+    """
+    Jumlah pesan per status ditambah 'total'
+
+    Returns:
+        dict {'new': ..., 'read': ..., 'replied': ..., 'archived': ..., 'total': ...}
+    """
+    counts = dict(ContactMessageCounter.objects.values_list('status', 'count'))
+    if len(counts) < len(STATUSES):
+        # Tabel counter kosong/tidak lengkap (mis. setelah flush database)
+        counts = rebuild_counts()
+    counts = {status: counts.get(status, 0) for status in STATUSES}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def create_message(**fields):
+    """Simpan pesan baru dari pengunjung (status 'new')"""
+    with transaction.atomic():
+        message = ContactMessage.objects.create(status='new', **fields)
+        _adjust({'new': 1})
+    return message
+
+
+def set_status(message, status, **fields):
+    """
+    Ubah status pesan (dan field lain, mis. data balasan) beserta jumlahnya
+
+    Status saat ini dibaca ulang dengan select_for_update, sehingga dua CS yang
+    mengubah pesan yang sama bersamaan tidak menggeser jumlah dua kali.
+
+    Returns:
+        False jika pesan sudah dihapus
+    """
+    with transaction.atomic():
+        current = ContactMessage.objects.select_for_update().filter(pk=message.pk).values_list('status', flat=True).first()
+        if current is None:
+            return False
+        ContactMessage.objects.filter(pk=message.pk).update(status=status, **fields)
+        if current != status:
+            _adjust({current: -1, status: 1})
+    message.status = status
+    for name, value in fields.items():
+        setattr(message, name, value)
+    return True
+
+
+def delete_message(message):
+    with transaction.atomic():
+        current = ContactMessage.objects.select_for_update().filter(pk=message.pk).values_list('status', flat=True).first()
+        if current is None:
+            return False
+        ContactMessage.objects.filter(pk=message.pk).delete()
+        _adjust({current: -1})
+    return True
@@ -0,0 +1,220 @@
+"""
+Cache konten publik: FAQ aktif, paket produk aktif, dan postingan forum terbaru
+
+Setiap grup konten punya nomor versi di cache. Key data menyertakan versi
+tersebut, sehingga invalidasi cukup menaikkan versi (cache.incr) dan entri
+lama tidak perlu dicari lalu dihapus; entri lama kedaluwarsa sendiri lewat TTL.
+Versi dinaikkan lewat signal post_save/post_delete FAQ, ProductInfo,
+ForumPost, ForumComment, dan ForumUser, serta langsung dari view edit admin/CS.
+
+Landing page untuk pengunjung tanpa session di-cache utuh (HTML hasil render)
+dengan key yang memuat versi konten, jadi request berikutnya dilayani tanpa
+query database sama sekali.
+
+Versi hanya dinaikkan di proses yang menyimpan perubahan, jadi cache ini
+butuh cache Django yang dibagi semua worker (REDIS_URL, lihat
+main/shared_cache.py). Dengan LocMemCache per proses, worker lain akan terus
+melayani FAQ/paket/halaman lama sampai TTL habis; karena itu konten dan
+halaman tidak di-cache sama sekali di backend tersebut.
+"""
+
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .models import FAQ, ForumComment, ForumPost, ForumUser, ProductInfo
+from .shared_cache import is_shared
+
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_PAGE_CACHE_TTL = 300
+CACHE_KEY_PREFIX = 'content:'
+LATEST_FORUM_POSTS = 3
+
+FAQS = 'faqs'
+PRODUCTS = 'products'
+FORUM = 'forum'
+
+
+def _cache_ttl():
+    return getattr(settings, 'CONTENT_CACHE_TTL', DEFAULT_CACHE_TTL)
+
+
+def _page_cache_ttl():
+    return getattr(settings, 'PAGE_CACHE_TTL', DEFAULT_PAGE_CACHE_TTL)
+
+
+# ==================== VERSIONS ====================
+
+def _version_key(group):
+    return f'{CACHE_KEY_PREFIX}version:{group}'
+
+
+def get_versions(*groups):
+    """
+    Versi saat ini untuk setiap grup
+
+    Versi yang belum ada (atau sudah dibuang cache) dimulai dari waktu sekarang
+    dalam milidetik, bukan 0, agar tidak pernah cocok lagi dengan entri lama.
+    """
+    keys = {group: _version_key(group) for group in groups}
+    versions = cache.get_many(list(keys.values()))
+    result = {}
+    for group, key in keys.items():
+        version = versions.get(key)
+        if version is None:
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.get(key)
+        result[group] = version
+    return result
+
+
+def invalidate_content(*groups):
+    """Naikkan versi grup konten; semua data dan halaman yang memakainya otomatis tidak valid"""
+    for group in groups:
+        key = _version_key(group)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Versi belum ada; get_versions akan membuat versi baru
+            pass
+
+
+def _cached(group, name, compute):
+    if not is_shared():
+        return compute()
+    version = get_versions(group)[group]
+    key = f'{CACHE_KEY_PREFIX}{group}:{name}:v{version}'
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, _cache_ttl())
+    return data
+
+
+# ==================== CONTENT ====================
+
+def _load_faqs():
+    return [
+        {'question': question, 'answer': answer}
+        for question, answer in FAQ.objects.filter(is_active=True)
+        .order_by('order', 'created_at').values_list('question', 'answer')
+    ]
+
+
+def _load_products():
+    products = []
+    for product in ProductInfo.objects.filter(is_active=True).order_by('package_type'):
+        products.append({
+            'name': product.name,
+            'package_type': product.package_type,
+            'price': f"{product.price:,.0f}".replace(',', '.'),
+            'price_value': product.price,
+            'description': product.description or '',
+            'features': product.get_features_list(),
+            'highlight': product.package_type == 'professional',  # Professional is highlighted
+        })
+    return products
+
+
+def _load_latest_forum_posts():
+    posts = (
+        ForumPost.objects.select_related('author')
+        .annotate(comment_count=Count('comments'))[:LATEST_FORUM_POSTS]
+    )
+    return [
+        {
+            'title': post.title,
+            'author': post.author.name,
+            'date': post.created_at.strftime('%d %b %Y'),
+            'excerpt': post.get_excerpt(100),
+            'replies': post.comment_count,
+            'category': post.get_category_display(),
+        }
+        for post in posts
+    ]
+
+
+def get_faqs():
+    """FAQ aktif sebagai list dict {question, answer}"""
+    return _cached(FAQS, 'active', _load_faqs)
+
+
+def get_active_products():
+    """Paket produk aktif sebagai list dict (harga terformat dan price_value Decimal)"""
+    return _cached(PRODUCTS, 'active', _load_products)
+
+
+def get_latest_forum_posts():
+    """Postingan forum terbaru untuk halaman informasi produk"""
+    return _cached(FORUM, 'latest', _load_latest_forum_posts)
+
+
+# ==================== FULL PAGE ====================
+
+def is_anonymous_request(request):
+    """Pengunjung tanpa cookie session; cek cookie saja agar tidak perlu membaca session dari database"""
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def cache_page_for_anonymous(name, groups):
+    """
+    Decorator: cache HTML halaman GET untuk pengunjung tanpa session
+
+    Args:
+        name: nama halaman untuk key cache
+        groups: grup konten yang dipakai halaman; perubahan grup ini membuat cache halaman tidak valid
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.GET or not is_anonymous_request(request) or not is_shared():
+                return view(request, *args, **kwargs)
+
+            versions = get_versions(*groups)
+            key = f'{CACHE_KEY_PREFIX}page:{name}:' + ':'.join(f'{group}{versions[group]}' for group in groups)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200 and not response.cookies:
+                    cache.set(key, (response.content, response['Content-Type']), _page_cache_ttl())
+            patch_vary_headers(response, ['Cookie'])
+            return response
+        return wrapper
+    return decorator
+
+
+# ==================== SIGNALS ====================
+
+def _invalidator(group):
+    def receiver(sender, **kwargs):
+        # Setelah commit, agar request lain tidak meng-cache ulang data lama dengan versi baru
+        transaction.on_commit(lambda: invalidate_content(group))
+    return receiver
+
+
+def _forum_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Login hanya menyimpan last_login; nama penulis tidak berubah
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    transaction.on_commit(lambda: invalidate_content(FORUM))
+
+
+_invalidate_faqs = _invalidator(FAQS)
+_invalidate_products = _invalidator(PRODUCTS)
+_invalidate_forum = _invalidator(FORUM)
+
+for _model, _receiver in ((FAQ, _invalidate_faqs), (ProductInfo, _invalidate_products),
+                          (ForumPost, _invalidate_forum), (ForumComment, _invalidate_forum)):
+    post_save.connect(_receiver, sender=_model, dispatch_uid=f'main.content_cache.save.{_model.__name__}')
+    post_delete.connect(_receiver, sender=_model, dispatch_uid=f'main.content_cache.delete.{_model.__name__}')
+post_save.connect(_forum_user_saved, sender=ForumUser, dispatch_uid='main.content_cache.forum_user')
@@ -0,0 +1,24 @@
+"""
+Context processor untuk template dashboard member
+"""
+
+from functools import lru_cache
+
+from .identity import get_principal
+from .notifications import unread_count
+
+
+def member_notifications(request):
+    """
+    unread_notifications_count untuk badge notifikasi di dashboard_base.html
+
+    Nilainya callable: template engine baru memanggilnya saat variabel dipakai,
+    sehingga halaman lain (publik, admin, CS) tidak menjalankan query counter.
+    View yang sudah mengisi unread_notifications_count sendiri tetap didahulukan.
+    """
+    @lru_cache(maxsize=None)
+    def count():
+        member = get_principal(request, 'member')
+        return unread_count(member) if member else 0
+
+    return {'unread_notifications_count': count}
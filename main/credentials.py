@@ -0,0 +1,152 @@
+"""
+Login tunggal Admin / Customer Service / Member lewat tabel LoginCredential
+
+Sebelumnya login mencoba Admin, lalu CS, lalu Member: login gagal berarti tiga
+SELECT dan bisa sampai tiga kali check_password (PBKDF2). Sekarang username,
+peran, dan hash password setiap akun disalin ke LoginCredential lewat signal,
+sehingga login cukup satu SELECT berindex dan satu verifikasi hash.
+
+Pengecualian: username tidak unik lintas peran (Admin, CS, dan Member punya
+tabel sendiri), jadi username yang sama bisa dipakai beberapa peran. Untuk
+username seperti itu semua kandidat diambil dalam query yang sama dan dicoba
+seperti sebelumnya: Admin, lalu CS, lalu Member; password yang tidak cocok
+untuk satu peran berlanjut ke peran berikutnya, sehingga login gagal bisa
+memverifikasi satu hash per peran yang memakai username itu.
+
+Login gagal dihitung per IP di cache default. Setelah LOGIN_MAX_FAILURES kali
+dalam LOGIN_FAILURE_WINDOW detik, percobaan berikutnya ditolak sebelum query
+dan hashing; login berhasil menghapus hitungan IP tersebut. Batas ini hanya
+berlaku untuk semua worker jika cache dibaca bersama (REDIS_URL); dengan
+LocMemCache setiap proses menghitung sendiri (lihat main/shared_cache.py).
+Bangun ulang tabel: python manage.py rebuild_login_credentials
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from .models import Admin, CustomerService, LoginCredential, Member
+
+DEFAULT_MAX_FAILURES = 10
+DEFAULT_FAILURE_WINDOW = 300
+CACHE_KEY_PREFIX = 'login:failures:'
+
+ROLE_PRIORITY = {'admin': 0, 'cs': 1, 'member': 2}
+ROLE_MODELS = {'admin': Admin, 'cs': CustomerService, 'member': Member}
+
+# Field yang disalin; save(update_fields=['last_login']) tidak perlu sinkronisasi
+SYNC_FIELDS = {'username', 'password', 'full_name', 'is_active', 'is_registered', 'member_id'}
+
+
+# ==================== SINKRONISASI ====================
+
+def credential_fields(role, account):
+    """
+    Isi LoginCredential untuk satu akun
+
+    Returns:
+        dict field, atau None jika akun belum bisa login (Member belum registrasi)
+    """
+    if role == 'member' and not (account.is_registered and account.username):
+        return None
+    return {
+        'username': account.username,
+        'member_id': account.member_id if role == 'member' else None,
+        'full_name': account.full_name,
+        'password': account.password or '',
+        'is_active': account.is_active,
+    }
+
+
+def sync_credential(role, account):
+    fields = credential_fields(role, account)
+    if fields is None:
+        LoginCredential.objects.filter(role=role, account_id=account.pk).delete()
+    else:
+        LoginCredential.objects.update_or_create(role=role, account_id=account.pk, defaults=fields)
+
+
+def rebuild_credentials():
+    """Bangun ulang seluruh LoginCredential dari Admin, CustomerService, dan Member"""
+    LoginCredential.objects.all().delete()
+    credentials = []
+    for role, model in ROLE_MODELS.items():
+        for account in model.objects.iterator(chunk_size=1000):
+            fields = credential_fields(role, account)
+            if fields is not None:
+                credentials.append(LoginCredential(role=role, account_id=account.pk, **fields))
+    LoginCredential.objects.bulk_create(credentials, batch_size=1000)
+    return len(credentials)
+
+
+def _account_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SYNC_FIELDS & set(update_fields):
+        return
+    sync_credential(_ROLES_BY_MODEL[sender], instance)
+
+
+def _account_deleted(sender, instance, **kwargs):
+    LoginCredential.objects.filter(role=_ROLES_BY_MODEL[sender], account_id=instance.pk).delete()
+
+
+_ROLES_BY_MODEL = {model: role for role, model in ROLE_MODELS.items()}
+
+for _role, _model in ROLE_MODELS.items():
+    post_save.connect(_account_saved, sender=_model, dispatch_uid=f'main.credentials.save.{_role}')
+    post_delete.connect(_account_deleted, sender=_model, dispatch_uid=f'main.credentials.delete.{_role}')
+
+
+# ==================== LOGIN ====================
+
+def find_credentials(username):
+    """
+    Kredensial untuk username dengan satu query, urut sesuai prioritas peran
+
+    Admin/CS nonaktif diabaikan; Member nonaktif tetap dikembalikan agar
+    view bisa menampilkan pesan akun dinonaktifkan.
+    """
+    candidates = [
+        credential for credential in LoginCredential.objects.filter(username=username)
+        if credential.is_active or credential.role == 'member'
+    ]
+    return sorted(candidates, key=lambda credential: ROLE_PRIORITY[credential.role])
+
+
+# ==================== BATAS PERCOBAAN ====================
+
+def _max_failures():
+    return getattr(settings, 'LOGIN_MAX_FAILURES', DEFAULT_MAX_FAILURES)
+
+
+def _failure_window():
+    return getattr(settings, 'LOGIN_FAILURE_WINDOW', DEFAULT_FAILURE_WINDOW)
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _failure_key(request):
+    return f'{CACHE_KEY_PREFIX}{client_ip(request)}'
+
+
+def is_login_blocked(request):
+    """True jika IP ini sudah terlalu sering gagal login dalam jendela waktu"""
+    return (cache.get(_failure_key(request)) or 0) >= _max_failures()
+
+
+def record_login_failure(request):
+    key = _failure_key(request)
+    # Jendela dimulai dari kegagalan pertama; add tidak menimpa hitungan yang ada
+    cache.add(key, 0, _failure_window())
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key kedaluwarsa di antara add dan incr
+        cache.set(key, 1, _failure_window())
+        return 1
+
+
+def clear_login_failures(request):
+    """Hapus hitungan login gagal IP ini setelah login berhasil"""
+    cache.delete(_failure_key(request))
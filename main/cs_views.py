@@ -6,34 +6,39 @@ CS fokus pada layanan, interaksi, dan manajemen informasi forum & FAQ
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils import timezone
-from django.db.models import Q, Count
-from django.core.paginator import Paginator
+from django.db.models import Q, Count, Exists, OuterRef, Subquery, prefetch_related_objects
 from django.contrib.auth.hashers import check_password, make_password
 from django.urls import reverse
 from urllib.parse import urlencode
 from django.db import models
 from .models import (
-    CustomerService, ContactMessage, FAQ, ForumPost, ForumComment,
-    Member, RangBotDevice, ProductInfo, ActivityLog
+    ContactMessage, FAQ, ForumPost, ForumComment,
+    Member, RangBotDevice, ProductInfo, ActivityLog, PurchaseOrder
 )
+from .pagination import paginate_keyset, CURSOR_PARAM
+from .forum_search import search_posts
+from .admin_search import apply_search, prefix_range
+from .utils import count_subquery, device_stats_by_member
+from .content_cache import FAQS, invalidate_content
+from .identity import get_principal
+from .contact_messages import delete_message, get_message_counts, set_status
 
 
 def get_cs(request):
-    """Helper function untuk mendapatkan CS dari session"""
-    cs_id = request.session.get('cs_id')
-    if cs_id:
-        try:
-            return CustomerService.objects.get(id=cs_id, is_active=True)
-        except CustomerService.DoesNotExist:
-            return None
-    return None
+    """Helper function untuk mendapatkan CS dari session (sekali per request, lihat main/identity.py)"""
+    return get_principal(request, 'cs')
 
 
-def get_cs_base_context(cs):
-    """Helper function untuk mendapatkan context dasar yang digunakan di semua template CS"""
+def get_cs_base_context(cs, message_counts=None):
+    """
+    Helper function untuk mendapatkan context dasar yang digunakan di semua template CS
+    Jumlah pesan baru dibaca dari counter (lihat main/contact_messages.py)
+    """
+    if message_counts is None:
+        message_counts = get_message_counts()
     return {
         'cs': cs,
-        'new_messages_count': ContactMessage.objects.filter(status='new').count(),
+        'new_messages_count': message_counts['new'],
     }
 
 
@@ -54,11 +59,12 @@ def cs_dashboard(request):
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
-    # Get statistics
-    new_messages = ContactMessage.objects.filter(status='new').count()
-    unread_messages = ContactMessage.objects.filter(status__in=['new', 'read']).count()
-    total_messages = ContactMessage.objects.count()
-    archived_messages = ContactMessage.objects.filter(status='archived').count()
+    # Get statistics (satu query ke counter per status)
+    message_counts = get_message_counts()
+    new_messages = message_counts['new']
+    unread_messages = message_counts['new'] + message_counts['read']
+    total_messages = message_counts['total']
+    archived_messages = message_counts['archived']
     
     # Recent messages (last 5)
     recent_messages = ContactMessage.objects.filter(status__in=['new', 'read']).order_by('-created_at')[:5]
@@ -77,7 +83,7 @@ def cs_dashboard(request):
         'performed_by', 'related_order', 'related_member'
     ).order_by('-created_at')[:5])
     
-    context = get_cs_base_context(cs)
+    context = get_cs_base_context(cs, message_counts)
     context.update({
         'page_title': 'Dashboard Customer Service - RangBot',
         'new_messages': new_messages,
@@ -114,19 +120,22 @@ def cs_messages(request):
         try:
             message = ContactMessage.objects.get(id=message_id)
             
+            # set_status/delete_message mengembalikan False jika pesan dihapus CS lain di antara get dan update
             if action == 'mark_read':
-                message.status = 'read'
-                message.save()
+                if not set_status(message, 'read'):
+                    raise ContactMessage.DoesNotExist
                 messages.success(request, f'Pesan dari {message.name} telah ditandai sebagai sudah dibaca.')
             
             elif action == 'reply':
                 reply_message = request.POST.get('reply_message', '').strip()
                 if reply_message:
-                    message.status = 'replied'
-                    message.replied_by = cs
-                    message.replied_at = timezone.now()
-                    message.reply_message = reply_message
-                    message.save()
+                    if not set_status(
+                        message, 'replied',
+                        replied_by=cs,
+                        replied_at=timezone.now(),
+                        reply_message=reply_message,
+                    ):
+                        raise ContactMessage.DoesNotExist
                     
                     # Send email to customer
                     try:
@@ -183,18 +192,19 @@ Email ini dikirim sebagai balasan untuk pesan Anda pada {message.created_at.strf
                     messages.error(request, 'Balasan tidak boleh kosong.')
             
             elif action == 'archive':
-                message.status = 'archived'
-                message.save()
+                if not set_status(message, 'archived'):
+                    raise ContactMessage.DoesNotExist
                 messages.success(request, f'Pesan dari {message.name} telah diarsipkan.')
             
             elif action == 'unarchive':
-                message.status = 'read'
-                message.save()
+                if not set_status(message, 'read'):
+                    raise ContactMessage.DoesNotExist
                 messages.success(request, f'Pesan dari {message.name} telah dikembalikan dari arsip.')
             
             elif action == 'delete':
                 message_name = message.name
-                message.delete()
+                if not delete_message(message):
+                    raise ContactMessage.DoesNotExist
                 messages.success(request, f'Pesan dari {message_name} telah dihapus.')
         
         except ContactMessage.DoesNotExist:
@@ -204,15 +214,15 @@ Email ini dikirim sebagai balasan untuk pesan Anda pada {message.created_at.strf
         from django.urls import reverse
         
         redirect_url = reverse('main:cs_messages')
-        params = []
+        params = {}
         if request.GET.get('status'):
-            params.append(f"status={request.GET.get('status')}")
+            params['status'] = request.GET.get('status')
         if request.GET.get('search'):
-            params.append(f"search={request.GET.get('search')}")
-        if request.GET.get('page'):
-            params.append(f"page={request.GET.get('page')}")
+            params['search'] = request.GET.get('search')
+        if request.GET.get(CURSOR_PARAM):
+            params[CURSOR_PARAM] = request.GET.get(CURSOR_PARAM)
         if params:
-            redirect_url += '?' + '&'.join(params)
+            redirect_url += '?' + urlencode(params)
         
         return redirect(redirect_url)
     
@@ -234,15 +244,8 @@ Email ini dikirim sebagai balasan untuk pesan Anda pada {message.created_at.strf
             Q(message__icontains=search_query)
         )
     
-    messages_list = messages_list.order_by('-created_at')
-    
-    # Pagination
-    paginator = Paginator(messages_list, 20)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    # Statistics
-    new_count = ContactMessage.objects.filter(status='new').count()
+    # Pagination (keyset berdasarkan created_at, id)
+    page_obj = paginate_keyset(messages_list, request, per_page=20)
     
     context = get_cs_base_context(cs)
     context.update({
@@ -347,6 +350,7 @@ def cs_faq_edit(request, faq_id):
                 faq.order = order_int
                 faq.is_active = is_active
                 faq.save()
+                invalidate_content(FAQS)
                 
                 messages.success(request, 'FAQ berhasil diperbarui.')
                 return redirect('main:cs_faq')
@@ -488,33 +492,20 @@ def cs_forum(request):
     # Get forum posts with their comments (prefetch for efficiency)
     posts = ForumPost.objects.select_related('author').prefetch_related('comments', 'comments__author', 'comments__replied_by_cs').all()
     
-    # Apply search filter
     if search_query:
-        posts = posts.filter(
-            Q(title__icontains=search_query) |
-            Q(content__icontains=search_query) |
-            Q(author__name__icontains=search_query) |
-            Q(author__username__icontains=search_query) |
-            Q(category__icontains=search_query)
+        # Pencarian lewat index forum (judul, isi, komentar, penulis, kategori), urut relevansi
+        posts_page = search_posts(
+            search_query, request, per_page=10,
+            filters=Q(post__category=category_filter) if category_filter else None,
         )
-    
-    # Apply category filter
-    if category_filter:
-        posts = posts.filter(category=category_filter)
-    
-    # Apply sorting
-    if sort_by == 'oldest':
-        posts = posts.order_by('created_at')
-    else:  # newest (default)
-        posts = posts.order_by('-created_at')
-    
-    # Pagination
-    paginator = Paginator(posts, 10)  # 10 posts per page
-    page = request.GET.get('page', 1)
-    try:
-        posts_page = paginator.get_page(page)
-    except:
-        posts_page = paginator.get_page(1)
+        prefetch_related_objects(posts_page.object_list, 'comments', 'comments__author', 'comments__replied_by_cs')
+    else:
+        # Apply category filter
+        if category_filter:
+            posts = posts.filter(category=category_filter)
+        
+        # Pagination (keyset, 10 posts per page) - arah urutan mengikuti sort
+        posts_page = paginate_keyset(posts, request, per_page=10, descending=(sort_by != 'oldest'))
     
     # Get category choices for filter
     category_choices = ForumPost.CATEGORY_CHOICES
@@ -547,59 +538,32 @@ def cs_members(request):
     search_query = request.GET.get('search', '').strip()
     member_filter = request.GET.get('member', '').strip()
     
-    # Get members yang memiliki purchase order dengan status 'verified'
-    from .models import PurchaseOrder
-    verified_member_ids = PurchaseOrder.objects.filter(
-        status='verified',
-        member_id__isnull=False
-    ).values_list('member_id', flat=True).distinct()
-    
-    # Get members berdasarkan verified member IDs
-    members = Member.objects.filter(
-        member_id__in=verified_member_ids
-    ).distinct()
+    # Member yang punya purchase order 'verified'; statistik order dihitung lewat
+    # subquery dan statistik perangkat lewat satu GROUP BY (bukan 5+ query per member)
+    verified_orders = PurchaseOrder.objects.filter(member_id=OuterRef('member_id'), status='verified')
+    members = Member.objects.filter(Exists(verified_orders)).annotate(
+        total_orders=count_subquery(verified_orders, 'member_id'),
+        latest_order_id=Subquery(verified_orders.order_by('-verified_at', '-id').values('id')[:1]),
+    )
     
     if search_query:
-        members = members.filter(
-            Q(member_id__icontains=search_query) |
-            Q(full_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(phone__icontains=search_query) |
-            Q(rangbot_devices__serial_number__icontains=search_query)
-        ).distinct()
+        members = apply_search(members, 'member', search_query)
     
     if member_filter:
-        members = members.filter(member_id__icontains=member_filter)
-    
-    # Get member statistics dengan purchase order data
-    members_with_stats = []
-    for member in members.order_by('-created_at')[:100]:  # Limit untuk performa
-        # Get verified purchase orders untuk member ini
-        verified_orders = PurchaseOrder.objects.filter(
-            member_id=member.member_id,
-            status='verified'
-        ).order_by('-verified_at')
-        
-        # Skip jika tidak ada verified orders
-        if not verified_orders.exists():
-            continue
-        
-        all_devices = member.rangbot_devices.all()
-        pro_count = sum(1 for d in all_devices if 'pro' in (d.device_name or '').lower() or 'professional' in (d.device_name or '').lower())
-        basic_count = all_devices.count() - pro_count
-        
-        # Get total purchase info
-        total_orders = verified_orders.count()
-        latest_order = verified_orders.first()
-        
-        members_with_stats.append({
+        members = members.filter(prefix_range('member_id', member_filter.upper()))
+    
+    page_members = list(members.order_by('-created_at')[:100])  # Limit untuk performa
+    latest_orders = PurchaseOrder.objects.in_bulk([member.latest_order_id for member in page_members])
+    device_stats = device_stats_by_member([member.pk for member in page_members])
+    members_with_stats = [
+        {
             'member': member,
-            'total_devices': all_devices.count(),
-            'pro_count': pro_count,
-            'basic_count': basic_count,
-            'total_orders': total_orders,
-            'latest_order': latest_order,
-        })
+            **device_stats[member.pk],
+            'total_orders': member.total_orders,
+            'latest_order': latest_orders.get(member.latest_order_id),
+        }
+        for member in page_members
+    ]
     
     context = get_cs_base_context(cs)
     context.update({
@@ -733,7 +697,7 @@ def cs_activity_log_list(request):
         except ValueError:
             pass
     
-    logs = logs.order_by('-created_at')
+    logs = paginate_keyset(logs, request)
     
     context = get_cs_base_context(cs)
     context.update({
@@ -0,0 +1,113 @@
+"""
+Statistik dashboard admin yang di-cache
+
+Setiap tabel dihitung dengan satu query conditional aggregation
+(COUNT ... FILTER / SUM(CASE ...)) lalu disimpan di cache per tabel.
+Cache satu tabel dihapus lewat signal post_save/post_delete model tersebut,
+sehingga load dingin paling banyak satu query per tabel dan load berikutnya
+tanpa query sama sekali. DASHBOARD_STATS_CACHE_TTL menjadi batas atas
+kedaluwarsa untuk perubahan yang tidak memicu signal (mis. QuerySet.update()).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete, post_save
+
+from .models import Admin, CustomerService, Member, PurchaseOrder, RangBotDevice
+
+DEFAULT_CACHE_TTL = 300
+CACHE_KEY_PREFIX = 'admin:dashboard:stats:'
+
+
+def _cache_ttl():
+    return getattr(settings, 'DASHBOARD_STATS_CACHE_TTL', DEFAULT_CACHE_TTL)
+
+
+def _order_stats():
+    stats = PurchaseOrder.objects.aggregate(
+        pending_orders=Count('id', filter=Q(status='pending')),
+        verified_orders=Count('id', filter=Q(status='verified')),
+        rejected_orders=Count('id', filter=Q(status='rejected')),
+        total_orders=Count('id'),
+        total_revenue=Sum('total_price', filter=Q(status='verified')),
+    )
+    stats['total_revenue'] = stats['total_revenue'] or 0
+    return stats
+
+
+def _member_stats():
+    return Member.objects.aggregate(
+        total_members=Count('id'),
+        registered_members=Count('id', filter=Q(is_registered=True)),
+        unregistered_members=Count('id', filter=Q(is_registered=False)),
+    )
+
+
+def _device_stats():
+    return RangBotDevice.objects.aggregate(
+        total_devices=Count('id'),
+        active_devices=Count('id', filter=Q(status='active', is_active=True)),
+        inactive_devices=Count('id', filter=Q(status='inactive')),
+    )
+
+
+def _admin_stats():
+    return Admin.objects.aggregate(total_admins=Count('id', filter=Q(is_active=True)))
+
+
+def _cs_stats():
+    return CustomerService.objects.aggregate(total_cs=Count('id', filter=Q(is_active=True)))
+
+
+# Nama grup cache -> (model sumber, fungsi penghitung)
+STAT_GROUPS = {
+    'orders': (PurchaseOrder, _order_stats),
+    'members': (Member, _member_stats),
+    'devices': (RangBotDevice, _device_stats),
+    'admins': (Admin, _admin_stats),
+    'cs': (CustomerService, _cs_stats),
+}
+
+
+def _cache_key(group):
+    return f'{CACHE_KEY_PREFIX}{group}'
+
+
+def get_dashboard_stats():
+    """
+    Ambil semua statistik dashboard admin sebagai satu dict
+    Grup yang belum ada di cache dihitung ulang (satu query per tabel)
+    """
+    keys = {group: _cache_key(group) for group in STAT_GROUPS}
+    cached = cache.get_many(list(keys.values()))
+
+    stats = {}
+    missing = {}
+    for group, (_, compute) in STAT_GROUPS.items():
+        values = cached.get(keys[group])
+        if values is None:
+            values = compute()
+            missing[keys[group]] = values
+        stats.update(values)
+
+    if missing:
+        cache.set_many(missing, _cache_ttl())
+    return stats
+
+
+def invalidate_dashboard_stats(*groups):
+    """Hapus cache statistik untuk grup tertentu (tanpa argumen = semua grup)"""
+    groups = groups or tuple(STAT_GROUPS)
+    cache.delete_many([_cache_key(group) for group in groups])
+
+
+def _invalidate_for_model(sender, **kwargs):
+    for group, (model, _) in STAT_GROUPS.items():
+        if model is sender:
+            invalidate_dashboard_stats(group)
+
+
+for _group, (_model, _) in STAT_GROUPS.items():
+    post_save.connect(_invalidate_for_model, sender=_model, dispatch_uid=f'main.dashboard_stats.save.{_group}')
+    post_delete.connect(_invalidate_for_model, sender=_model, dispatch_uid=f'main.dashboard_stats.delete.{_group}')
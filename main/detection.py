@@ -0,0 +1,241 @@
+"""
+Deteksi penyakit stroberi dari foto
+
+Alur:
+1. View (manual_detection / member_device_management action='detect') hanya
+   menyimpan foto dan membuat DetectionJob berstatus 'pending' (enqueue_detection).
+2. `python manage.py run_detection_worker` mengambil job secara batch
+   (micro-batching dinamis: batch dikirim begitu penuh atau setelah
+   DETECTION_BATCH_WAIT detik) dan menjalankan inferensi di ProcessPoolExecutor.
+   Model dimuat sekali per proses worker.
+3. Hasil ditulis ke DetectionHistory (dengan confidence) beserta notifikasi member.
+
+Backend model dipilih lewat DETECTION_BACKEND (dotted path ke subclass
+DetectionBackend). Default-nya DummyDetectionBackend (deterministik, tanpa
+dependency tambahan) untuk development dan testing.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .image_store import store_image
+from .models import DetectionHistory, DetectionJob, Notification
+from .notifications import deliver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'main.detection.DummyDetectionBackend'
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+ALLOWED_IMAGE_FORMATS = ('JPEG', 'PNG', 'WEBP')
+
+# Label yang sama dengan halaman Klasifikasi Penyakit
+DISEASE_LABELS = [
+    'Sehat',
+    'Bercak Daun (Leaf Spot)',
+    'Busuk Buah (Fruit Rot)',
+    'Embun Tepung (Powdery Mildew)',
+    'Layu Verticillium (Verticillium Wilt)',
+    'Antraknosa (Anthracnose)',
+    'Karat Daun (Leaf Rust)',
+]
+HEALTHY_LABEL = DISEASE_LABELS[0]
+
+
+class DetectionError(ValueError):
+    """Foto tidak bisa diproses"""
+
+
+# ==================== MODEL BACKENDS ====================
+
+class DetectionBackend:
+    """
+    Interface backend model deteksi (CPU)
+
+    load() dipanggil sekali di setiap proses worker, predict() menerima list
+    gambar PIL (RGB) dan mengembalikan list dict {'label': str, 'confidence': float 0-1}
+    dengan urutan yang sama.
+    """
+    input_size = (640, 640)
+
+    def load(self):
+        pass
+
+    def predict(self, images):
+        raise NotImplementedError
+
+
+class DummyDetectionBackend(DetectionBackend):
+    """
+    Backend tiruan yang deterministik: label dipilih dari hash piksel gambar
+    Dipakai untuk development dan testing sampai model R-CNN/YOLO tersedia
+    """
+    input_size = (64, 64)
+
+    def predict(self, images):
+        results = []
+        for image in images:
+            digest = hashlib.sha256(image.resize(self.input_size).tobytes()).digest()
+            label = DISEASE_LABELS[digest[0] % len(DISEASE_LABELS)]
+            confidence = 0.5 + (digest[1] / 255) * 0.49
+            results.append({'label': label, 'confidence': round(confidence, 4)})
+        return results
+
+
+def get_backend_class():
+    return import_string(getattr(settings, 'DETECTION_BACKEND', DEFAULT_BACKEND))
+
+
+# ==================== PROCESS POOL (child process) ====================
+
+_worker_backend = None
+
+
+def init_worker(backend_path):
+    """Initializer ProcessPoolExecutor: muat model sekali per proses"""
+    global _worker_backend
+    _worker_backend = import_string(backend_path)()
+    _worker_backend.load()
+
+
+def run_batch(image_paths):
+    """
+    Jalankan inferensi satu micro-batch di proses worker
+    Tidak menyentuh database; mengembalikan list hasil atau {'error': ...} per gambar
+    """
+    from PIL import Image
+
+    images, results, indexes = [], [None] * len(image_paths), []
+    for index, path in enumerate(image_paths):
+        try:
+            with Image.open(path) as image:
+                images.append(image.convert('RGB'))
+            indexes.append(index)
+        except Exception as e:
+            results[index] = {'error': f'Foto tidak bisa dibuka: {e}'}
+
+    if images:
+        for index, prediction in zip(indexes, _worker_backend.predict(images)):
+            results[index] = prediction
+    return results
+
+
+# ==================== QUEUE (web process) ====================
+
+def validate_image(uploaded_file):
+    """Cek ukuran dan format foto sebelum disimpan"""
+    from PIL import Image
+
+    if uploaded_file.size > MAX_UPLOAD_SIZE:
+        raise DetectionError('Ukuran foto maksimal 10MB.')
+    try:
+        with Image.open(uploaded_file) as image:
+            image_format = image.format
+            image.verify()
+    except Exception:
+        raise DetectionError('File yang diupload bukan gambar yang valid.')
+    finally:
+        uploaded_file.seek(0)
+    if image_format not in ALLOWED_IMAGE_FORMATS:
+        raise DetectionError('Format foto harus JPG, PNG, atau WEBP.')
+
+
+def enqueue_detection(member, device, uploaded_file, detection_type='manual', location=None):
+    """
+    Simpan foto dan masukkan ke antrian deteksi (tanpa menjalankan model)
+
+    Returns:
+        DetectionJob yang baru dibuat
+    """
+    validate_image(uploaded_file)
+    return DetectionJob.objects.create(
+        member=member,
+        device=device,
+        image=store_image(uploaded_file),
+        detection_type=detection_type,
+        location=location or None,
+    )
+
+
+def claim_jobs(limit):
+    """
+    Ambil hingga `limit` job pending dan tandai 'processing'
+    SKIP LOCKED membuat beberapa worker bisa berjalan tanpa mengambil job yang sama
+    """
+    with transaction.atomic():
+        ids = list(
+            DetectionJob.objects.select_for_update(skip_locked=True)
+            .filter(status='pending')
+            .order_by('id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        DetectionJob.objects.filter(id__in=ids).update(status='processing', started_at=timezone.now())
+    return list(DetectionJob.objects.filter(id__in=ids).select_related('device', 'image').order_by('id'))
+
+
+def job_image_path(job):
+    """Path foto untuk inferensi: salinan yang sudah diperkecil jika sudah tersedia"""
+    stored = job.image
+    return (stored.inference or stored.original).path
+
+
+def requeue_stale_jobs(older_than=timedelta(minutes=10)):
+    """Kembalikan job 'processing' yang macet (worker mati) ke antrian"""
+    return DetectionJob.objects.filter(
+        status='processing', started_at__lt=timezone.now() - older_than
+    ).update(status='pending', started_at=None)
+
+
+def save_results(jobs, results):
+    """
+    Tulis hasil satu batch: DetectionHistory + notifikasi + status job
+
+    DetectionHistory dibuat satu per satu karena id-nya disimpan di job;
+    notifikasi ditulis dengan satu bulk_create lewat main/notifications.py agar
+    counter belum dibaca ikut bertambah. Dashboard yang terbuka menerima deteksi
+    baru lewat DetectionPoller (main/realtime.py) setelah transaksi ini di-commit.
+    """
+    now = timezone.now()
+    notifications = []
+    with transaction.atomic():
+        for job, result in zip(jobs, results):
+            if not result or 'error' in result:
+                job.status = 'failed'
+                job.error_message = (result or {}).get('error', 'Tidak ada hasil dari model')
+                job.finished_at = now
+                job.save(update_fields=['status', 'error_message', 'finished_at'])
+                continue
+
+            label = result['label']
+            detection = DetectionHistory.objects.create(
+                device=job.device,
+                image=job.image,
+                image_url=job.image.original.url,
+                disease_detected=None if label == HEALTHY_LABEL else label,
+                confidence=round(result['confidence'] * 100, 2),
+                location=job.location,
+                detection_type=job.detection_type,
+            )
+            job.status = 'done'
+            job.detection = detection
+            job.finished_at = now
+            job.save(update_fields=['status', 'detection', 'finished_at'])
+
+            device_name = job.device.device_name or job.device.serial_number
+            notifications.append(Notification(
+                member_id=job.member_id,
+                notification_type='detection_new',
+                title='Hasil Deteksi Tersedia',
+                message=(
+                    f'Deteksi pada {device_name}: {label} '
+                    f'(keyakinan {detection.confidence:.0f}%).'
+                ),
+            ))
+        deliver(notifications)
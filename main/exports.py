@@ -0,0 +1,279 @@
+"""
+Export data dalam bentuk streaming (CSV / NDJSON / JSONL, opsional gzip)
+
+Baris dibaca per chunk memakai keyset pada primary key
+(WHERE id > id_terakhir ORDER BY id LIMIT chunk) dan values_list, lalu langsung
+ditulis ke StreamingHttpResponse. Memori yang dipakai hanya sebesar satu chunk,
+berapa pun jumlah barisnya, dan byte pertama terkirim begitu chunk pertama siap.
+
+Keyset dipakai (bukan satu query besar dengan .iterator()) karena driver MySQL
+tetap memuat seluruh hasil query ke memori client; dengan chunk kecil setiap
+query juga selesai cepat dan tidak menahan snapshot transaksi yang panjang.
+"""
+
+import csv
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .detection import HEALTHY_LABEL
+
+DEFAULT_CHUNK_SIZE = 2000
+# Jumlah baris yang digabung menjadi satu potongan respons
+LINES_PER_WRITE = 200
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+    # JSONL sama dengan NDJSON (satu objek JSON per baris), hanya beda nama
+    'jsonl': ('application/jsonl; charset=utf-8', 'jsonl'),
+}
+
+
+class ExportError(ValueError):
+    """Parameter export tidak valid"""
+
+
+# ==================== READ ====================
+
+def iterate_rows(queryset, fields, chunk_size=None):
+    """
+    Iterasi tuple values_list(*fields) seluruh queryset, urut primary key,
+    satu chunk per query
+    """
+    chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    queryset = queryset.order_by('pk').values_list('pk', *fields)
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        count = 0
+        for row in chunk[:chunk_size].iterator(chunk_size=chunk_size):
+            last_pk = row[0]
+            count += 1
+            yield row[1:]
+        if count < chunk_size:
+            return
+
+
+# ==================== WRITE ====================
+
+class _Echo:
+    """File-like untuk csv.writer: kembalikan baris yang ditulis alih-alih menyimpannya"""
+
+    def write(self, value):
+        return value
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return value
+
+
+def _batched(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= LINES_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_format_value(value) for value in row])
+
+
+def ndjson_lines(header, rows):
+    for row in rows:
+        record = {key: _format_value(value) if isinstance(value, datetime) else value for key, value in zip(header, row)}
+        yield json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
+
+
+def gzip_chunks(chunks):
+    """Kompres potongan teks menjadi aliran gzip tanpa menampung seluruh isi"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def parse_export_options(params):
+    """
+    Baca ?format=csv|ndjson|jsonl dan ?gzip=1
+
+    Returns:
+        tuple (format, gzip)
+    """
+    export_format = params.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError('Format export harus csv, ndjson, atau jsonl.')
+    return export_format, params.get('gzip') in ('1', 'true', 'on')
+
+
+def streaming_export_response(header, rows, filename, export_format='csv', compress=False):
+    """
+    StreamingHttpResponse untuk export
+
+    Args:
+        header: nama kolom (baris pertama CSV / key NDJSON)
+        rows: iterable tuple dengan urutan sama seperti header
+        filename: nama file tanpa ekstensi
+    """
+    content_type, extension = EXPORT_FORMATS[export_format]
+    lines = csv_lines(header, rows) if export_format == 'csv' else ndjson_lines(header, rows)
+    content = _batched(lines)
+    filename = f'{filename}.{extension}'
+    if compress:
+        content = gzip_chunks(content)
+        content_type = 'application/gzip'
+        filename += '.gz'
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    # Jangan ditahan proxy (nginx) sampai selesai, kirim begitu ada data
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def export_queryset(queryset, fields, params, filename):
+    """
+    Response export untuk queryset yang sudah difilter
+
+    Args:
+        fields: tuple pasangan (nama kolom, lookup values_list)
+        params: request.GET (format dan gzip)
+
+    Raises:
+        ExportError: format tidak valid
+    """
+    export_format, compress = parse_export_options(params)
+    header = [name for name, _ in fields]
+    rows = iterate_rows(queryset, [lookup for _, lookup in fields])
+    return streaming_export_response(header, rows, filename, export_format, compress)
+
+
+# ==================== FILTERS ====================
+
+def filter_date_range(queryset, params, field='created_at'):
+    """
+    Filter ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD (tanggal lokal, keduanya inklusif)
+    """
+    bounds = {}
+    for key in ('date_from', 'date_to'):
+        raw = params.get(key, '').strip()
+        if not raw:
+            continue
+        try:
+            value = parse_date(raw)
+        except ValueError:
+            value = None
+        if value is None:
+            raise ExportError('Format tanggal harus YYYY-MM-DD.')
+        bounds[key] = value
+
+    if 'date_from' in bounds:
+        start = timezone.make_aware(datetime.combine(bounds['date_from'], time.min))
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if 'date_to' in bounds:
+        end = timezone.make_aware(datetime.combine(bounds['date_to'] + timedelta(days=1), time.min))
+        queryset = queryset.filter(**{f'{field}__lt': end})
+    return queryset
+
+
+# ==================== DETECTION HISTORY ====================
+
+DETECTION_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('device_serial_number', 'device__serial_number'),
+    ('created_at', 'created_at'),
+    ('disease_detected', 'disease_detected'),
+    ('confidence', 'confidence'),
+    ('detection_type', 'detection_type'),
+    ('location', 'location'),
+    ('image_url', 'image_url'),
+)
+
+
+def filter_detections(queryset, params):
+    """
+    Filter export riwayat deteksi:
+    ?date_from / ?date_to, ?disease=<label>|healthy|diseased, ?detection_type=auto|manual
+    """
+    queryset = filter_date_range(queryset, params)
+
+    disease = params.get('disease', '').strip()
+    if disease in ('healthy', HEALTHY_LABEL):
+        queryset = queryset.filter(disease_detected__isnull=True)
+    elif disease == 'diseased':
+        queryset = queryset.filter(disease_detected__isnull=False)
+    elif disease:
+        queryset = queryset.filter(disease_detected=disease)
+
+    detection_type = params.get('detection_type', '').strip()
+    if detection_type:
+        if detection_type not in ('auto', 'manual'):
+            raise ExportError('Tipe deteksi harus auto atau manual.')
+        queryset = queryset.filter(detection_type=detection_type)
+    return queryset
+
+
+def export_detections(queryset, params, filename):
+    """
+    Response export riwayat deteksi yang sudah difilter
+
+    Raises:
+        ExportError: parameter tidak valid
+    """
+    return export_queryset(filter_detections(queryset, params), DETECTION_EXPORT_FIELDS, params, filename)
+
+
+# ==================== ADMIN ====================
+
+ACTIVITY_LOG_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('action_type', 'action_type'),
+    ('description', 'description'),
+    ('performed_by', 'performed_by__username'),
+    ('related_order_id', 'related_order_id'),
+    ('related_member_id', 'related_member__member_id'),
+    ('related_device_serial_number', 'related_device__serial_number'),
+    ('metadata', 'metadata'),
+)
+
+PURCHASE_ORDER_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('status', 'status'),
+    ('customer_name', 'customer_name'),
+    ('customer_email', 'customer_email'),
+    ('customer_phone', 'customer_phone'),
+    ('customer_address', 'customer_address'),
+    ('company_name', 'company_name'),
+    ('qty_basic', 'qty_basic'),
+    ('qty_professional', 'qty_professional'),
+    ('total_price', 'total_price'),
+    ('payment_method', 'payment_method'),
+    ('member_id', 'member_id'),
+    ('is_reorder', 'is_reorder'),
+    ('original_member_id', 'original_member_id'),
+    ('verified_at', 'verified_at'),
+    ('verified_by', 'verified_by__username'),
+    ('notes', 'notes'),
+)
@@ -0,0 +1,320 @@
+"""
+Pencarian full-text forum dengan inverted index lokal (tabel ForumSearchTerm)
+
+Setiap postingan dipecah menjadi kata (judul, isi, komentar, nama penulis,
+kategori) dan disimpan sebagai baris (kata, postingan, bobot). Pencarian hanya
+membaca baris untuk kata yang dicari lewat index (term, post, weight), bukan
+LIKE '%x%' ke seluruh ForumPost, sehingga tetap cepat saat forum membesar.
+
+- Semua kata harus cocok (AND); kata terakhir dicocokkan sebagai awalan
+  sehingga "embun tep" menemukan "embun tepung".
+- Skor = jumlah bobot x IDF (kata yang jarang bernilai lebih tinggi).
+- Index diperbarui setelah transaksi di-commit lewat signal; postingan yang
+  disimpan berkali-kali dalam satu transaksi hanya di-index sekali.
+  Bangun ulang seluruh index: python manage.py rebuild_forum_search_index
+"""
+
+import math
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import ForumComment, ForumPost, ForumSearchTerm, ForumUser
+from .pagination import KeysetPage
+
+PAGE_PARAM = 'page'
+MAX_TERM_LENGTH = 64
+MIN_TERM_LENGTH = 2
+MAX_QUERY_TERMS = 8
+MAX_PREFIX_EXPANSIONS = 30
+SNIPPET_LENGTH = 200
+
+# Bobot per sumber teks
+TITLE_WEIGHT = 5
+AUTHOR_WEIGHT = 3
+CATEGORY_WEIGHT = 2
+CONTENT_WEIGHT = 1
+COMMENT_WEIGHT = 1
+
+# Kata umum bahasa Indonesia yang tidak perlu di-index
+STOPWORDS = frozenset('''
+    dan yang di ke dari ini itu untuk dengan pada adalah atau juga tidak ada saya kami
+    kita anda akan sudah bisa dalam oleh karena jadi agar apa ya the
+'''.split())
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+# ==================== TOKENIZER ====================
+
+def normalize(text):
+    """Huruf kecil dan tanpa aksen"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    """Pecah teks menjadi kata yang di-index"""
+    for word in WORD_RE.findall(normalize(text)):
+        if len(word) >= MIN_TERM_LENGTH and word not in STOPWORDS:
+            yield word[:MAX_TERM_LENGTH]
+
+
+def build_terms(title, content, comments=(), author_names=(), category_labels=()):
+    """
+    Hitung bobot setiap kata untuk satu postingan
+
+    Returns:
+        dict {kata: bobot}
+    """
+    weights = {}
+    sources = [(title, TITLE_WEIGHT), (content, CONTENT_WEIGHT)]
+    sources += [(comment, COMMENT_WEIGHT) for comment in comments]
+    sources += [(name, AUTHOR_WEIGHT) for name in author_names]
+    sources += [(label, CATEGORY_WEIGHT) for label in category_labels]
+    for text, weight in sources:
+        for term in tokenize(text):
+            weights[term] = weights.get(term, 0) + weight
+    return weights
+
+
+# ==================== INDEXING ====================
+
+def index_post(post_id):
+    """Bangun ulang baris index untuk satu postingan (hapus lalu bulk insert)"""
+    post = ForumPost.objects.select_related('author').filter(id=post_id).first()
+    with transaction.atomic():
+        ForumSearchTerm.objects.filter(post_id=post_id).delete()
+        if post is None:
+            return 0
+        author_names = [post.author.name, post.author.username or ''] if post.author_id else []
+        terms = build_terms(
+            post.title,
+            post.content,
+            comments=post.comments.values_list('content', flat=True),
+            author_names=author_names,
+            category_labels=[post.category, post.get_category_display()],
+        )
+        ForumSearchTerm.objects.bulk_create(
+            [ForumSearchTerm(term=term, post_id=post_id, weight=weight) for term, weight in terms.items()],
+            batch_size=1000,
+        )
+    return len(terms)
+
+
+def rebuild_index():
+    """Bangun ulang index seluruh postingan forum"""
+    count = 0
+    for post_id in ForumPost.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=500):
+        index_post(post_id)
+        count += 1
+    return count
+
+
+class _IndexPost:
+    """Callback on_commit untuk satu postingan; post_id dipakai untuk mengenali jadwal yang sama"""
+
+    __slots__ = ('post_id',)
+
+    def __init__(self, post_id):
+        self.post_id = post_id
+
+    def __call__(self):
+        index_post(self.post_id)
+
+
+def schedule_index(post_id):
+    """
+    Index ulang postingan setelah transaksi yang sedang berjalan di-commit
+
+    Jadwal yang masih menunggu dicari di antrian on_commit koneksi itu sendiri.
+    Django membuang callback dari savepoint/transaksi yang di-rollback, jadi
+    postingan yang disimpan lagi setelah rollback dijadwalkan ulang, sedangkan
+    penyimpanan berulang dalam transaksi yang sama hanya di-index sekali.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(
+        isinstance(callback[1], _IndexPost) and callback[1].post_id == post_id
+        for callback in connection.run_on_commit
+    ):
+        return
+    # Di luar transaksi on_commit langsung dijalankan
+    transaction.on_commit(_IndexPost(post_id))
+
+
+def _post_saved(sender, instance, **kwargs):
+    schedule_index(instance.id)
+
+
+def _comment_changed(sender, instance, **kwargs):
+    schedule_index(instance.post_id)
+
+
+def _author_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Login hanya menyimpan last_login; nama penulis tidak berubah
+    if update_fields is not None and not {'name', 'username'} & set(update_fields):
+        return
+    if not created:
+        for post_id in instance.posts.values_list('id', flat=True):
+            schedule_index(post_id)
+
+
+post_save.connect(_post_saved, sender=ForumPost, dispatch_uid='main.forum_search.post')
+post_save.connect(_comment_changed, sender=ForumComment, dispatch_uid='main.forum_search.comment_save')
+post_delete.connect(_comment_changed, sender=ForumComment, dispatch_uid='main.forum_search.comment_delete')
+post_save.connect(_author_saved, sender=ForumUser, dispatch_uid='main.forum_search.author')
+
+
+# ==================== QUERY ====================
+
+def parse_query(query):
+    """Kata unik dari query pencarian, urutan dipertahankan"""
+    terms = []
+    for term in tokenize(query):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def _expand_terms(terms):
+    """
+    Daftar kata di index untuk setiap kata query
+    Kata terakhir diperlakukan sebagai awalan (pencarian sambil mengetik)
+    """
+    expanded = [[term] for term in terms[:-1]]
+    last = terms[-1]
+    prefixed = list(
+        # Range (bukan LIKE) agar selalu memakai index term
+        ForumSearchTerm.objects.filter(term__gte=last, term__lt=last[:-1] + chr(ord(last[-1]) + 1))
+        .order_by('term').values_list('term', flat=True).distinct()[:MAX_PREFIX_EXPANSIONS]
+    )
+    expanded.append(prefixed or [last])
+    return expanded
+
+
+class SearchPage(KeysetPage):
+    """Halaman hasil pencarian (urut skor), navigasi memakai ?page=N"""
+
+    def _query_with_cursor(self, page):
+        params = self._base_params.copy()
+        params[PAGE_PARAM] = page
+        return params.urlencode()
+
+
+def search_posts(query, request, per_page=10, filters=None):
+    """
+    Cari postingan forum, urut relevansi
+
+    Args:
+        query: teks pencarian
+        request: HttpRequest (nomor halaman dari ?page=)
+        filters: Q opsional untuk ForumPost (mis. kategori), dipakai lewat relasi post__
+
+    Returns:
+        SearchPage berisi ForumPost dengan atribut tambahan search_score dan search_snippet
+    """
+    try:
+        page = max(1, int(request.GET.get(PAGE_PARAM, 1)))
+    except ValueError:
+        page = 1
+    base_params = request.GET.copy()
+    base_params.pop(PAGE_PARAM, None)
+    base_params.pop('cursor', None)
+
+    terms = parse_query(query)
+    if not terms:
+        return SearchPage([], False, False, None, None, base_params, per_page)
+
+    expanded = _expand_terms(terms)
+    all_terms = [term for group in expanded for term in group]
+
+    # IDF per kata dari jumlah postingan yang memuatnya
+    total_posts = ForumPost.objects.count() or 1
+    document_frequency = dict(
+        ForumSearchTerm.objects.filter(term__in=all_terms)
+        .values('term').annotate(df=Count('post_id')).values_list('term', 'df')
+    )
+    idf = {term: math.log(1 + total_posts / (1 + document_frequency.get(term, 0))) for term in all_terms}
+
+    postings = ForumSearchTerm.objects.filter(term__in=all_terms)
+    if filters is not None:
+        postings = postings.filter(filters)
+
+    score = Sum(Case(
+        *[When(term=term, then=F('weight') * Value(idf[term])) for term in all_terms],
+        output_field=FloatField(),
+    ))
+    # Nomor kata query yang cocok; postingan harus memuat semua kata query
+    matched = Count(Case(
+        *[When(term__in=group, then=Value(index)) for index, group in enumerate(expanded)],
+    ), distinct=True)
+
+    ranked = (
+        postings.values('post_id')
+        .annotate(score=score, matched=matched)
+        .filter(matched=len(expanded))
+        .order_by('-score', '-post_id')
+    )
+    offset = (page - 1) * per_page
+    rows = list(ranked.values_list('post_id', 'score')[offset:offset + per_page + 1])
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    posts = ForumPost.objects.select_related('author').in_bulk([post_id for post_id, _ in rows])
+    results = []
+    for post_id, post_score in rows:
+        post = posts.get(post_id)
+        if post is None:
+            continue
+        post.search_score = post_score
+        post.search_snippet = highlight(post.content, terms)
+        post.search_title = highlight(post.title, terms, length=None)
+        results.append(post)
+
+    return SearchPage(
+        results, has_next, page > 1,
+        page + 1 if has_next else None,
+        page - 1 if page > 1 else None,
+        base_params, per_page,
+    )
+
+
+# ==================== SNIPPET ====================
+
+def highlight(text, terms, length=SNIPPET_LENGTH):
+    """
+    Potongan teks di sekitar kata yang cocok, dengan kata yang cocok dibungkus <mark>
+    HTML di teks asli di-escape; hasilnya aman dipakai langsung di template
+    """
+    text = text or ''
+    if not terms:
+        return escape(text[:length] if length else text)
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE)
+
+    start, end = 0, len(text)
+    if length and len(text) > length:
+        match = pattern.search(text)
+        center = match.start() if match else 0
+        start = max(0, center - length // 3)
+        end = min(len(text), start + length)
+        start = max(0, end - length)
+
+    fragment = text[start:end]
+    parts, last = [], 0
+    for match in pattern.finditer(fragment):
+        parts.append(escape(fragment[last:match.start()]))
+        parts.append(f'<mark>{escape(match.group(0))}</mark>')
+        last = match.end()
+    parts.append(escape(fragment[last:]))
+
+    snippet = ''.join(parts)
+    if start > 0:
+        snippet = '…' + snippet
+    if end < len(text):
+        snippet += '…'
+    return mark_safe(snippet)
@@ -0,0 +1,112 @@
+"""
+Identitas login (Admin, CS, Member, pengguna forum) per request
+
+IdentityMiddleware memasang request.principals. Setiap peran dicari paling
+banyak sekali per request: get_admin / get_cs / get_member / get_forum_user
+yang dipanggil berkali-kali (mis. lewat get_cs_base_context) memakai hasil
+yang sama.
+
+Di belakangnya ada cache lintas request dengan TTL pendek (IDENTITY_CACHE_TTL)
+dengan key peran dan ID akun yang tersimpan di session. Cache akun dihapus lewat
+signal saat Admin/CustomerService/Member/ForumUser disimpan atau dihapus,
+sehingga akun yang dinonaktifkan atau diubah langsung berlaku di request berikutnya.
+Cache ini hanya dipakai jika cache Django dibagi semua worker (REDIS_URL); dengan
+cache memori per proses, worker lain tidak melihat penghapusan itu, jadi akun
+dibaca dari database sekali per request.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.utils.deprecation import MiddlewareMixin
+
+from .models import Admin, CustomerService, ForumUser, Member
+from .shared_cache import is_shared
+
+DEFAULT_CACHE_TTL = 60
+CACHE_KEY_PREFIX = 'identity:'
+
+# Peran -> (model, key session, field lookup, filter tambahan)
+ROLES = {
+    'admin': (Admin, 'admin_id', 'id', {'is_active': True}),
+    'cs': (CustomerService, 'cs_id', 'id', {'is_active': True}),
+    'member': (Member, 'member_id', 'member_id', {}),
+    'forum_user': (ForumUser, 'forum_user_id', 'id', {}),
+}
+
+
+def _cache_ttl():
+    return getattr(settings, 'IDENTITY_CACHE_TTL', DEFAULT_CACHE_TTL)
+
+
+def _cache_key(role, value):
+    return f'{CACHE_KEY_PREFIX}{role}:{value}'
+
+
+def load_principal(request, role):
+    """Cari akun peran `role` dari session: cache bersama dulu (jika ada), lalu database"""
+    model, session_key, lookup, filters = ROLES[role]
+    value = request.session.get(session_key)
+    if not value:
+        return None
+
+    accounts = model.objects.filter(**{lookup: value}, **filters)
+    if not is_shared():
+        # Cache per proses tidak ikut dihapus saat akun diubah di worker lain
+        return accounts.first()
+
+    key = _cache_key(role, value)
+    principal = cache.get(key)
+    if principal is None:
+        principal = accounts.first()
+        if principal is not None:
+            cache.set(key, principal, _cache_ttl())
+    return principal
+
+
+class Principals:
+    """Akun login yang sudah dicari selama satu request (request.principals)"""
+
+    def __init__(self, request):
+        self._request = request
+        self._resolved = {}
+
+    def get(self, role):
+        if role not in self._resolved:
+            self._resolved[role] = load_principal(self._request, role)
+        return self._resolved[role]
+
+
+def get_principal(request, role):
+    principals = getattr(request, 'principals', None)
+    if principals is None:
+        # Request tanpa middleware (mis. dari test atau management command)
+        principals = request.principals = Principals(request)
+    return principals.get(role)
+
+
+class IdentityMiddleware(MiddlewareMixin):
+    """Pasang request.principals; harus setelah SessionMiddleware"""
+
+    def process_request(self, request):
+        request.principals = Principals(request)
+
+
+# ==================== INVALIDASI ====================
+
+def invalidate_principal(role, value):
+    cache.delete(_cache_key(role, value))
+
+
+def _principal_changed(sender, instance, update_fields=None, **kwargs):
+    # Dashboard member menyimpan last_login setiap dibuka; tidak perlu membuang cache
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    for role, (model, _, lookup, _) in ROLES.items():
+        if model is sender:
+            invalidate_principal(role, getattr(instance, lookup))
+
+
+for _role, (_model, *_) in ROLES.items():
+    post_save.connect(_principal_changed, sender=_model, dispatch_uid=f'main.identity.save.{_role}')
+    post_delete.connect(_principal_changed, sender=_model, dispatch_uid=f'main.identity.delete.{_role}')
@@ -0,0 +1,165 @@
+"""
+Penyimpanan foto berbasis hash isi (content-addressed) di MEDIA_ROOT
+
+- Foto asli disimpan di images/original/<2 karakter hash>/<sha256>.<ext>;
+  upload foto yang sama cukup memakai StoredImage yang sudah ada.
+- Thumbnail WebP (untuk daftar riwayat) dan salinan inferensi WebP yang
+  sudah diperkecil (untuk worker deteksi) dibuat di background thread pool
+  setelah transaksi di-commit. Foto yang terlewat bisa dibuat ulang dengan
+  `python manage.py generate_image_derivatives`.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connections, transaction
+
+from .models import StoredImage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THUMBNAIL_SIZE = 320
+DEFAULT_INFERENCE_SIZE = 1024
+DEFAULT_WORKERS = 2
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _path(kind, sha256, extension):
+    return f'images/{kind}/{sha256[:2]}/{sha256}.{extension}'
+
+
+def _save_exact(name, content, overwrite=False):
+    """
+    Simpan file dengan nama persis; jika sudah ada (isi sama), pakai yang lama
+    overwrite=True mengganti file lama, mis. turunan setelah ukuran thumbnail diubah
+    """
+    if default_storage.exists(name):
+        if not overwrite:
+            return name
+        default_storage.delete(name)
+    saved = default_storage.save(name, content)
+    if saved != name:
+        # Upload bersamaan dengan isi yang sama: storage membuat nama alternatif
+        default_storage.delete(saved)
+    return name
+
+
+# ==================== STORE ====================
+
+def store_image(uploaded_file):
+    """
+    Simpan foto upload berdasarkan SHA-256 isinya
+
+    Returns:
+        StoredImage (baru atau yang sudah ada untuk isi yang sama)
+    """
+    from PIL import Image
+
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    sha256 = digest.hexdigest()
+
+    existing = StoredImage.objects.filter(sha256=sha256).first()
+    if existing is not None:
+        return existing
+
+    uploaded_file.seek(0)
+    with Image.open(uploaded_file) as image:
+        image_format, (width, height) = image.format, image.size
+    uploaded_file.seek(0)
+
+    name = _save_exact(_path('original', sha256, EXTENSIONS.get(image_format, 'img')), uploaded_file)
+    try:
+        with transaction.atomic():
+            stored = StoredImage.objects.create(
+                sha256=sha256, original=name, width=width, height=height, size=uploaded_file.size,
+            )
+    except IntegrityError:
+        return StoredImage.objects.get(sha256=sha256)
+
+    schedule_derivatives(stored)
+    return stored
+
+
+# ==================== DERIVATIVES ====================
+
+def _encode_webp(image, max_size, quality):
+    copy = image.copy()
+    copy.thumbnail((max_size, max_size))
+    buffer = BytesIO()
+    copy.save(buffer, 'WEBP', quality=quality, method=4)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_derivatives(stored, overwrite=False):
+    """
+    Buat thumbnail dan salinan inferensi WebP untuk satu StoredImage
+    overwrite=True membuat ulang file yang sudah ada (generate_image_derivatives --all)
+    """
+    from PIL import Image, ImageOps
+
+    with default_storage.open(stored.original.name, 'rb') as original:
+        with Image.open(original) as image:
+            # Ikuti orientasi EXIF dari kamera HP agar thumbnail tidak miring
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            thumbnail = _save_exact(
+                _path('thumbnail', stored.sha256, 'webp'),
+                _encode_webp(image, _setting('IMAGE_THUMBNAIL_SIZE', DEFAULT_THUMBNAIL_SIZE), 75),
+                overwrite=overwrite,
+            )
+            inference = _save_exact(
+                _path('inference', stored.sha256, 'webp'),
+                _encode_webp(image, _setting('IMAGE_INFERENCE_SIZE', DEFAULT_INFERENCE_SIZE), 90),
+                overwrite=overwrite,
+            )
+
+    StoredImage.objects.filter(pk=stored.pk).update(thumbnail=thumbnail, inference=inference)
+    stored.thumbnail.name, stored.inference.name = thumbnail, inference
+    return stored
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_setting('IMAGE_PIPELINE_WORKERS', DEFAULT_WORKERS),
+                    thread_name_prefix='image-pipeline',
+                )
+    return _executor
+
+
+def _generate_in_background(stored_id):
+    try:
+        stored = StoredImage.objects.filter(pk=stored_id).first()
+        if stored is not None:
+            generate_derivatives(stored)
+    except Exception:
+        logger.exception('Gagal membuat thumbnail untuk StoredImage #%s', stored_id)
+    finally:
+        # Thread pool punya koneksi database sendiri, jangan biarkan menggantung
+        connections.close_all()
+
+
+def schedule_derivatives(stored):
+    """Jadwalkan pembuatan thumbnail di background setelah transaksi di-commit"""
+    if not _setting('IMAGE_PIPELINE_ASYNC', True):
+        generate_derivatives(stored)
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_generate_in_background, stored.pk))
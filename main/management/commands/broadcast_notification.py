@@ -0,0 +1,44 @@
+"""
+Django management command untuk mengirim notifikasi yang sama ke banyak member,
+misalnya pengumuman update firmware untuk semua pemilik RangBot Professional
+Jalankan dengan:
+    python manage.py broadcast_notification --package professional --title "Update Firmware" --message "..."
+    python manage.py broadcast_notification --all --title "Pemeliharaan Server" --message "..."
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import Member, Notification, PurchaseOrder
+from main.notifications import members_with_package, notify_members
+
+
+class Command(BaseCommand):
+    help = 'Mengirim notifikasi ke semua member aktif atau ke pemilik tipe paket tertentu'
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--package', choices=[value for value, _ in PurchaseOrder.PACKAGE_CHOICES], help='Hanya member yang memiliki perangkat aktif dengan tipe paket ini')
+        target.add_argument('--all', action='store_true', help='Semua member aktif')
+        parser.add_argument('--title', required=True, help='Judul notifikasi')
+        parser.add_argument('--message', required=True, help='Isi notifikasi')
+        parser.add_argument('--type', default='announcement', choices=[value for value, _ in Notification.NOTIFICATION_TYPES], help='Tipe notifikasi (default: announcement)')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            member_ids = Member.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)
+            target = 'semua member aktif'
+        else:
+            member_ids = members_with_package(options['package'])
+            target = f"pemilik paket {options['package']}"
+
+        title = options['title'].strip()
+        message = options['message'].strip()
+        if not title or not message:
+            raise CommandError('Judul dan isi notifikasi tidak boleh kosong')
+
+        self.stdout.write(f"📣 Mengirim notifikasi ke {target}...")
+        count = notify_members(member_ids, options['type'], title, message)
+        if count:
+            self.stdout.write(self.style.SUCCESS(f"✅ {count} notifikasi terkirim"))
+        else:
+            self.stdout.write(self.style.WARNING("⚠️  Tidak ada member yang cocok, tidak ada notifikasi dikirim"))
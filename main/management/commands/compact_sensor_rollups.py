@@ -0,0 +1,68 @@
+"""
+Django management command untuk membangun ulang rollup data sensor (menit/jam/hari)
+dari SensorReading mentah, dan opsional menghapus data mentah yang sudah lama
+Jalankan dengan: python manage.py compact_sensor_rollups --days 1
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from main.models import RangBotDevice, SensorReading
+from main.sensor_rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang rollup data sensor dari data mentah'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Rentang hari ke belakang yang dibangun ulang (default: 1); '
+                 'rollup yang data mentahnya sudah dihapus tetap dipertahankan',
+        )
+        parser.add_argument(
+            '--device',
+            type=str,
+            default=None,
+            help='Nomor seri perangkat (default: semua perangkat yang punya data di rentang tersebut)',
+        )
+        parser.add_argument(
+            '--prune-raw-days',
+            type=int,
+            default=None,
+            help='Hapus SensorReading mentah yang lebih tua dari N hari (rollup tetap disimpan)',
+        )
+
+    def handle(self, *args, **options):
+        end = timezone.now()
+        start = end - timedelta(days=options['days'])
+
+        readings = SensorReading.objects.filter(recorded_at__gte=start, recorded_at__lt=end)
+        if options['device']:
+            device = RangBotDevice.objects.filter(serial_number=options['device']).first()
+            if device is None:
+                self.stdout.write(self.style.ERROR(f"❌ Perangkat dengan nomor seri '{options['device']}' tidak ditemukan"))
+                return
+            device_ids = [device.id]
+        else:
+            device_ids = list(readings.order_by().values_list('device_id', flat=True).distinct())
+
+        total = 0
+        for device_id in device_ids:
+            total += rebuild_rollups(device_id, start, end)
+        self.stdout.write(self.style.SUCCESS(f"✅ Rollup {len(device_ids)} perangkat dibangun ulang dari {total} data mentah"))
+
+        if options['prune_raw_days']:
+            cutoff = end - timedelta(days=options['prune_raw_days'])
+            deleted = 0
+            while True:
+                ids = list(SensorReading.objects.filter(recorded_at__lt=cutoff).order_by().values_list('id', flat=True)[:5000])
+                if not ids:
+                    break
+                # SensorReading tidak punya relasi turunan, jadi delete() langsung menjadi satu DELETE
+                deleted += SensorReading.objects.filter(id__in=ids).delete()[0]
+            self.stdout.write(self.style.SUCCESS(f"🧹 {deleted} data mentah lebih dari {options['prune_raw_days']} hari dihapus"))
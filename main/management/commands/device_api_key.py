@@ -0,0 +1,36 @@
+"""
+Django management command untuk membuat (atau mengganti) API key telemetri perangkat
+Jalankan dengan: python manage.py device_api_key RBT-SN-01-88401
+"""
+
+from django.core.management.base import BaseCommand
+from main.models import RangBotDevice
+from main.telemetry import generate_device_api_key
+
+
+class Command(BaseCommand):
+    help = 'Membuat API key baru untuk endpoint telemetri perangkat RangBot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('serial_number', type=str, help='Nomor seri perangkat')
+
+    def handle(self, *args, **options):
+        serial_number = options['serial_number']
+        try:
+            device = RangBotDevice.objects.get(serial_number=serial_number)
+        except RangBotDevice.DoesNotExist:
+            self.stdout.write(self.style.ERROR(f"❌ Perangkat dengan nomor seri '{serial_number}' tidak ditemukan"))
+            return
+
+        replaced = bool(device.api_key_hash)
+        api_key = generate_device_api_key(device)
+        self.stdout.write(self.style.SUCCESS("=" * 60))
+        self.stdout.write(self.style.SUCCESS("✅ API KEY PERANGKAT BERHASIL DIBUAT!"))
+        self.stdout.write(self.style.SUCCESS("=" * 60))
+        self.stdout.write(f"Nomor Seri: {device.serial_number}")
+        self.stdout.write(f"API Key: {api_key}")
+        self.stdout.write(f"Endpoint: /api/devices/{device.serial_number}/telemetry/")
+        self.stdout.write(self.style.SUCCESS("=" * 60))
+        if replaced:
+            self.stdout.write(self.style.WARNING("⚠️  API key lama sudah tidak berlaku."))
+        self.stdout.write(self.style.WARNING("⚠️  Simpan API key ini sekarang, key tidak bisa ditampilkan lagi."))
@@ -0,0 +1,35 @@
+"""
+Django management command untuk menulis view count forum yang masih di buffer
+Jalankan dengan: python manage.py flush_forum_views
+(hanya untuk backend 'cache', mis. dijadwalkan lewat cron setiap menit)
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.view_counter import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = 'Menulis view count postingan forum yang masih di buffer cache ke database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Periksa counter semua postingan, bukan hanya yang tercatat mendapat view (setelah cache di-evict)',
+        )
+
+    def handle(self, *args, **options):
+        backend = getattr(settings, 'FORUM_VIEW_COUNTER_BACKEND', 'memory')
+        if backend != 'cache':
+            raise CommandError(
+                f"Backend '{backend}' menyimpan buffer di memori setiap proses web dan ditulis oleh proses itu "
+                "sendiri setiap FORUM_VIEW_FLUSH_INTERVAL detik; command ini hanya berlaku untuk backend 'cache'."
+            )
+        try:
+            applied = flush_view_counts(all_posts=options['all'])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Error saat menulis view count: {str(e)}"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"✅ {applied} view ditulis ke database"))
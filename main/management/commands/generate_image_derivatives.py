@@ -0,0 +1,40 @@
+"""
+Django management command untuk membuat thumbnail dan salinan inferensi WebP
+bagi StoredImage yang belum memilikinya (misalnya proses web berhenti sebelum
+background pool selesai, atau ukuran thumbnail diubah)
+Jalankan dengan: python manage.py generate_image_derivatives
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.image_store import generate_derivatives
+from main.models import StoredImage
+
+
+class Command(BaseCommand):
+    help = 'Membuat thumbnail dan salinan inferensi WebP untuk foto yang tersimpan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Buat ulang (timpa) turunan semua foto, bukan hanya yang belum punya thumbnail',
+        )
+
+    def handle(self, *args, **options):
+        images = StoredImage.objects.order_by('id')
+        if not options['all']:
+            images = images.filter(thumbnail='')
+
+        done = failed = 0
+        for stored in images.iterator(chunk_size=200):
+            try:
+                generate_derivatives(stored, overwrite=options['all'])
+                done += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"⚠️  StoredImage #{stored.id} gagal diproses: {e}"))
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {done} foto diproses"))
+        if failed:
+            self.stdout.write(self.style.ERROR(f"❌ {failed} foto gagal"))
@@ -0,0 +1,80 @@
+"""
+Django management command untuk retensi log aktivitas
+Log yang lebih tua dari batas retensi diarsipkan ke file .jsonl.gz lalu dihapus
+Jalankan dengan: python manage.py prune_activity_logs
+(disarankan dijadwalkan harian lewat cron)
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from main.activity_log import flush_activity_logs
+from main.retention import ensure_future_partitions, prune_activity_logs
+
+
+class Command(BaseCommand):
+    help = 'Arsipkan dan hapus log aktivitas yang melewati batas retensi'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.ACTIVITY_LOG_RETENTION_DAYS,
+            help=f'Umur maksimal log dalam hari (default: {settings.ACTIVITY_LOG_RETENTION_DAYS})',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            type=str,
+            default=settings.ACTIVITY_LOG_ARCHIVE_DIR,
+            help=f'Folder file arsip (default: {settings.ACTIVITY_LOG_ARCHIVE_DIR})',
+        )
+        parser.add_argument(
+            '--no-archive',
+            action='store_true',
+            help='Hapus log tanpa membuat arsip',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.ACTIVITY_LOG_DELETE_CHUNK_SIZE,
+            help=f'Jumlah baris per DELETE (default: {settings.ACTIVITY_LOG_DELETE_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Jumlah bulan partisi yang disiapkan ke depan, khusus MySQL (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days < 1:
+            self.stdout.write(self.style.ERROR('❌ --days minimal 1'))
+            return
+
+        cutoff = timezone.now() - timedelta(days=days)
+        archive_dir = None if options['no_archive'] else options['archive_dir']
+
+        # Pastikan log yang masih di buffer ikut terhitung
+        flush_activity_logs()
+
+        self.stdout.write(f"🗂️  Memproses log aktivitas sebelum {timezone.localtime(cutoff).strftime('%d-%m-%Y %H:%M')}")
+        try:
+            result = prune_activity_logs(cutoff, archive_dir=archive_dir, chunk_size=options['chunk_size'])
+            created = ensure_future_partitions(months_ahead=options['months_ahead'])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Error saat memproses log aktivitas: {str(e)}"))
+            return
+
+        if result['archive_path']:
+            self.stdout.write(f"📦 {result['archived']} log diarsipkan ke {result['archive_path']}")
+        elif archive_dir:
+            self.stdout.write('📦 Tidak ada log yang perlu diarsipkan')
+        if result['dropped_partitions']:
+            self.stdout.write(f"🧹 Partisi dihapus: {', '.join(result['dropped_partitions'])}")
+        if created:
+            self.stdout.write(f"➕ Partisi baru: {', '.join(created)}")
+        self.stdout.write(self.style.SUCCESS(f"✅ {result['deleted']} log dihapus dengan DELETE per chunk"))
@@ -0,0 +1,18 @@
+"""
+Django management command untuk membangun ulang token pencarian admin/CS
+(Member dan PurchaseOrder), misalnya setelah import data langsung ke database
+Jalankan dengan: python manage.py rebuild_admin_search_index
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.admin_search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang token pencarian member dan purchase order'
+
+    def handle(self, *args, **options):
+        self.stdout.write("🔎 Membangun ulang token pencarian...")
+        members, orders = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"✅ {members} member dan {orders} purchase order di-index"))
@@ -0,0 +1,18 @@
+"""
+Django management command untuk membangun ulang index pencarian forum
+Dipakai setelah mengubah tokenizer/bobot di main/forum_search.py atau jika index tidak sinkron
+Jalankan dengan: python manage.py rebuild_forum_search_index
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.forum_search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang index pencarian forum (ForumSearchTerm)'
+
+    def handle(self, *args, **options):
+        self.stdout.write("🔎 Membangun ulang index pencarian forum...")
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} postingan di-index"))
@@ -0,0 +1,19 @@
+"""
+Django management command untuk membangun ulang tabel LoginCredential
+dari Admin, CustomerService, dan Member, misalnya setelah import data
+atau update password langsung ke database
+Jalankan dengan: python manage.py rebuild_login_credentials
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.credentials import rebuild_credentials
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang index login gabungan Admin, CS, dan Member'
+
+    def handle(self, *args, **options):
+        self.stdout.write("🔑 Membangun ulang kredensial login...")
+        count = rebuild_credentials()
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} kredensial login dibuat"))
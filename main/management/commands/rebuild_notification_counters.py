@@ -0,0 +1,19 @@
+"""
+Django management command untuk menghitung ulang NotificationCounter
+(jumlah notifikasi belum dibaca per member), misalnya setelah notifikasi
+dihapus atau diubah langsung dari Django admin
+Jalankan dengan: python manage.py rebuild_notification_counters
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.notifications import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Menghitung ulang jumlah notifikasi belum dibaca setiap member'
+
+    def handle(self, *args, **options):
+        self.stdout.write("🔔 Menghitung ulang counter notifikasi...")
+        count = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f"✅ Counter notifikasi {count} member diperbarui"))
@@ -0,0 +1,104 @@
+"""
+Django management command untuk worker deteksi penyakit
+Mengambil DetectionJob dari antrian, menjalankan inferensi dengan micro-batching
+di process pool, lalu menulis hasilnya ke DetectionHistory
+Jalankan dengan: python manage.py run_detection_worker
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from main.detection import DEFAULT_BACKEND, claim_jobs, init_worker, job_image_path, requeue_stale_jobs, run_batch, save_results
+from main.models import DetectionJob
+
+
+class Command(BaseCommand):
+    help = 'Menjalankan worker deteksi penyakit (process pool + micro-batching)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.DETECTION_WORKERS,
+            help=f'Jumlah proses inferensi (default: {settings.DETECTION_WORKERS})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.DETECTION_BATCH_SIZE,
+            help=f'Maksimal foto per batch (default: {settings.DETECTION_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Proses antrian yang ada lalu berhenti (untuk cron/testing)',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        batch_size = max(1, options['batch_size'])
+        batch_wait = settings.DETECTION_BATCH_WAIT
+        poll_interval = settings.DETECTION_POLL_INTERVAL
+        backend_path = getattr(settings, 'DETECTION_BACKEND', DEFAULT_BACKEND)
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f"⚠️  {requeued} job macet dikembalikan ke antrian"))
+
+        self.stdout.write(self.style.SUCCESS(f"🚀 Worker deteksi berjalan ({workers} proses, batch {batch_size}, backend {backend_path})"))
+
+        processed = 0
+        in_flight = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(backend_path,)) as pool:
+            try:
+                while True:
+                    # Isi pool selama masih ada slot kosong
+                    while len(in_flight) < workers:
+                        jobs = self._collect_batch(batch_size, batch_wait, options['once'])
+                        if not jobs:
+                            break
+                        future = pool.submit(run_batch, [job_image_path(job) for job in jobs])
+                        in_flight[future] = jobs
+
+                    if not in_flight:
+                        if options['once']:
+                            break
+                        time.sleep(poll_interval)
+                        continue
+
+                    done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        jobs = in_flight.pop(future)
+                        try:
+                            results = future.result()
+                        except Exception as e:
+                            results = [{'error': f'Inferensi gagal: {e}'}] * len(jobs)
+                        close_old_connections()
+                        save_results(jobs, results)
+                        processed += len(jobs)
+                        self.stdout.write(f"✅ {len(jobs)} foto diproses (total {processed})")
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING("\n⚠️  Worker dihentikan"))
+                # Job yang belum selesai dikembalikan ke antrian
+                for jobs in in_flight.values():
+                    DetectionJob.objects.filter(id__in=[job.id for job in jobs]).update(status='pending', started_at=None)
+
+        self.stdout.write(self.style.SUCCESS(f"🏁 Selesai, {processed} foto diproses"))
+
+    def _collect_batch(self, batch_size, batch_wait, once):
+        """
+        Micro-batching dinamis: ambil job yang tersedia, lalu tunggu sebentar
+        (maks batch_wait detik) untuk mengisi batch sebelum dikirim ke pool
+        """
+        jobs = claim_jobs(batch_size)
+        if not jobs or once:
+            return jobs
+        deadline = time.monotonic() + batch_wait
+        while len(jobs) < batch_size and time.monotonic() < deadline:
+            time.sleep(min(0.05, batch_wait))
+            jobs += claim_jobs(batch_size - len(jobs))
+        return jobs
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+from datetime import date
+
+from django.utils import timezone
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_activity_log(apps, schema_editor):
+    """
+    Partisi main_activitylog per bulan (RANGE TO_DAYS(created_at)) - hanya MySQL
+    MySQL mensyaratkan kolom partisi ada di setiap unique key, jadi primary key
+    diubah menjadi (id, created_at). id tetap AUTO_INCREMENT dan unik.
+    """
+    if schema_editor.connection.vendor != 'mysql':
+        return
+
+    today = timezone.now().date()
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT MIN(created_at) FROM main_activitylog')
+        oldest = cursor.fetchone()[0]
+    oldest = oldest.date() if oldest else today
+
+    month = date(oldest.year, oldest.month, 1)
+    last_month = _add_months(date(today.year, today.month, 1), 3)
+    clauses = []
+    while month <= last_month:
+        upper = _add_months(month, 1)
+        clauses.append(
+            f"PARTITION p{month.year}{month.month:02d} VALUES LESS THAN (TO_DAYS('{upper.isoformat()}'))"
+        )
+        month = upper
+    clauses.append('PARTITION pmax VALUES LESS THAN MAXVALUE')
+
+    schema_editor.execute('ALTER TABLE main_activitylog DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)')
+    schema_editor.execute(
+        'ALTER TABLE main_activitylog PARTITION BY RANGE (TO_DAYS(created_at)) (%s)' % ', '.join(clauses)
+    )
+
+
+def unpartition_activity_log(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('ALTER TABLE main_activitylog REMOVE PARTITIONING')
+    schema_editor.execute('ALTER TABLE main_activitylog DROP PRIMARY KEY, ADD PRIMARY KEY (id)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_activitylog_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='performed_by',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_logs', to='main.admin', verbose_name='Dilakukan oleh'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='related_device',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_logs', to='main.rangbotdevice', verbose_name='Device Terkait'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='related_member',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_logs', to='main.member', verbose_name='Member Terkait'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='related_order',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_logs', to='main.purchaseorder', verbose_name='Purchase Order Terkait'),
+        ),
+        migrations.RunPython(partition_activity_log, unpartition_activity_log),
+    ]
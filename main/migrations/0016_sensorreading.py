@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_activitylog_monthly_partitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rangbotdevice',
+            name='api_key_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 dari API key perangkat untuk endpoint telemetri (python manage.py device_api_key)', max_length=64, null=True, verbose_name='Hash API Key'),
+        ),
+        migrations.CreateModel(
+            name='SensorReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recorded_at', models.DateTimeField(verbose_name='Waktu Pembacaan')),
+                ('temperature', models.FloatField(blank=True, null=True, verbose_name='Suhu (°C)')),
+                ('humidity', models.FloatField(blank=True, null=True, verbose_name='Kelembapan (%)')),
+                ('position', models.FloatField(blank=True, help_text='Posisi robot di sepanjang rail', null=True, verbose_name='Posisi')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sensor_readings', to='main.rangbotdevice', verbose_name='Perangkat')),
+            ],
+            options={
+                'verbose_name': 'Data Sensor',
+                'verbose_name_plural': 'Data Sensor',
+                'ordering': ['-recorded_at'],
+                'indexes': [models.Index(fields=['device', '-recorded_at'], name='main_sensor_device__ac06da_idx')],
+            },
+        ),
+    ]
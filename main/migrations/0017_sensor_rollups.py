@@ -0,0 +1,95 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_sensorreading'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SensorRollupMinute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField(verbose_name='Awal Bucket')),
+                ('reading_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Pembacaan')),
+                ('temperature_count', models.PositiveIntegerField(default=0)),
+                ('temperature_sum', models.FloatField(default=0)),
+                ('temperature_min', models.FloatField(blank=True, null=True)),
+                ('temperature_max', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.PositiveIntegerField(default=0)),
+                ('humidity_sum', models.FloatField(default=0)),
+                ('humidity_min', models.FloatField(blank=True, null=True)),
+                ('humidity_max', models.FloatField(blank=True, null=True)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.rangbotdevice', verbose_name='Perangkat')),
+            ],
+            options={
+                'verbose_name': 'Agregat Sensor per Menit',
+                'verbose_name_plural': 'Agregat Sensor per Menit',
+                'ordering': ['bucket_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SensorRollupHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField(verbose_name='Awal Bucket')),
+                ('reading_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Pembacaan')),
+                ('temperature_count', models.PositiveIntegerField(default=0)),
+                ('temperature_sum', models.FloatField(default=0)),
+                ('temperature_min', models.FloatField(blank=True, null=True)),
+                ('temperature_max', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.PositiveIntegerField(default=0)),
+                ('humidity_sum', models.FloatField(default=0)),
+                ('humidity_min', models.FloatField(blank=True, null=True)),
+                ('humidity_max', models.FloatField(blank=True, null=True)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.rangbotdevice', verbose_name='Perangkat')),
+            ],
+            options={
+                'verbose_name': 'Agregat Sensor per Jam',
+                'verbose_name_plural': 'Agregat Sensor per Jam',
+                'ordering': ['bucket_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SensorRollupDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField(verbose_name='Awal Bucket')),
+                ('reading_count', models.PositiveIntegerField(default=0, verbose_name='Jumlah Pembacaan')),
+                ('temperature_count', models.PositiveIntegerField(default=0)),
+                ('temperature_sum', models.FloatField(default=0)),
+                ('temperature_min', models.FloatField(blank=True, null=True)),
+                ('temperature_max', models.FloatField(blank=True, null=True)),
+                ('humidity_count', models.PositiveIntegerField(default=0)),
+                ('humidity_sum', models.FloatField(default=0)),
+                ('humidity_min', models.FloatField(blank=True, null=True)),
+                ('humidity_max', models.FloatField(blank=True, null=True)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.rangbotdevice', verbose_name='Perangkat')),
+            ],
+            options={
+                'verbose_name': 'Agregat Sensor per Hari',
+                'verbose_name_plural': 'Agregat Sensor per Hari',
+                'ordering': ['bucket_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sensorrollupminute',
+            constraint=models.UniqueConstraint(fields=('device', 'bucket_start'), name='unique_sensor_rollup_minute'),
+        ),
+        migrations.AddConstraint(
+            model_name='sensorrolluphour',
+            constraint=models.UniqueConstraint(fields=('device', 'bucket_start'), name='unique_sensor_rollup_hour'),
+        ),
+        migrations.AddConstraint(
+            model_name='sensorrollupday',
+            constraint=models.UniqueConstraint(fields=('device', 'bucket_start'), name='unique_sensor_rollup_day'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0017_sensor_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('original', models.FileField(max_length=255, upload_to='', verbose_name='Foto Asli')),
+                ('thumbnail', models.FileField(blank=True, max_length=255, upload_to='', verbose_name='Thumbnail')),
+                ('inference', models.FileField(blank=True, max_length=255, upload_to='', verbose_name='Salinan Inferensi')),
+                ('width', models.PositiveIntegerField(default=0, verbose_name='Lebar')),
+                ('height', models.PositiveIntegerField(default=0, verbose_name='Tinggi')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='Ukuran (byte)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Dibuat pada')),
+            ],
+            options={
+                'verbose_name': 'Foto',
+                'verbose_name_plural': 'Foto',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DetectionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detection_type', models.CharField(choices=[('auto', 'Otomatis'), ('manual', 'Manual')], default='manual', max_length=20, verbose_name='Tipe Deteksi')),
+                ('location', models.CharField(blank=True, max_length=200, null=True, verbose_name='Lokasi')),
+                ('status', models.CharField(choices=[('pending', 'Menunggu'), ('processing', 'Diproses'), ('done', 'Selesai'), ('failed', 'Gagal')], default='pending', max_length=20, verbose_name='Status')),
+                ('error_message', models.TextField(blank=True, null=True, verbose_name='Pesan Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Dibuat pada')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Mulai Diproses')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Selesai pada')),
+                ('detection', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job', to='main.detectionhistory', verbose_name='Hasil Deteksi')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='detection_jobs', to='main.storedimage', verbose_name='Foto')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detection_jobs', to='main.rangbotdevice', verbose_name='Perangkat')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detection_jobs', to='main.member', verbose_name='Member')),
+            ],
+            options={
+                'verbose_name': 'Job Deteksi',
+                'verbose_name_plural': 'Job Deteksi',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'id'], name='main_detect_status_669f39_idx')],
+            },
+        ),
+    ]
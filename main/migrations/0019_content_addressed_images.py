@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0018_detectionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='detectionhistory',
+            name='image',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='detections', to='main.storedimage', verbose_name='Foto'),
+        ),
+    ]
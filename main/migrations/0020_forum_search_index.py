@@ -0,0 +1,93 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:36
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Salinan tokenizer main/forum_search.py pada saat migration ini dibuat; migration
+# tidak boleh mengimpor kode aplikasi yang bisa berubah setelahnya
+MAX_TERM_LENGTH = 64
+MIN_TERM_LENGTH = 2
+TITLE_WEIGHT = 5
+AUTHOR_WEIGHT = 3
+CATEGORY_WEIGHT = 2
+CONTENT_WEIGHT = 1
+COMMENT_WEIGHT = 1
+STOPWORDS = frozenset('''
+    dan yang di ke dari ini itu untuk dengan pada adalah atau juga tidak ada saya kami
+    kita anda akan sudah bisa dalam oleh karena jadi agar apa ya the
+'''.split())
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    for word in WORD_RE.findall(normalize(text)):
+        if len(word) >= MIN_TERM_LENGTH and word not in STOPWORDS:
+            yield word[:MAX_TERM_LENGTH]
+
+
+def build_terms(title, content, comments=(), author_names=(), category_labels=()):
+    weights = {}
+    sources = [(title, TITLE_WEIGHT), (content, CONTENT_WEIGHT)]
+    sources += [(comment, COMMENT_WEIGHT) for comment in comments]
+    sources += [(name, AUTHOR_WEIGHT) for name in author_names]
+    sources += [(label, CATEGORY_WEIGHT) for label in category_labels]
+    for text, weight in sources:
+        for term in tokenize(text):
+            weights[term] = weights.get(term, 0) + weight
+    return weights
+
+
+def build_search_index(apps, schema_editor):
+    # Isi index untuk postingan yang sudah ada
+    ForumPost = apps.get_model('main', 'ForumPost')
+    ForumComment = apps.get_model('main', 'ForumComment')
+    ForumSearchTerm = apps.get_model('main', 'ForumSearchTerm')
+    category_labels = dict(ForumPost._meta.get_field('category').choices)
+
+    batch = []
+    for post in ForumPost.objects.select_related('author').order_by('id').iterator(chunk_size=500):
+        terms = build_terms(
+            post.title,
+            post.content,
+            comments=ForumComment.objects.filter(post_id=post.id).values_list('content', flat=True),
+            author_names=[post.author.name, post.author.username or ''],
+            category_labels=[post.category, category_labels.get(post.category, '')],
+        )
+        batch += [ForumSearchTerm(term=term, post_id=post.id, weight=weight) for term, weight in terms.items()]
+        if len(batch) >= 5000:
+            ForumSearchTerm.objects.bulk_create(batch)
+            batch = []
+    ForumSearchTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0019_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForumSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Kata')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='Bobot')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='main.forumpost', verbose_name='Postingan')),
+            ],
+            options={
+                'verbose_name': 'Indeks Pencarian Forum',
+                'verbose_name_plural': 'Indeks Pencarian Forum',
+                'indexes': [models.Index(fields=['term', 'post', 'weight'], name='main_forums_term_4dc043_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,136 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:40
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Salinan pembuat token main/admin_search.py pada saat migration ini dibuat; migration
+# tidak boleh mengimpor kode aplikasi yang bisa berubah setelahnya
+MAX_TOKEN_LENGTH = 100
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower().strip()
+
+
+def _phone_variants(phone):
+    digits = re.sub(r'\D', '', phone or '')
+    if not digits:
+        return []
+    variants = [digits]
+    if digits.startswith('62'):
+        variants.append('0' + digits[2:])
+    elif digits.startswith('0'):
+        variants.append('62' + digits[1:])
+    return variants
+
+
+def _text_tokens(*texts):
+    tokens = set()
+    for text in texts:
+        tokens.update(WORD_RE.findall(normalize(text)))
+    return tokens
+
+
+def _email_tokens(email):
+    email = normalize(email)
+    if not email:
+        return set()
+    return {email} | _text_tokens(email.split('@')[0])
+
+
+def build_tokens(exact=(), prefix=()):
+    tokens = {}
+    for token in exact:
+        token = normalize(token)[:MAX_TOKEN_LENGTH]
+        if token:
+            tokens[token] = False
+    for token in prefix:
+        token = token[:MAX_TOKEN_LENGTH]
+        if token:
+            tokens[token] = True
+    return tokens
+
+
+def member_tokens(member_id, username, full_name, email, phone, devices=()):
+    devices = list(devices)
+    return build_tokens(
+        exact=[member_id] + [serial for serial, _ in devices],
+        prefix=(
+            _text_tokens(username, full_name, *[name for _, name in devices])
+            | _email_tokens(email)
+            | set(_phone_variants(phone))
+            | ({normalize(username)} if username else set())
+        ),
+    )
+
+
+def order_tokens(order_id, member_id, customer_name, customer_email, customer_phone, company_name):
+    return build_tokens(
+        exact=[str(order_id)] + ([member_id] if member_id else []),
+        prefix=(
+            _text_tokens(customer_name, company_name)
+            | _email_tokens(customer_email)
+            | set(_phone_variants(customer_phone))
+        ),
+    )
+
+
+def build_search_tokens(apps, schema_editor):
+    # Isi token untuk data yang sudah ada
+    Member = apps.get_model('main', 'Member')
+    PurchaseOrder = apps.get_model('main', 'PurchaseOrder')
+    RangBotDevice = apps.get_model('main', 'RangBotDevice')
+    SearchToken = apps.get_model('main', 'SearchToken')
+
+    batch = []
+
+    def add(entity, object_id, tokens):
+        batch.extend(
+            SearchToken(entity=entity, object_id=object_id, token=token, is_prefix=is_prefix)
+            for token, is_prefix in tokens.items()
+        )
+        if len(batch) >= 5000:
+            SearchToken.objects.bulk_create(batch)
+            batch.clear()
+
+    for member in Member.objects.order_by('pk').iterator(chunk_size=1000):
+        devices = RangBotDevice.objects.filter(member_id=member.pk).values_list('serial_number', 'device_name')
+        add('member', member.pk, member_tokens(
+            member.member_id, member.username, member.full_name, member.email, member.phone, devices,
+        ))
+    for order in PurchaseOrder.objects.order_by('pk').iterator(chunk_size=1000):
+        add('order', order.pk, order_tokens(
+            order.pk, order.member_id, order.customer_name, order.customer_email,
+            order.customer_phone, order.company_name,
+        ))
+    SearchToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0020_forum_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('member', 'Member'), ('order', 'Purchase Order')], max_length=10, verbose_name='Jenis Data')),
+                ('object_id', models.BigIntegerField(verbose_name='ID Objek')),
+                ('token', models.CharField(max_length=100, verbose_name='Token')),
+                ('is_prefix', models.BooleanField(default=True, verbose_name='Boleh Cocok Awalan')),
+            ],
+            options={
+                'verbose_name': 'Token Pencarian',
+                'verbose_name_plural': 'Token Pencarian',
+                'indexes': [models.Index(fields=['entity', 'token', 'object_id'], name='main_search_entity_7ccac1_idx'), models.Index(fields=['entity', 'object_id'], name='main_search_entity_d8729a_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+def backfill_package_type(apps, schema_editor):
+    # Perangkat lama hanya bisa dikenali dari nama yang dibuat verify_purchase ("RangBot Pro 1")
+    RangBotDevice = apps.get_model('main', 'RangBotDevice')
+    RangBotDevice.objects.filter(device_name__icontains='pro').update(package_type='professional')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0021_admin_search_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rangbotdevice',
+            name='package_type',
+            field=models.CharField(choices=[('basic', 'Basic'), ('professional', 'Professional')], default='basic', help_text='Diisi saat verifikasi purchase order, tidak bergantung pada nama perangkat', max_length=20, verbose_name='Tipe Paket'),
+        ),
+        migrations.RunPython(backfill_package_type, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='rangbotdevice',
+            index=models.Index(fields=['member', 'package_type'], name='main_rangbo_member__f7a03f_idx'),
+        ),
+    ]
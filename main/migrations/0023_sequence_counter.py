@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:43
+
+import re
+
+from django.db import migrations, models
+
+MEMBER_ID_RE = re.compile(r'^MBR-(\d{4})-(\d+)$')
+SERIAL_NUMBER_RE = re.compile(r'^RBT-SN-01-(\d+)$')
+SERIAL_BASE_NUMBER = 88400
+
+
+def seed_counters(apps, schema_editor):
+    # Lanjutkan dari nomor terbesar yang sudah terpakai agar tidak bentrok dengan data lama
+    Member = apps.get_model('main', 'Member')
+    PurchaseOrder = apps.get_model('main', 'PurchaseOrder')
+    RangBotDevice = apps.get_model('main', 'RangBotDevice')
+    SequenceCounter = apps.get_model('main', 'SequenceCounter')
+
+    counters = {}
+    member_ids = list(Member.objects.values_list('member_id', flat=True))
+    member_ids += PurchaseOrder.objects.filter(member_id__isnull=False).values_list('member_id', flat=True)
+    for member_id in member_ids:
+        match = MEMBER_ID_RE.match(member_id or '')
+        if match:
+            name = f'member_id:{match.group(1)}'
+            counters[name] = max(counters.get(name, 0), int(match.group(2)))
+
+    for serial_number in RangBotDevice.objects.values_list('serial_number', flat=True).iterator():
+        match = SERIAL_NUMBER_RE.match(serial_number)
+        if match:
+            sequence = int(match.group(1)) - SERIAL_BASE_NUMBER
+            counters['serial_number'] = max(counters.get('serial_number', 0), sequence)
+
+    SequenceCounter.objects.bulk_create([
+        SequenceCounter(name=name, value=value) for name, value in counters.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0022_rangbotdevice_package_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Contoh: serial_number, member_id:2025', max_length=50, unique=True, verbose_name='Nama Urutan')),
+                ('value', models.BigIntegerField(default=0, help_text='Nomor terakhir yang sudah dialokasikan', verbose_name='Nomor Terakhir')),
+            ],
+            options={
+                'verbose_name': 'Penghitung Nomor Urut',
+                'verbose_name_plural': 'Penghitung Nomor Urut',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
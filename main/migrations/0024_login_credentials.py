@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:47
+
+from django.db import migrations, models
+
+
+def backfill_credentials(apps, schema_editor):
+    LoginCredential = apps.get_model('main', 'LoginCredential')
+    credentials = []
+    for role, model_name in (('admin', 'Admin'), ('cs', 'CustomerService'), ('member', 'Member')):
+        accounts = apps.get_model('main', model_name).objects.all()
+        if role == 'member':
+            accounts = accounts.filter(is_registered=True, username__isnull=False).exclude(username='')
+        for account in accounts.iterator():
+            credentials.append(LoginCredential(
+                username=account.username,
+                role=role,
+                account_id=account.pk,
+                member_id=account.member_id if role == 'member' else None,
+                full_name=account.full_name,
+                password=account.password or '',
+                is_active=account.is_active,
+            ))
+    LoginCredential.objects.bulk_create(credentials, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0023_sequence_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginCredential',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=100, verbose_name='Username')),
+                ('role', models.CharField(choices=[('admin', 'Admin'), ('cs', 'Customer Service'), ('member', 'Member')], max_length=10, verbose_name='Peran')),
+                ('account_id', models.PositiveBigIntegerField(help_text='Primary key Admin / CustomerService / Member', verbose_name='ID Akun')),
+                ('member_id', models.CharField(blank=True, max_length=20, null=True, verbose_name='ID Member')),
+                ('full_name', models.CharField(max_length=200, verbose_name='Nama Lengkap')),
+                ('password', models.CharField(blank=True, max_length=255, verbose_name='Password')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Aktif')),
+            ],
+            options={
+                'verbose_name': 'Kredensial Login',
+                'verbose_name_plural': 'Kredensial Login',
+                'indexes': [models.Index(fields=['username'], name='main_loginc_usernam_053c5f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='logincredential',
+            constraint=models.UniqueConstraint(fields=('role', 'account_id'), name='unique_login_credential_account'),
+        ),
+        migrations.RunPython(backfill_credentials, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    # Satu baris per member, termasuk yang belum punya notifikasi belum dibaca
+    Member = apps.get_model('main', 'Member')
+    NotificationCounter = apps.get_model('main', 'NotificationCounter')
+    members = Member.objects.annotate(
+        unread=Count('notifications', filter=Q(notifications__is_read=False))
+    ).values_list('pk', 'unread')
+    NotificationCounter.objects.bulk_create(
+        (NotificationCounter(member_id=pk, unread_count=unread) for pk, unread in members.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0024_login_credentials'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to='main.member', verbose_name='Member')),
+                ('unread_count', models.PositiveIntegerField(default=0, verbose_name='Belum Dibaca')),
+            ],
+            options={
+                'verbose_name': 'Penghitung Notifikasi',
+                'verbose_name_plural': 'Penghitung Notifikasi',
+            },
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('sensor_update', 'Update Sensor'), ('detection_new', 'Deteksi Baru'), ('sensor_warning', 'Peringatan Sensor'), ('device_offline', 'Perangkat Offline'), ('device_added', 'Perangkat Ditambahkan'), ('announcement', 'Pengumuman')], max_length=20, verbose_name='Tipe Notifikasi'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:55
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    # Satu baris untuk setiap status, termasuk yang belum punya pesan
+    ContactMessage = apps.get_model('main', 'ContactMessage')
+    ContactMessageCounter = apps.get_model('main', 'ContactMessageCounter')
+    counts = dict(ContactMessage.objects.order_by().values_list('status').annotate(total=Count('id')))
+    ContactMessageCounter.objects.bulk_create([
+        ContactMessageCounter(status=status, count=counts.get(status, 0))
+        for status, _ in ContactMessage._meta.get_field('status').choices
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0025_notification_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactMessageCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('new', 'Baru'), ('read', 'Sudah Dibaca'), ('replied', 'Sudah Dibalas'), ('archived', 'Diarsipkan')], max_length=20, unique=True, verbose_name='Status')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Jumlah')),
+            ],
+            options={
+                'verbose_name': 'Penghitung Pesan CS',
+                'verbose_name_plural': 'Penghitung Pesan CS',
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0026_contact_message_counter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='action_type',
+            field=models.CharField(choices=[('order_created', 'Pembelian Baru'), ('order_verified', 'Verifikasi Pembelian'), ('order_rejected', 'Pembelian Ditolak'), ('member_created', 'Member ID Dibuat'), ('member_registered', 'Member Terdaftar'), ('serial_created', 'Nomor Seri Dibuat'), ('member_updated', 'Data Member Diperbarui'), ('member_deactivated', 'Member Dinonaktifkan'), ('member_activated', 'Member Diaktifkan'), ('serial_updated', 'Nomor Seri Diperbarui'), ('product_updated', 'Produk Diperbarui'), ('admin_created', 'Admin Dibuat'), ('admin_deactivated', 'Admin Dinonaktifkan'), ('cs_created', 'Customer Service Dibuat'), ('cs_deleted', 'Customer Service Dihapus'), ('forum_post_created', 'Postingan Forum Baru'), ('forum_comment_created', 'Komentar Forum Baru'), ('forum_post_edited', 'Postingan Forum Diedit'), ('forum_comment_edited', 'Komentar Forum Diedit'), ('forum_post_deleted', 'Postingan Forum Dihapus'), ('forum_comment_deleted', 'Komentar Forum Dihapus'), ('system_error', 'Error Sistem')], max_length=50, verbose_name='Tipe Aksi'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0027_activitylog_action_type_choices'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='detectionhistory',
+            name='image_url',
+            field=models.CharField(max_length=500, verbose_name='URL Gambar'),
+        ),
+    ]
@@ -68,6 +68,9 @@ class ForumPost(models.Model):
         verbose_name = 'Postingan Forum'
         verbose_name_plural = 'Postingan Forum'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return self.title
@@ -109,6 +112,28 @@ class ForumComment(models.Model):
             return f"Komentar pada {self.post.title}"
 
 
+class ForumSearchTerm(models.Model):
+    """
+    Inverted index pencarian forum: satu baris per (kata, postingan)
+    Bobot menggabungkan kemunculan kata di judul, isi, komentar, penulis, dan kategori.
+    Diperbarui otomatis saat postingan/komentar disimpan (lihat main/forum_search.py)
+    """
+    term = models.CharField(max_length=64, verbose_name='Kata')
+    post = models.ForeignKey(ForumPost, on_delete=models.CASCADE, related_name='search_terms', verbose_name='Postingan')
+    weight = models.PositiveIntegerField(default=1, verbose_name='Bobot')
+    
+    class Meta:
+        verbose_name = 'Indeks Pencarian Forum'
+        verbose_name_plural = 'Indeks Pencarian Forum'
+        indexes = [
+            # Covering index: pencarian cukup membaca index tanpa menyentuh tabel
+            models.Index(fields=['term', 'post', 'weight']),
+        ]
+    
+    def __str__(self):
+        return f'{self.term} -> {self.post_id}'
+
+
 class Admin(models.Model):
     """
     Model untuk admin sistem
@@ -151,6 +176,41 @@ class CustomerService(models.Model):
         return f"{self.full_name} ({self.username})"
 
 
+class LoginCredential(models.Model):
+    """
+    Index login gabungan Admin, Customer Service, dan Member
+    Satu baris per akun yang bisa login, disalin otomatis lewat signal (main/credentials.py)
+    sehingga login cukup satu lookup berdasarkan username
+    """
+    ROLE_CHOICES = [
+        ('admin', 'Admin'),
+        ('cs', 'Customer Service'),
+        ('member', 'Member'),
+    ]
+    
+    username = models.CharField(max_length=100, verbose_name='Username')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, verbose_name='Peran')
+    account_id = models.PositiveBigIntegerField(verbose_name='ID Akun', help_text='Primary key Admin / CustomerService / Member')
+    member_id = models.CharField(max_length=20, blank=True, null=True, verbose_name='ID Member')
+    full_name = models.CharField(max_length=200, verbose_name='Nama Lengkap')
+    password = models.CharField(max_length=255, blank=True, verbose_name='Password')  # Hashed password
+    is_active = models.BooleanField(default=True, verbose_name='Aktif')
+    
+    class Meta:
+        verbose_name = 'Kredensial Login'
+        verbose_name_plural = 'Kredensial Login'
+        constraints = [
+            models.UniqueConstraint(fields=['role', 'account_id'], name='unique_login_credential_account'),
+        ]
+        indexes = [
+            # Login: WHERE username = ..
+            models.Index(fields=['username']),
+        ]
+    
+    def __str__(self):
+        return f"{self.username} ({self.get_role_display()})"
+
+
 class PurchaseOrder(models.Model):
     """
     Model untuk order pembelian RangBot
@@ -203,6 +263,9 @@ class PurchaseOrder(models.Model):
         verbose_name = 'Purchase Order'
         verbose_name_plural = 'Purchase Orders'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"Order #{self.id} - {self.customer_name} ({self.status})"
@@ -247,6 +310,9 @@ class Member(models.Model):
         verbose_name = 'Member'
         verbose_name_plural = 'Members'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.full_name} ({self.member_id})"
@@ -272,16 +338,22 @@ class RangBotDevice(models.Model):
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='rangbot_devices', verbose_name='Member')
     purchase_order = models.ForeignKey(PurchaseOrder, on_delete=models.SET_NULL, null=True, blank=True, related_name='devices', verbose_name='Purchase Order', help_text='Order yang menghasilkan device ini')
     device_name = models.CharField(max_length=100, blank=True, null=True, verbose_name='Nama Perangkat', help_text='Contoh: RangBot 1, RangBot 2')
+    package_type = models.CharField(max_length=20, choices=PurchaseOrder.PACKAGE_CHOICES, default='basic', verbose_name='Tipe Paket', help_text='Diisi saat verifikasi purchase order, tidak bergantung pada nama perangkat')
     covered_blocks = models.CharField(max_length=200, blank=True, null=True, verbose_name='Blok yang Dicakup', help_text='Contoh: A, B atau C, D')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='offline', verbose_name='Status')
     is_active = models.BooleanField(default=True, verbose_name='Aktif')
     last_data_update = models.DateTimeField(null=True, blank=True, verbose_name='Update Data Terakhir')
+    api_key_hash = models.CharField(max_length=64, blank=True, null=True, verbose_name='Hash API Key', help_text='SHA-256 dari API key perangkat untuk endpoint telemetri (python manage.py device_api_key)')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Ditambahkan pada')
     
     class Meta:
         verbose_name = 'Perangkat RangBot'
         verbose_name_plural = 'Perangkat RangBot'
         ordering = ['-created_at']
+        indexes = [
+            # Statistik perangkat: GROUP BY member, package_type
+            models.Index(fields=['member', 'package_type']),
+        ]
     
     def __str__(self):
         return f"{self.device_name or self.serial_number} ({self.member.member_id})"
@@ -302,12 +374,75 @@ class RangBotDevice(models.Model):
         return "Blok belum ditentukan"
 
 
+
+class SearchToken(models.Model):
+    """
+    Token pencarian admin/CS yang sudah dinormalisasi (huruf kecil, tanpa aksen)
+    Satu baris per kata dari nama, email, telepon, ID, dan nomor seri sebuah
+    Member atau PurchaseOrder. Token ID/nomor seri hanya cocok persis, token
+    nama/email/telepon cocok berdasarkan awalan (lihat main/admin_search.py)
+    """
+    ENTITY_CHOICES = [
+        ('member', 'Member'),
+        ('order', 'Purchase Order'),
+    ]
+    
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES, verbose_name='Jenis Data')
+    object_id = models.BigIntegerField(verbose_name='ID Objek')
+    token = models.CharField(max_length=100, verbose_name='Token')
+    is_prefix = models.BooleanField(default=True, verbose_name='Boleh Cocok Awalan')
+    
+    class Meta:
+        verbose_name = 'Token Pencarian'
+        verbose_name_plural = 'Token Pencarian'
+        indexes = [
+            # Pencarian: WHERE entity = .. AND token >= .. AND token < .. (range scan)
+            models.Index(fields=['entity', 'token', 'object_id']),
+            # Pemeliharaan: hapus token lama satu objek
+            models.Index(fields=['entity', 'object_id']),
+        ]
+    
+    def __str__(self):
+        return f'{self.entity}:{self.object_id} {self.token}'
+
+
+class StoredImage(models.Model):
+    """
+    Foto yang disimpan berdasarkan hash isi (SHA-256) di MEDIA_ROOT
+    Foto yang sama hanya disimpan sekali; thumbnail dan salinan inferensi (WebP)
+    dibuat di background oleh main/image_store.py
+    """
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name='SHA-256')
+    original = models.FileField(max_length=255, verbose_name='Foto Asli')
+    thumbnail = models.FileField(max_length=255, blank=True, verbose_name='Thumbnail')
+    inference = models.FileField(max_length=255, blank=True, verbose_name='Salinan Inferensi')
+    width = models.PositiveIntegerField(default=0, verbose_name='Lebar')
+    height = models.PositiveIntegerField(default=0, verbose_name='Tinggi')
+    size = models.PositiveIntegerField(default=0, verbose_name='Ukuran (byte)')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Dibuat pada')
+    
+    class Meta:
+        verbose_name = 'Foto'
+        verbose_name_plural = 'Foto'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.sha256
+    
+    @property
+    def thumbnail_url(self):
+        """URL thumbnail, atau foto asli jika thumbnail belum selesai dibuat"""
+        return self.thumbnail.url if self.thumbnail else self.original.url
+
+
 class DetectionHistory(models.Model):
     """
     Model untuk riwayat deteksi penyakit stroberi
     """
     device = models.ForeignKey(RangBotDevice, on_delete=models.CASCADE, related_name='detections', verbose_name='Perangkat')
-    image_url = models.URLField(verbose_name='URL Gambar')
+    # Path /media/... untuk foto di StoredImage atau URL lengkap untuk data lama/eksternal
+    image_url = models.CharField(max_length=500, verbose_name='URL Gambar')
+    image = models.ForeignKey(StoredImage, on_delete=models.SET_NULL, null=True, blank=True, related_name='detections', verbose_name='Foto')
     disease_detected = models.CharField(max_length=200, blank=True, null=True, verbose_name='Penyakit Terdeteksi')
     confidence = models.FloatField(null=True, blank=True, verbose_name='Tingkat Keyakinan')
     location = models.CharField(max_length=200, blank=True, null=True, verbose_name='Lokasi')
@@ -321,6 +456,140 @@ class DetectionHistory(models.Model):
     
     def __str__(self):
         return f"Deteksi {self.detection_type} - {self.device.serial_number} ({self.created_at})"
+    
+    @property
+    def thumbnail_url(self):
+        """Thumbnail untuk daftar riwayat; fallback ke image_url untuk data lama/eksternal"""
+        return self.image.thumbnail_url if self.image_id else self.image_url
+    
+    @property
+    def full_image_url(self):
+        return self.image.original.url if self.image_id else self.image_url
+
+
+class DetectionJob(models.Model):
+    """
+    Antrian deteksi penyakit dari foto yang diupload member
+    View hanya menyimpan foto dan membuat job; inferensi dijalankan oleh
+    worker terpisah (python manage.py run_detection_worker)
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Menunggu'),
+        ('processing', 'Diproses'),
+        ('done', 'Selesai'),
+        ('failed', 'Gagal'),
+    ]
+    
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='detection_jobs', verbose_name='Member')
+    device = models.ForeignKey(RangBotDevice, on_delete=models.CASCADE, related_name='detection_jobs', verbose_name='Perangkat')
+    image = models.ForeignKey(StoredImage, on_delete=models.PROTECT, related_name='detection_jobs', verbose_name='Foto')
+    detection_type = models.CharField(max_length=20, choices=[('auto', 'Otomatis'), ('manual', 'Manual')], default='manual', verbose_name='Tipe Deteksi')
+    location = models.CharField(max_length=200, blank=True, null=True, verbose_name='Lokasi')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='Status')
+    detection = models.OneToOneField(DetectionHistory, on_delete=models.SET_NULL, null=True, blank=True, related_name='job', verbose_name='Hasil Deteksi')
+    error_message = models.TextField(blank=True, null=True, verbose_name='Pesan Error')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Dibuat pada')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Mulai Diproses')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Selesai pada')
+    
+    class Meta:
+        verbose_name = 'Job Deteksi'
+        verbose_name_plural = 'Job Deteksi'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"Job #{self.id} ({self.get_status_display()}) - {self.device.serial_number}"
+
+class SensorReading(models.Model):
+    """
+    Model time-series untuk data sensor yang dikirim perangkat RangBot
+    Dibuat ringkas (tanpa kolom tambahan) karena jumlah barisnya sangat besar
+    """
+    device = models.ForeignKey(RangBotDevice, on_delete=models.CASCADE, related_name='sensor_readings', verbose_name='Perangkat')
+    recorded_at = models.DateTimeField(verbose_name='Waktu Pembacaan')
+    temperature = models.FloatField(null=True, blank=True, verbose_name='Suhu (°C)')
+    humidity = models.FloatField(null=True, blank=True, verbose_name='Kelembapan (%)')
+    position = models.FloatField(null=True, blank=True, verbose_name='Posisi', help_text='Posisi robot di sepanjang rail')
+    
+    class Meta:
+        verbose_name = 'Data Sensor'
+        verbose_name_plural = 'Data Sensor'
+        ordering = ['-recorded_at']
+        indexes = [
+            models.Index(fields=['device', '-recorded_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.device_id} @ {self.recorded_at}"
+
+
+class SensorRollup(models.Model):
+    """
+    Base model agregat data sensor per bucket waktu (min/max/sum/count per perangkat)
+    Rata-rata dihitung dari sum / count agar bucket bisa digabung secara incremental
+    """
+    device = models.ForeignKey(RangBotDevice, on_delete=models.CASCADE, verbose_name='Perangkat')
+    bucket_start = models.DateTimeField(verbose_name='Awal Bucket')
+    reading_count = models.PositiveIntegerField(default=0, verbose_name='Jumlah Pembacaan')
+    temperature_count = models.PositiveIntegerField(default=0)
+    temperature_sum = models.FloatField(default=0)
+    temperature_min = models.FloatField(null=True, blank=True)
+    temperature_max = models.FloatField(null=True, blank=True)
+    humidity_count = models.PositiveIntegerField(default=0)
+    humidity_sum = models.FloatField(default=0)
+    humidity_min = models.FloatField(null=True, blank=True)
+    humidity_max = models.FloatField(null=True, blank=True)
+    
+    class Meta:
+        abstract = True
+        ordering = ['bucket_start']
+    
+    def __str__(self):
+        return f"{self.device_id} @ {self.bucket_start}"
+    
+    @property
+    def temperature_avg(self):
+        return self.temperature_sum / self.temperature_count if self.temperature_count else None
+    
+    @property
+    def humidity_avg(self):
+        return self.humidity_sum / self.humidity_count if self.humidity_count else None
+
+
+class SensorRollupMinute(SensorRollup):
+    """Agregat data sensor per menit"""
+    
+    class Meta(SensorRollup.Meta):
+        verbose_name = 'Agregat Sensor per Menit'
+        verbose_name_plural = 'Agregat Sensor per Menit'
+        constraints = [
+            models.UniqueConstraint(fields=['device', 'bucket_start'], name='unique_sensor_rollup_minute'),
+        ]
+
+
+class SensorRollupHour(SensorRollup):
+    """Agregat data sensor per jam"""
+    
+    class Meta(SensorRollup.Meta):
+        verbose_name = 'Agregat Sensor per Jam'
+        verbose_name_plural = 'Agregat Sensor per Jam'
+        constraints = [
+            models.UniqueConstraint(fields=['device', 'bucket_start'], name='unique_sensor_rollup_hour'),
+        ]
+
+
+class SensorRollupDay(SensorRollup):
+    """Agregat data sensor per hari"""
+    
+    class Meta(SensorRollup.Meta):
+        verbose_name = 'Agregat Sensor per Hari'
+        verbose_name_plural = 'Agregat Sensor per Hari'
+        constraints = [
+            models.UniqueConstraint(fields=['device', 'bucket_start'], name='unique_sensor_rollup_day'),
+        ]
 
 
 class Notification(models.Model):
@@ -333,6 +602,7 @@ class Notification(models.Model):
         ('sensor_warning', 'Peringatan Sensor'),
         ('device_offline', 'Perangkat Offline'),
         ('device_added', 'Perangkat Ditambahkan'),
+        ('announcement', 'Pengumuman'),
     ]
     
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='notifications', verbose_name='Member')
@@ -346,11 +616,31 @@ class Notification(models.Model):
         verbose_name = 'Notifikasi'
         verbose_name_plural = 'Notifikasi'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.member.member_id}"
 
 
+class NotificationCounter(models.Model):
+    """
+    Jumlah notifikasi belum dibaca per member (denormalisasi)
+    Diubah hanya lewat main/notifications.py dengan UPDATE unread_count = unread_count + n
+    di transaksi yang sama dengan perubahan Notification
+    """
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter', verbose_name='Member')
+    unread_count = models.PositiveIntegerField(default=0, verbose_name='Belum Dibaca')
+    
+    class Meta:
+        verbose_name = 'Penghitung Notifikasi'
+        verbose_name_plural = 'Penghitung Notifikasi'
+    
+    def __str__(self):
+        return f"{self.member_id}: {self.unread_count} belum dibaca"
+
+
 class ProductInfo(models.Model):
     """
     Model untuk informasi produk dan landing page
@@ -423,6 +713,9 @@ class Article(models.Model):
         verbose_name = 'Artikel'
         verbose_name_plural = 'Artikel'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return self.title
@@ -460,12 +753,15 @@ class ActivityLog(models.Model):
     
     action_type = models.CharField(max_length=50, choices=ACTION_TYPES, verbose_name='Tipe Aksi')
     description = models.TextField(verbose_name='Deskripsi')
-    performed_by = models.ForeignKey(Admin, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_logs', verbose_name='Dilakukan oleh')
-    related_order = models.ForeignKey(PurchaseOrder, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_logs', verbose_name='Purchase Order Terkait')
-    related_member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_logs', verbose_name='Member Terkait')
-    related_device = models.ForeignKey(RangBotDevice, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_logs', verbose_name='Device Terkait')
+    # db_constraint=False: tabel log dipartisi per bulan di MySQL (lihat main/retention.py),
+    # dan MySQL tidak mengizinkan foreign key pada tabel yang dipartisi
+    performed_by = models.ForeignKey(Admin, on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False, related_name='activity_logs', verbose_name='Dilakukan oleh')
+    related_order = models.ForeignKey(PurchaseOrder, on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False, related_name='activity_logs', verbose_name='Purchase Order Terkait')
+    related_member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False, related_name='activity_logs', verbose_name='Member Terkait')
+    related_device = models.ForeignKey(RangBotDevice, on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False, related_name='activity_logs', verbose_name='Device Terkait')
     metadata = models.JSONField(default=dict, blank=True, verbose_name='Metadata', help_text='Data tambahan dalam format JSON')
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Waktu')
+    # default (bukan auto_now_add) agar waktu kejadian tetap terjaga saat ditulis batch oleh log_activity
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='Waktu')
     
     class Meta:
         verbose_name = 'Log Aktivitas'
@@ -505,6 +801,42 @@ class ContactMessage(models.Model):
         verbose_name = 'Pesan Customer Service'
         verbose_name_plural = 'Pesan Customer Service'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject} ({self.get_status_display()})"
+
+
+class ContactMessageCounter(models.Model):
+    """
+    Jumlah ContactMessage per status (denormalisasi untuk sidebar dan dashboard CS)
+    Diubah hanya lewat main/contact_messages.py di transaksi yang sama dengan perubahan status pesan
+    """
+    status = models.CharField(max_length=20, choices=ContactMessage.STATUS_CHOICES, unique=True, verbose_name='Status')
+    count = models.PositiveIntegerField(default=0, verbose_name='Jumlah')
+    
+    class Meta:
+        verbose_name = 'Penghitung Pesan CS'
+        verbose_name_plural = 'Penghitung Pesan CS'
+    
+    def __str__(self):
+        return f"{self.status} = {self.count}"
+
+
+class SequenceCounter(models.Model):
+    """
+    Penghitung nomor urut untuk Member ID dan nomor seri
+    Satu baris per urutan; nomor dialokasikan dengan UPDATE value = value + n
+    sehingga dua admin yang memverifikasi bersamaan tidak mendapat nomor yang sama
+    """
+    name = models.CharField(max_length=50, unique=True, verbose_name='Nama Urutan', help_text='Contoh: serial_number, member_id:2025')
+    value = models.BigIntegerField(default=0, verbose_name='Nomor Terakhir', help_text='Nomor terakhir yang sudah dialokasikan')
+    
+    class Meta:
+        verbose_name = 'Penghitung Nomor Urut'
+        verbose_name_plural = 'Penghitung Nomor Urut'
+    
+    def __str__(self):
+        return f"{self.name} = {self.value}"
@@ -0,0 +1,189 @@
+"""
+Layanan notifikasi member
+
+Semua pembuatan dan perubahan status Notification lewat modul ini agar
+NotificationCounter (jumlah belum dibaca per member) selalu ikut berubah di
+transaksi yang sama. Dashboard dan halaman notifikasi cukup membaca satu baris
+counter, bukan menghitung ulang is_read=False setiap kali dibuka.
+
+Fan-out ke banyak member (mis. pengumuman firmware untuk semua pemilik paket
+Professional) ditulis per potongan NOTIFICATION_FANOUT_CHUNK_SIZE member:
+satu bulk_create notifikasi dan satu UPDATE counter per potongan.
+
+Jika counter sempat tidak cocok (mis. notifikasi dihapus langsung dari
+Django admin), hitung ulang: python manage.py rebuild_notification_counters
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from .models import Member, Notification, NotificationCounter, RangBotDevice
+
+DEFAULT_FANOUT_CHUNK_SIZE = 1000
+
+
+def _fanout_chunk_size():
+    return getattr(settings, 'NOTIFICATION_FANOUT_CHUNK_SIZE', DEFAULT_FANOUT_CHUNK_SIZE)
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==================== COUNTER ====================
+
+def _add_unread(member_ids, amount):
+    """unread_count += amount untuk member_ids dengan satu UPDATE (amount boleh negatif)"""
+    if not member_ids or not amount:
+        return
+    if amount > 0:
+        # Member yang belum punya baris counter (mis. member baru) dibuatkan dengan nilai 0
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(member_id=member_id) for member_id in member_ids],
+            ignore_conflicts=True,
+        )
+        new_count = F('unread_count') + amount
+    else:
+        # Kolom UNSIGNED di MySQL: unread_count - n tidak boleh dihitung saat hasilnya negatif (error 1690)
+        decrement = -amount
+        new_count = Case(
+            When(unread_count__gte=decrement, then=F('unread_count') - decrement),
+            default=Value(0),
+        )
+    NotificationCounter.objects.filter(member_id__in=member_ids).update(unread_count=new_count)
+
+
+def unread_count(member):
+    """Jumlah notifikasi belum dibaca member dari tabel counter"""
+    count = NotificationCounter.objects.filter(member=member).values_list('unread_count', flat=True).first()
+    if count is None:
+        counter, _ = NotificationCounter.objects.get_or_create(
+            member=member,
+            defaults={'unread_count': member.notifications.filter(is_read=False).count()},
+        )
+        count = counter.unread_count
+    return count
+
+
+def rebuild_counters():
+    """Hitung ulang semua NotificationCounter dari tabel Notification"""
+    members = Member.objects.annotate(
+        unread=Count('notifications', filter=Q(notifications__is_read=False))
+    ).values_list('pk', 'unread')
+    with transaction.atomic():
+        NotificationCounter.objects.all().delete()
+        NotificationCounter.objects.bulk_create(
+            (NotificationCounter(member_id=pk, unread_count=unread) for pk, unread in members.iterator()),
+            batch_size=1000,
+        )
+    return NotificationCounter.objects.count()
+
+
+# ==================== DELIVERY ====================
+
+def deliver(notifications):
+    """
+    Simpan Notification (belum disimpan, boleh untuk member berbeda) dengan
+    satu bulk_create dan naikkan counter setiap member
+
+    Returns:
+        Jumlah notifikasi yang dibuat
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return 0
+
+    per_member = defaultdict(int)
+    for notification in notifications:
+        per_member[notification.member_id] += 1
+    # Satu UPDATE per besaran kenaikan; biasanya hanya satu (+1)
+    members_by_amount = defaultdict(list)
+    for member_id, amount in per_member.items():
+        members_by_amount[amount].append(member_id)
+
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications)
+        for amount, member_ids in members_by_amount.items():
+            _add_unread(member_ids, amount)
+    return len(notifications)
+
+
+def notify(member, notification_type, title, message):
+    """Kirim satu notifikasi ke satu member"""
+    return deliver([Notification(
+        member=member,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+    )])
+
+
+def notify_members(member_ids, notification_type, title, message):
+    """
+    Fan-out notifikasi yang sama ke banyak member
+
+    Setiap potongan ditulis di transaksinya sendiri, sehingga fan-out ke ribuan
+    member tidak menahan satu transaksi besar.
+
+    Args:
+        member_ids: iterable primary key Member (boleh queryset values_list)
+
+    Returns:
+        Jumlah notifikasi yang dibuat
+    """
+    total = 0
+    for chunk in _chunks(member_ids, _fanout_chunk_size()):
+        total += deliver(
+            Notification(member_id=member_id, notification_type=notification_type, title=title, message=message)
+            for member_id in chunk
+        )
+    return total
+
+
+def members_with_package(package_type):
+    """Primary key member aktif yang memiliki perangkat aktif dengan tipe paket tersebut"""
+    member_ids = RangBotDevice.objects.filter(
+        package_type=package_type, is_active=True, member__is_active=True,
+    ).values_list('member_id', flat=True).distinct()
+    return member_ids.order_by('member_id')
+
+
+# ==================== READ STATUS ====================
+
+def mark_read(member, notification_id):
+    """
+    Tandai satu notifikasi sebagai sudah dibaca
+
+    Returns:
+        True jika notifikasi ditemukan dan sebelumnya belum dibaca
+    """
+    with transaction.atomic():
+        updated = Notification.objects.filter(id=notification_id, member=member, is_read=False).update(is_read=True)
+        _add_unread([member.pk], -updated)
+    return bool(updated)
+
+
+def mark_all_read(member):
+    """
+    Tandai semua notifikasi member sebagai sudah dibaca dengan satu UPDATE
+
+    Counter dikurangi sebanyak baris yang berubah (bukan di-set 0), sehingga
+    notifikasi yang masuk bersamaan tetap terhitung.
+
+    Returns:
+        Jumlah notifikasi yang ditandai
+    """
+    with transaction.atomic():
+        updated = Notification.objects.filter(member=member, is_read=False).update(is_read=True)
+        _add_unread([member.pk], -updated)
+    return updated
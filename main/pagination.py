@@ -0,0 +1,152 @@
+"""
+Keyset (cursor) pagination untuk list view admin dan CS
+
+Berbeda dengan Paginator bawaan Django yang memakai OFFSET (semakin dalam
+halamannya, semakin lambat query-nya), keyset pagination melanjutkan dari
+baris terakhir yang sudah ditampilkan berdasarkan pasangan (created_at, id).
+Biaya halaman ke-500 sama dengan halaman pertama dan satu halaman tidak
+pernah memuat lebih dari per_page + 1 baris.
+
+Cursor dikirim ke browser sebagai token opaque (base64), sehingga template
+cukup memakai page.next_query / page.previous_query untuk link navigasi.
+"""
+
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+CURSOR_PARAM = 'cursor'
+DEFAULT_PER_PAGE = 20
+
+
+def encode_cursor(created_at, pk, direction):
+    """
+    Encode posisi (created_at, id) menjadi token opaque
+
+    Args:
+        created_at: datetime baris acuan
+        pk: primary key baris acuan
+        direction: 'next' atau 'prev'
+    """
+    payload = json.dumps([created_at.isoformat(), pk, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode token cursor menjadi tuple (created_at, pk, direction)
+    Mengembalikan None jika token kosong atau tidak valid (dianggap halaman pertama)
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at_raw, pk, direction = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        created_at = parse_datetime(created_at_raw)
+        if created_at is None or direction not in ('next', 'prev'):
+            return None
+        return created_at, int(pk), direction
+    except (ValueError, TypeError, UnicodeError):
+        return None
+
+
+class KeysetPage:
+    """
+    Satu halaman hasil keyset pagination
+    Bisa di-iterate di template seperti list biasa
+    """
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor, base_params, per_page):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.per_page = per_page
+        self._base_params = base_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _query_with_cursor(self, cursor):
+        params = self._base_params.copy()
+        params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        """Query string (tanpa '?') untuk halaman berikutnya, filter tetap dipertahankan"""
+        return self._query_with_cursor(self.next_cursor) if self.next_cursor else ''
+
+    @property
+    def previous_query(self):
+        """Query string (tanpa '?') untuk halaman sebelumnya, filter tetap dipertahankan"""
+        return self._query_with_cursor(self.previous_cursor) if self.previous_cursor else ''
+
+
+def paginate_keyset(queryset, request, per_page=DEFAULT_PER_PAGE, descending=True, transform=None):
+    """
+    Paginate queryset berdasarkan (created_at, id) menggunakan cursor dari request.GET
+
+    Args:
+        queryset: QuerySet dengan field created_at (ordering akan di-override)
+        request: HttpRequest, cursor dibaca dari parameter ?cursor=
+        per_page: jumlah maksimal baris per halaman
+        descending: True untuk urutan terbaru dulu, False untuk terlama dulu
+        transform: fungsi opsional untuk mengubah list objek (mis. menambah statistik)
+
+    Returns:
+        KeysetPage
+    """
+    cursor = decode_cursor(request.GET.get(CURSOR_PARAM, ''))
+    base_params = request.GET.copy()
+    base_params.pop(CURSOR_PARAM, None)
+
+    forward_order = ('-created_at', '-id') if descending else ('created_at', 'id')
+    backward_order = ('created_at', 'id') if descending else ('-created_at', '-id')
+
+    direction = cursor[2] if cursor else 'next'
+    if cursor:
+        created_at, pk = cursor[0], cursor[1]
+        # 'next' melanjutkan searah urutan tampil, 'prev' berjalan mundur
+        after = (direction == 'next') == descending
+        if after:
+            # Lebih lama dari cursor
+            boundary = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        else:
+            # Lebih baru dari cursor
+            boundary = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        queryset = queryset.filter(boundary)
+
+    ordering = forward_order if direction == 'next' else backward_order
+    rows = list(queryset.order_by(*ordering)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == 'prev':
+        rows.reverse()
+        has_previous = has_more
+        has_next = True
+    else:
+        has_next = has_more
+        has_previous = cursor is not None
+
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk, 'next') if rows and has_next else None
+    previous_cursor = encode_cursor(rows[0].created_at, rows[0].pk, 'prev') if rows and has_previous else None
+
+    object_list = transform(rows) if transform else rows
+    return KeysetPage(object_list, has_next, has_previous, next_cursor, previous_cursor, base_params, per_page)
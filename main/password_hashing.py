@@ -0,0 +1,120 @@
+"""
+Hashing password (PBKDF2) di thread pool khusus yang dibatasi
+
+View login dan registrasi async menunggu hashing lewat acheck_password /
+amake_password, sehingga event loop dan request lain tetap berjalan selama
+hashing antre. hashlib melepas GIL saat PBKDF2, jadi PASSWORD_HASH_WORKERS
+thread benar-benar berjalan paralel.
+
+Backpressure: jika pekerjaan yang sedang berjalan + antre sudah mencapai
+PASSWORD_HASH_MAX_PENDING, pekerjaan baru langsung ditolak dengan
+PasswordHashingBusy (view membalas 503) alih-alih menumpuk tanpa batas.
+Kedalaman antrean bisa dilihat admin di /admin/metrics/password-hashing/.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+BUSY_MESSAGE = 'Server sedang sibuk memproses login. Silakan coba lagi dalam beberapa detik.'
+
+
+class PasswordHashingBusy(Exception):
+    """Antrean hashing penuh"""
+
+
+def _workers():
+    return max(1, getattr(settings, 'PASSWORD_HASH_WORKERS', DEFAULT_WORKERS))
+
+
+def _max_pending():
+    return max(1, getattr(settings, 'PASSWORD_HASH_MAX_PENDING', DEFAULT_MAX_PENDING))
+
+
+class PasswordHashPool:
+    """Thread pool hashing dengan batas jumlah pekerjaan yang menunggu"""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix='password-hash')
+        return self._executor
+
+    def _run(self, func, args):
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def submit(self, func, *args):
+        """
+        Jalankan func(*args) di thread pool hashing
+
+        Raises:
+            PasswordHashingBusy: antrean penuh
+        """
+        with self._lock:
+            if self._pending >= _max_pending():
+                self._rejected += 1
+                logger.warning('Antrean hashing password penuh (%s), request ditolak', self._pending)
+                raise PasswordHashingBusy()
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), self._run, func, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self):
+        """Kedalaman antrean dan penghitung untuk monitoring"""
+        with self._lock:
+            return {
+                'workers': _workers(),
+                'max_pending': _max_pending(),
+                'running': self._running,
+                'queued': self._pending - self._running,
+                'rejected_total': self._rejected,
+                'completed_total': self._completed,
+            }
+
+
+_pool = PasswordHashPool()
+
+
+async def acheck_password(password, encoded):
+    """check_password di thread pool hashing; False untuk hash kosong tanpa masuk antrean"""
+    if not encoded:
+        return False
+    return await _pool.submit(check_password, password, encoded)
+
+
+async def amake_password(password):
+    """make_password di thread pool hashing"""
+    return await _pool.submit(make_password, password)
+
+
+def hashing_stats():
+    return _pool.stats()
@@ -0,0 +1,113 @@
+"""
+Provisioning perangkat RangBot saat purchase order diverifikasi
+
+Semua nomor seri order dialokasikan dengan satu UPDATE counter, lalu perangkat,
+ActivityLog 'serial_created', dan Notification ditulis per batch dengan
+bulk_create di dalam satu transaksi. Jumlah query tumbuh per batch
+(DEVICE_PROVISION_BATCH_SIZE unit), bukan per unit, sehingga order armada
+berisi ribuan unit tetap selesai dalam beberapa query saja.
+
+bulk_create tidak memicu signal post_save, jadi index pencarian member dan
+cache statistik dashboard diperbarui sekali setelah transaksi di-commit.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .admin_search import index_members
+from .dashboard_stats import invalidate_dashboard_stats
+from .models import ActivityLog, RangBotDevice
+from .notifications import notify
+from .utils import reserve_serial_numbers
+
+DEFAULT_BATCH_SIZE = 500
+
+# (tipe paket, prefix nama perangkat, field jumlah unit di PurchaseOrder)
+PACKAGES = (
+    ('basic', 'RangBot Basic', 'qty_basic'),
+    ('professional', 'RangBot Pro', 'qty_professional'),
+)
+
+
+def _batch_size():
+    return getattr(settings, 'DEVICE_PROVISION_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def build_devices(order, member, serial_numbers):
+    """Instance RangBotDevice (belum disimpan) untuk semua unit order, urut nomor seri"""
+    serial_numbers = iter(serial_numbers)
+    for package_type, name_prefix, quantity_field in PACKAGES:
+        for number in range(1, getattr(order, quantity_field) + 1):
+            yield RangBotDevice(
+                serial_number=next(serial_numbers),
+                member=member,
+                purchase_order=order,
+                device_name=f'{name_prefix} {number}',
+                package_type=package_type,
+                status='offline',
+                is_active=True,
+            )
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@transaction.atomic
+def provision_devices(order, member, admin):
+    """
+    Buat semua perangkat untuk order yang diverifikasi
+
+    Args:
+        order: PurchaseOrder (member_id sudah terisi)
+        member: Member pemilik perangkat
+        admin: Admin yang memverifikasi (untuk ActivityLog)
+
+    Returns:
+        Jumlah perangkat yang dibuat
+    """
+    total_units = order.get_total_units()
+    serial_numbers = reserve_serial_numbers(total_units)
+    batch_size = _batch_size()
+    now = timezone.now()
+
+    for devices in _batched(build_devices(order, member, serial_numbers), batch_size):
+        RangBotDevice.objects.bulk_create(devices)
+        # MySQL tidak mengembalikan primary key dari bulk_create; ambil lewat nomor seri (unique)
+        device_ids = dict(
+            RangBotDevice.objects.filter(serial_number__in=[device.serial_number for device in devices])
+            .values_list('serial_number', 'id')
+        )
+        ActivityLog.objects.bulk_create([
+            ActivityLog(
+                action_type='serial_created',
+                description=f'Nomor seri {device.serial_number} dibuat untuk Member {order.member_id}',
+                performed_by=admin,
+                related_order=order,
+                related_member=member,
+                related_device_id=device_ids[device.serial_number],
+                metadata={},
+                created_at=now,
+            )
+            for device in devices
+        ])
+
+    # Satu notifikasi per order, bukan per unit, agar order armada tidak membanjiri member
+    notify(
+        member,
+        notification_type='device_added',
+        title='Perangkat Ditambahkan',
+        message=f'{total_units} perangkat RangBot dari Order #{order.id} telah ditambahkan ke akun Anda.',
+    )
+
+    transaction.on_commit(lambda: index_members([member.pk]))
+    transaction.on_commit(lambda: invalidate_dashboard_stats('devices'))
+    return total_units
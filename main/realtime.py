@@ -0,0 +1,231 @@
+"""
+Pub/sub untuk push data realtime ke dashboard (Server-Sent Events)
+
+Telemetri baru dan deteksi baru dipublikasikan ke channel per perangkat.
+Setiap koneksi SSE berlangganan channel perangkatnya, sehingga satu event
+cukup di-fan-out ke semua dashboard yang terbuka (tanpa polling per klien).
+
+Broker dipilih lewat REALTIME_BROKER (dotted path). Default-nya
+InProcessBroker: hanya menjangkau koneksi di proses yang sama, cocok untuk
+satu worker ASGI. Untuk beberapa worker, buat broker dengan interface yang
+sama (publish / subscribe / unsubscribe) di atas Redis pub/sub atau sejenisnya.
+
+Deteksi ditulis oleh proses lain (python manage.py run_detection_worker), jadi
+tidak bisa dipublikasikan langsung ke broker di memori proses web. Setiap
+proses web menjalankan satu DetectionPoller yang membaca DetectionHistory baru
+untuk perangkat yang sedang punya koneksi SSE, satu query per
+SSE_DETECTION_POLL_INTERVAL detik berapa pun jumlah koneksinya, lalu
+mempublikasikannya ke broker.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import DetectionHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROKER = 'main.realtime.InProcessBroker'
+SUBSCRIBER_QUEUE_SIZE = 100
+DETECTION_POLL_BATCH = 500
+
+
+def device_channel(device_id):
+    return f'device:{device_id}'
+
+
+class InProcessBroker:
+    """
+    Broker pub/sub di memori proses
+
+    publish() aman dipanggil dari thread mana pun (view sync berjalan di thread
+    pool saat ASGI); event dikirim ke event loop pemilik setiap subscriber.
+    Queue subscriber dibatasi: klien yang lambat kehilangan event tertua,
+    bukan membuat memori server membengkak.
+    """
+
+    def __init__(self):
+        # channel -> {queue: event loop pemilik queue}
+        self._subscribers = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """Daftarkan subscriber baru dan kembalikan asyncio.Queue-nya; dipanggil dari dalam event loop"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[channel][queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, channel, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                return
+            subscribers.pop(queue, None)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, {}).items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, event)
+            except RuntimeError:
+                # Event loop subscriber sudah ditutup
+                self.unsubscribe(channel, queue)
+
+
+def _put_latest(queue, event):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'REALTIME_BROKER', DEFAULT_BROKER))()
+    return _broker
+
+
+def publish_device_event(device_id, event):
+    """
+    Publikasikan event untuk satu perangkat setelah transaksi yang sedang berjalan di-commit
+    Kegagalan broker tidak boleh menggagalkan request yang menulis data
+    """
+    def _publish():
+        try:
+            get_broker().publish(device_channel(device_id), event)
+        except Exception:
+            logger.exception('Gagal mempublikasikan event realtime')
+
+    transaction.on_commit(_publish)
+
+
+def telemetry_event(device_id, readings):
+    """Event ringkas untuk batch telemetri: pembacaan terbaru + jumlah pembacaan di batch"""
+    latest = max(readings, key=lambda reading: reading['recorded_at'])
+    return {
+        'type': 'telemetry',
+        'device_id': device_id,
+        'recorded_at': latest['recorded_at'].isoformat(),
+        'temperature': latest.get('temperature'),
+        'humidity': latest.get('humidity'),
+        'position': latest.get('position'),
+        'count': len(readings),
+    }
+
+
+def detection_event(detection):
+    return {
+        'type': 'detection',
+        'device_id': detection['device_id'],
+        'id': detection['id'],
+        'disease_detected': detection['disease_detected'],
+        'confidence': detection['confidence'],
+        'detection_type': detection['detection_type'],
+        'created_at': detection['created_at'].isoformat() if detection['created_at'] else None,
+    }
+
+
+def latest_detection_id():
+    return DetectionHistory.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def detections_after(last_id, device_ids, limit=DETECTION_POLL_BATCH):
+    """DetectionHistory dengan id > last_id untuk device_ids (range scan primary key)"""
+    return list(
+        DetectionHistory.objects.filter(id__gt=last_id, device_id__in=device_ids)
+        .order_by('id')
+        .values('id', 'device_id', 'disease_detected', 'confidence', 'detection_type', 'created_at')[:limit]
+    )
+
+
+class DetectionPoller:
+    """
+    Satu task polling per event loop untuk deteksi baru dari proses worker
+
+    Koneksi SSE memanggil watch()/unwatch() untuk perangkatnya; task berjalan
+    selama masih ada perangkat yang ditonton dan berhenti sendiri setelahnya.
+    Posisi terakhir disimpan sebagai id DetectionHistory dan dibaca ulang setiap
+    kali task dimulai, sehingga deteksi lama tidak dikirim ulang. Deteksi
+    muncul paling lambat satu interval setelah transaksi worker di-commit.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self._watched = defaultdict(int)
+        self._task = None
+        self._last_id = None
+
+    def watch(self, device_id):
+        """Mulai menonton perangkat; dipanggil dari dalam event loop"""
+        self._watched[device_id] += 1
+        if self._interval() <= 0:
+            # Polling dimatikan, mis. broker bersama yang menerima event deteksi langsung dari worker
+            return
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._last_id = None
+            self._task = loop.create_task(self._run())
+
+    def unwatch(self, device_id):
+        self._watched[device_id] -= 1
+        if self._watched[device_id] <= 0:
+            del self._watched[device_id]
+
+    def _interval(self):
+        if self.interval is not None:
+            return self.interval
+        return getattr(settings, 'SSE_DETECTION_POLL_INTERVAL', 3.0)
+
+    async def poll_once(self):
+        """Publikasikan deteksi baru untuk perangkat yang ditonton; mengembalikan jumlah event"""
+        if self._last_id is None:
+            self._last_id = await sync_to_async(latest_detection_id)()
+            return 0
+        if not self._watched:
+            return 0
+        detections = await sync_to_async(detections_after)(self._last_id, list(self._watched))
+        broker = get_broker()
+        for detection in detections:
+            broker.publish(device_channel(detection['device_id']), detection_event(detection))
+        if detections:
+            self._last_id = detections[-1]['id']
+        return len(detections)
+
+    async def _run(self):
+        try:
+            await self.poll_once()
+            while self._watched:
+                await asyncio.sleep(self._interval())
+                try:
+                    await self.poll_once()
+                except Exception:
+                    logger.exception('Gagal membaca deteksi baru untuk realtime')
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+
+detection_poller = DetectionPoller()
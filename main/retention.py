@@ -0,0 +1,247 @@
+"""
+Retensi dan arsip untuk ActivityLog
+
+- Log yang lebih lama dari batas retensi diarsipkan ke file JSONL terkompresi (gzip)
+  lalu dihapus dengan DELETE mentah per chunk (tanpa Collector Django yang memuat
+  semua baris ke memori).
+- Di MySQL tabel main_activitylog dipartisi per bulan berdasarkan created_at
+  (lihat migrasi 0015). Partisi yang seluruh isinya sudah diarsipkan cukup di-DROP,
+  dan partisi bulan-bulan berikutnya disiapkan oleh ensure_future_partitions().
+"""
+
+import gzip
+import json
+import os
+from datetime import date, datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_PARTITION_NAME = 'pmax'
+
+ARCHIVE_FIELDS = (
+    'id', 'action_type', 'description', 'performed_by_id', 'related_order_id',
+    'related_member_id', 'related_device_id', 'metadata', 'created_at',
+)
+
+
+def _table():
+    return connection.ops.quote_name(ActivityLog._meta.db_table)
+
+
+# ==================== ARCHIVE & DELETE ====================
+
+def archive_activity_logs(cutoff, archive_dir, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Tulis semua ActivityLog dengan created_at < cutoff ke file .jsonl.gz
+
+    File ditulis ke nama sementara lalu di-rename setelah lengkap, sehingga
+    file arsip yang ada selalu utuh.
+
+    Returns:
+        (path file arsip atau None jika tidak ada data, jumlah baris, id terbesar yang diarsipkan)
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"activity_log_before_{cutoff.strftime('%Y%m%d')}_{stamp}.jsonl.gz"
+    final_path = os.path.join(archive_dir, filename)
+    temp_path = final_path + '.part'
+
+    count = 0
+    last_id = 0
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+        while True:
+            rows = list(
+                ActivityLog.objects.filter(created_at__lt=cutoff, id__gt=last_id)
+                .order_by('id')
+                .values(*ARCHIVE_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            for row in rows:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+                archive.write('\n')
+            count += len(rows)
+            last_id = rows[-1]['id']
+
+    if count == 0:
+        os.remove(temp_path)
+        return None, 0, None
+
+    os.replace(temp_path, final_path)
+    return final_path, count, last_id
+
+
+def delete_activity_logs_chunked(cutoff=None, max_id=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Hapus ActivityLog dengan DELETE mentah per chunk
+
+    Args:
+        cutoff: hanya hapus log dengan created_at < cutoff (None = semua log)
+        max_id: hanya hapus log dengan id <= max_id (batas baris yang sudah diarsipkan)
+        chunk_size: jumlah baris per statement DELETE
+
+    Returns:
+        Jumlah baris yang dihapus
+    """
+    queryset = ActivityLog.objects.all()
+    if cutoff is not None:
+        queryset = queryset.filter(created_at__lt=cutoff)
+    if max_id is not None:
+        queryset = queryset.filter(id__lte=max_id)
+
+    deleted = 0
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        placeholders = ', '.join(['%s'] * len(ids))
+        # Setiap chunk di-commit sendiri agar lock dan undo log tetap kecil
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {_table()} WHERE id IN ({placeholders})', ids)
+                deleted += cursor.rowcount
+        last_id = ids[-1]
+    return deleted
+
+
+# ==================== MYSQL MONTHLY PARTITIONS ====================
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """Nama partisi untuk bulan tertentu, contoh: p202511"""
+    return f'p{month.year}{month.month:02d}'
+
+
+def partition_clause(month):
+    """Definisi partisi yang menampung semua log di bulan tersebut"""
+    upper = _add_months(month, 1)
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{upper.isoformat()}'))"
+
+
+def supports_partitioning():
+    return connection.vendor == 'mysql'
+
+
+def list_partitions():
+    """
+    Daftar partisi main_activitylog di MySQL sebagai list (nama, bulan atau None untuk pmax)
+    Mengembalikan list kosong jika tabel tidak dipartisi / bukan MySQL
+    """
+    if not supports_partitioning():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """,
+            [ActivityLog._meta.db_table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        if name == MAX_PARTITION_NAME:
+            partitions.append((name, None))
+            continue
+        try:
+            partitions.append((name, date(int(name[1:5]), int(name[5:7]), 1)))
+        except ValueError:
+            continue
+    return partitions
+
+
+def ensure_future_partitions(months_ahead=3, today=None):
+    """
+    Pastikan partisi tersedia sampai months_ahead bulan ke depan
+    Partisi baru dibuat dengan memecah pmax (REORGANIZE PARTITION)
+
+    Returns:
+        List nama partisi yang dibuat
+    """
+    partitions = list_partitions()
+    if not partitions:
+        return []
+
+    months = [month for _, month in partitions if month is not None]
+    today = today or timezone.now().date()
+    target = _add_months(_month_start(today), months_ahead)
+    month = _add_months(max(months), 1) if months else _month_start(today)
+
+    new_months = []
+    while month <= target:
+        new_months.append(month)
+        month = _add_months(month, 1)
+    if not new_months:
+        return []
+
+    clauses = ', '.join([partition_clause(m) for m in new_months] + [f'PARTITION {MAX_PARTITION_NAME} VALUES LESS THAN MAXVALUE'])
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {_table()} REORGANIZE PARTITION {MAX_PARTITION_NAME} INTO ({clauses})')
+    return [partition_name(m) for m in new_months]
+
+
+def drop_partitions_before(cutoff):
+    """
+    DROP partisi yang seluruh rentangnya lebih tua dari cutoff
+    Jauh lebih cepat daripada DELETE karena hanya membuang file partisi.
+    Panggil hanya setelah data di rentang tersebut diarsipkan.
+
+    Returns:
+        List nama partisi yang di-drop
+    """
+    cutoff_date = cutoff.date() if isinstance(cutoff, datetime) else cutoff
+    droppable = [
+        name for name, month in list_partitions()
+        if month is not None and _add_months(month, 1) <= cutoff_date
+    ]
+    if not droppable:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {_table()} DROP PARTITION {', '.join(droppable)}")
+    return droppable
+
+
+def prune_activity_logs(cutoff, archive_dir=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Arsipkan lalu hapus semua log dengan created_at < cutoff
+
+    Args:
+        cutoff: datetime batas retensi
+        archive_dir: folder arsip; None berarti log dihapus tanpa diarsipkan
+
+    Returns:
+        dict ringkasan (archive_path, archived, dropped_partitions, deleted)
+    """
+    if isinstance(cutoff, date) and not isinstance(cutoff, datetime):
+        cutoff = timezone.make_aware(datetime.combine(cutoff, time.min))
+
+    archive_path, archived, max_id = None, 0, None
+    if archive_dir:
+        archive_path, archived, max_id = archive_activity_logs(cutoff, archive_dir, chunk_size)
+        if archived == 0:
+            return {'archive_path': None, 'archived': 0, 'dropped_partitions': [], 'deleted': 0}
+
+    dropped = drop_partitions_before(cutoff)
+    deleted = delete_activity_logs_chunked(cutoff=cutoff, max_id=max_id, chunk_size=chunk_size)
+    return {
+        'archive_path': archive_path,
+        'archived': archived,
+        'dropped_partitions': dropped,
+        'deleted': deleted,
+    }
@@ -0,0 +1,266 @@
+"""
+Rollup data sensor per menit, jam, dan hari
+
+Grafik riwayat tidak membaca SensorReading mentah. Setiap batch telemetri
+langsung digabung ke tabel rollup (SENSOR_ROLLUP_ON_INGEST), dan command
+`python manage.py compact_sensor_rollups` bisa membangun ulang rollup dari
+data mentah untuk rentang waktu tertentu (mis. setelah import data lama).
+
+Endpoint grafik memilih resolusi paling halus yang jumlah bucket-nya masih
+muat di max_points; jika rentang terlalu panjang bahkan untuk resolusi harian,
+bucket harian digabung lagi sehingga jumlah titik tetap terbatas.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import SensorReading, SensorRollupDay, SensorRollupHour, SensorRollupMinute
+
+DEFAULT_MAX_POINTS = 300
+MAX_POINTS_LIMIT = 1000
+METRICS = ('temperature', 'humidity')
+
+# Nama resolusi -> (model, panjang bucket), urut dari paling halus
+RESOLUTIONS = OrderedDict([
+    ('minute', (SensorRollupMinute, timedelta(minutes=1))),
+    ('hour', (SensorRollupHour, timedelta(hours=1))),
+    ('day', (SensorRollupDay, timedelta(days=1))),
+])
+
+
+def rollup_on_ingest():
+    return getattr(settings, 'SENSOR_ROLLUP_ON_INGEST', True)
+
+
+def bucket_start(value, resolution):
+    """Awal bucket untuk sebuah timestamp (mengikuti TIME_ZONE untuk batas hari)"""
+    local = timezone.localtime(value)
+    if resolution == 'minute':
+        local = local.replace(second=0, microsecond=0)
+    elif resolution == 'hour':
+        local = local.replace(minute=0, second=0, microsecond=0)
+    else:
+        local = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return local
+
+
+class _Bucket:
+    """Akumulator min/max/sum/count untuk satu bucket"""
+
+    __slots__ = ('reading_count', 'temperature_count', 'temperature_sum', 'temperature_min', 'temperature_max',
+                 'humidity_count', 'humidity_sum', 'humidity_min', 'humidity_max')
+
+    def __init__(self):
+        self.reading_count = 0
+        for metric in METRICS:
+            setattr(self, f'{metric}_count', 0)
+            setattr(self, f'{metric}_sum', 0.0)
+            setattr(self, f'{metric}_min', None)
+            setattr(self, f'{metric}_max', None)
+
+    def add(self, reading):
+        self.reading_count += 1
+        for metric in METRICS:
+            value = reading.get(metric)
+            if value is None:
+                continue
+            setattr(self, f'{metric}_count', getattr(self, f'{metric}_count') + 1)
+            setattr(self, f'{metric}_sum', getattr(self, f'{metric}_sum') + value)
+            current_min = getattr(self, f'{metric}_min')
+            current_max = getattr(self, f'{metric}_max')
+            setattr(self, f'{metric}_min', value if current_min is None else min(current_min, value))
+            setattr(self, f'{metric}_max', value if current_max is None else max(current_max, value))
+
+    def merge_into(self, row):
+        """Gabungkan akumulator ke baris rollup (instance model)"""
+        row.reading_count += self.reading_count
+        for metric in METRICS:
+            count = getattr(self, f'{metric}_count')
+            if not count:
+                continue
+            setattr(row, f'{metric}_count', getattr(row, f'{metric}_count') + count)
+            setattr(row, f'{metric}_sum', getattr(row, f'{metric}_sum') + getattr(self, f'{metric}_sum'))
+            for suffix, pick in (('min', min), ('max', max)):
+                existing = getattr(row, f'{metric}_{suffix}')
+                value = getattr(self, f'{metric}_{suffix}')
+                setattr(row, f'{metric}_{suffix}', value if existing is None else pick(existing, value))
+
+
+def _aggregate(readings, resolution):
+    buckets = {}
+    for reading in readings:
+        key = bucket_start(reading['recorded_at'], resolution)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = _Bucket()
+        bucket.add(reading)
+    return buckets
+
+
+UPDATE_FIELDS = [
+    'reading_count',
+    'temperature_count', 'temperature_sum', 'temperature_min', 'temperature_max',
+    'humidity_count', 'humidity_sum', 'humidity_min', 'humidity_max',
+]
+
+
+def apply_rollups(device_id, readings):
+    """
+    Gabungkan batch pembacaan (list dict) ke rollup menit/jam/hari
+
+    Harus dipanggil di dalam transaksi yang sudah mengunci baris perangkat
+    (ingest_readings meng-UPDATE RangBotDevice lebih dulu), sehingga batch
+    untuk perangkat yang sama tidak menggabung bucket secara bersamaan.
+    """
+    for resolution, (model, _) in RESOLUTIONS.items():
+        buckets = _aggregate(readings, resolution)
+        existing = {
+            row.bucket_start: row
+            for row in model.objects.filter(device_id=device_id, bucket_start__in=list(buckets))
+        }
+        to_create, to_update = [], []
+        for start, bucket in buckets.items():
+            row = existing.get(start)
+            if row is None:
+                row = model(device_id=device_id, bucket_start=start)
+                to_create.append(row)
+            else:
+                to_update.append(row)
+            bucket.merge_into(row)
+        if to_create:
+            model.objects.bulk_create(to_create)
+        if to_update:
+            model.objects.bulk_update(to_update, UPDATE_FIELDS)
+
+
+def rebuild_rollups(device_id, start, end, chunk_size=5000):
+    """
+    Bangun ulang rollup satu perangkat untuk rentang [start, end) dari data mentah
+    start/end dibulatkan ke awal hari agar bucket harian tidak terpotong
+
+    Data mentah yang lebih tua dari --prune-raw-days sudah dihapus, jadi rollup
+    untuk masa itu adalah satu-satunya salinan. Bucket sebelum pembacaan mentah
+    tertua perangkat tidak disentuh, dan bucket yang memuat pembacaan tertua
+    itu hanya diganti jika rollup lamanya tidak berisi lebih banyak pembacaan
+    (artinya sebagian datanya belum terhapus).
+
+    Returns:
+        Jumlah pembacaan mentah yang diproses
+    """
+    start = bucket_start(start, 'day')
+    end = bucket_start(end, 'day') + timedelta(days=1)
+    # Memakai index (device, -recorded_at)
+    oldest_raw = (
+        SensorReading.objects.filter(device_id=device_id)
+        .order_by('recorded_at').values_list('recorded_at', flat=True).first()
+    )
+    if oldest_raw is None or oldest_raw >= end:
+        return 0
+    rebuild_from = {resolution: max(start, bucket_start(oldest_raw, resolution)) for resolution in RESOLUTIONS}
+
+    readings = (
+        SensorReading.objects.filter(device_id=device_id, recorded_at__gte=rebuild_from['minute'], recorded_at__lt=end)
+        .order_by()
+        .values('recorded_at', *METRICS)
+        .iterator(chunk_size=chunk_size)
+    )
+    all_buckets = {resolution: {} for resolution in RESOLUTIONS}
+    processed = 0
+    for reading in readings:
+        processed += 1
+        for resolution, buckets in all_buckets.items():
+            key = bucket_start(reading['recorded_at'], resolution)
+            if key < rebuild_from[resolution]:
+                continue
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket()
+            bucket.add(reading)
+
+    with transaction.atomic():
+        for resolution, (model, _) in RESOLUTIONS.items():
+            buckets = all_buckets[resolution]
+            boundary = rebuild_from[resolution]
+            stale = model.objects.filter(device_id=device_id, bucket_start__gte=boundary, bucket_start__lt=end)
+            stored = stale.filter(bucket_start=boundary).values_list('reading_count', flat=True).first()
+            rebuilt = buckets[boundary].reading_count if boundary in buckets else 0
+            if stored is not None and stored > rebuilt:
+                # Sebagian data mentah bucket ini sudah dihapus; rollup lama lebih lengkap
+                stale = stale.exclude(bucket_start=boundary)
+                buckets.pop(boundary, None)
+            stale.delete()
+            rows = []
+            for key, bucket in buckets.items():
+                row = model(device_id=device_id, bucket_start=key)
+                bucket.merge_into(row)
+                rows.append(row)
+            model.objects.bulk_create(rows, batch_size=1000)
+    return processed
+
+
+# ==================== CHART QUERY ====================
+
+def choose_resolution(start, end, max_points):
+    """Resolusi paling halus yang jumlah bucket-nya <= max_points (fallback: day)"""
+    window = end - start
+    for resolution, (_, step) in RESOLUTIONS.items():
+        if window / step <= max_points:
+            return resolution
+    return 'day'
+
+
+def _point(start, row_values):
+    point = {'t': start.isoformat(), 'count': row_values['reading_count']}
+    for metric in METRICS:
+        count = row_values[f'{metric}_count']
+        point[metric] = {
+            'avg': round(row_values[f'{metric}_sum'] / count, 2) if count else None,
+            'min': row_values[f'{metric}_min'],
+            'max': row_values[f'{metric}_max'],
+        }
+    return point
+
+
+def get_sensor_history(device_id, start, end, max_points=DEFAULT_MAX_POINTS):
+    """
+    Data grafik riwayat sensor untuk rentang [start, end)
+
+    Returns:
+        dict {'resolution', 'start', 'end', 'points': [...]} dengan len(points) <= max_points
+    """
+    max_points = max(1, min(max_points, MAX_POINTS_LIMIT))
+    resolution = choose_resolution(start, end, max_points)
+    model = RESOLUTIONS[resolution][0]
+
+    rows = list(
+        model.objects.filter(device_id=device_id, bucket_start__gte=start, bucket_start__lt=end)
+        .order_by('bucket_start')
+        .values('bucket_start', *UPDATE_FIELDS)
+    )
+
+    # Rentang lebih panjang dari max_points hari: gabungkan beberapa bucket harian per titik
+    group_size = -(-len(rows) // max_points) if len(rows) > max_points else 1
+    points = []
+    for index in range(0, len(rows), group_size):
+        group = rows[index:index + group_size]
+        merged = dict(group[0])
+        for row in group[1:]:
+            merged['reading_count'] += row['reading_count']
+            for metric in METRICS:
+                merged[f'{metric}_count'] += row[f'{metric}_count']
+                merged[f'{metric}_sum'] += row[f'{metric}_sum']
+                for suffix, pick in (('min', min), ('max', max)):
+                    values = [v for v in (merged[f'{metric}_{suffix}'], row[f'{metric}_{suffix}']) if v is not None]
+                    merged[f'{metric}_{suffix}'] = pick(values) if values else None
+        points.append(_point(timezone.localtime(group[0]['bucket_start']), merged))
+
+    return {
+        'resolution': resolution,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'points': points,
+    }
@@ -0,0 +1,37 @@
+"""
+Cache bersama antar proses web
+
+Cache identitas login dan cache konten publik diinvalidasi lewat signal di
+proses yang menyimpan perubahan. Invalidasi itu hanya terlihat oleh worker lain
+(gunicorn --workers N) jika semua worker membaca cache yang sama, mis. Redis
+(REDIS_URL). LocMemCache (default tanpa REDIS_URL) dan DummyCache hanya hidup
+di satu proses, sehingga lapisan cache lintas request tersebut dilewati.
+
+Batas login gagal per IP (main/credentials.py) juga disimpan di cache default;
+tanpa cache bersama setiap worker menghitung sendiri. `manage.py check --deploy`
+memberi peringatan jika cache default hanya hidup di satu proses.
+"""
+
+from django.core.cache import caches
+from django.core.checks import Tags, Warning, register
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared(alias='default'):
+    """True jika cache `alias` dibaca bersama oleh semua proses (bukan cache memori per proses)"""
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if is_shared():
+        return []
+    return [Warning(
+        'Cache default hanya hidup di satu proses: cache identitas dan konten dilewati, '
+        'dan batas login gagal dihitung per worker.',
+        hint='Set REDIS_URL agar semua worker memakai cache yang sama.',
+        id='main.W001',
+    )]
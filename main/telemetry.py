@@ -0,0 +1,179 @@
+"""
+Ingest data telemetri perangkat RangBot
+
+Perangkat mengirim batch pembacaan sensor (JSON atau NDJSON) ke
+/api/devices/<serial_number>/telemetry/ dengan header
+Authorization: Bearer <api_key>. Satu request = satu transaksi:
+bulk_create untuk semua pembacaan + satu UPDATE untuk status perangkat.
+"""
+
+import hashlib
+import hmac
+import json
+import math
+import secrets
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import RangBotDevice, SensorReading
+from .sensor_rollups import apply_rollups, rollup_on_ingest
+from .realtime import publish_device_event, telemetry_event
+
+DEFAULT_MAX_BATCH = 5000
+BULK_CREATE_BATCH_SIZE = 1000
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+READING_FIELDS = ('temperature', 'humidity', 'position')
+
+
+class TelemetryError(ValueError):
+    """Payload telemetri tidak valid"""
+
+
+def _max_batch():
+    return getattr(settings, 'TELEMETRY_MAX_BATCH', DEFAULT_MAX_BATCH)
+
+
+# ==================== API KEY ====================
+
+def hash_api_key(api_key):
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+def generate_device_api_key(device):
+    """
+    Buat API key baru untuk perangkat (key lama otomatis tidak berlaku)
+    Hanya hash yang disimpan, key asli dikembalikan sekali ke pemanggil
+    """
+    api_key = secrets.token_urlsafe(32)
+    device.api_key_hash = hash_api_key(api_key)
+    device.save(update_fields=['api_key_hash'])
+    return api_key
+
+
+def get_request_api_key(request):
+    """Ambil API key dari header Authorization: Bearer <key> atau X-Device-Key"""
+    auth = request.META.get('HTTP_AUTHORIZATION', '')
+    if auth.lower().startswith('bearer '):
+        return auth[7:].strip()
+    return request.META.get('HTTP_X_DEVICE_KEY', '').strip()
+
+
+def check_api_key(device, api_key):
+    if not api_key or not device.api_key_hash:
+        return False
+    return hmac.compare_digest(device.api_key_hash, hash_api_key(api_key))
+
+
+# ==================== PARSING ====================
+
+def _parse_timestamp(value, now):
+    if value in (None, ''):
+        return now
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Epoch detik, atau milidetik jika nilainya terlalu besar
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is not None:
+            # Timestamp tanpa zona waktu dari perangkat dianggap UTC
+            return parsed if timezone.is_aware(parsed) else parsed.replace(tzinfo=dt_timezone.utc)
+    raise TelemetryError(f'Timestamp tidak valid: {value!r}')
+
+
+def _parse_number(value, field):
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TelemetryError(f'Nilai {field} harus berupa angka')
+    # json.loads menerima NaN/Infinity, yang tidak bisa disimpan atau dirata-rata di rollup
+    if not math.isfinite(value):
+        raise TelemetryError(f'Nilai {field} harus berupa angka terhingga')
+    return float(value)
+
+
+def parse_readings(body, content_type):
+    """
+    Ubah body request menjadi list dict pembacaan yang sudah divalidasi
+
+    Format yang diterima:
+    - JSON: satu objek, list objek, atau {"readings": [...]}
+    - NDJSON: satu objek JSON per baris
+    Setiap objek: {"ts": ISO8601/epoch, "temperature": .., "humidity": .., "position": ..}
+    """
+    try:
+        text = body.decode('utf-8')
+    except UnicodeDecodeError:
+        raise TelemetryError('Body harus UTF-8')
+
+    try:
+        if content_type in NDJSON_CONTENT_TYPES:
+            items = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            payload = json.loads(text)
+            if isinstance(payload, dict):
+                items = payload.get('readings', [payload])
+            else:
+                items = payload
+    except json.JSONDecodeError as e:
+        raise TelemetryError(f'JSON tidak valid: {e.msg} (baris {e.lineno})')
+
+    if not isinstance(items, list) or not items:
+        raise TelemetryError('Tidak ada data pembacaan')
+    if len(items) > _max_batch():
+        raise TelemetryError(f'Maksimal {_max_batch()} pembacaan per request')
+
+    now = timezone.now()
+    readings = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise TelemetryError(f'Pembacaan #{index} harus berupa objek JSON')
+        try:
+            reading = {
+                'recorded_at': _parse_timestamp(item.get('ts', item.get('timestamp')), now),
+            }
+            for field in READING_FIELDS:
+                reading[field] = _parse_number(item.get(field), field)
+        except (TelemetryError, OverflowError, OSError, ValueError) as e:
+            raise TelemetryError(f'Pembacaan #{index}: {e}')
+        if all(reading[field] is None for field in READING_FIELDS):
+            raise TelemetryError(f'Pembacaan #{index} tidak berisi data sensor')
+        readings.append(reading)
+    return readings
+
+
+# ==================== INGEST ====================
+
+def ingest_readings(device, readings):
+    """
+    Simpan batch pembacaan untuk satu perangkat
+
+    Semua baris ditulis dengan bulk_create dan status perangkat diperbarui
+    dengan satu UPDATE (last_data_update tidak pernah mundur). Rollup
+    menit/jam/hari ikut diperbarui di transaksi yang sama.
+
+    Returns:
+        List SensorReading yang disimpan
+    """
+    objects = [SensorReading(device_id=device.pk, **reading) for reading in readings]
+    latest = max(reading['recorded_at'] for reading in readings)
+
+    with transaction.atomic():
+        # UPDATE perangkat lebih dulu: baris perangkat terkunci sampai commit,
+        # sehingga batch untuk perangkat yang sama diproses berurutan (aman untuk rollup)
+        RangBotDevice.objects.filter(pk=device.pk).update(
+            status='active',
+            last_data_update=Greatest(Coalesce('last_data_update', Value(latest)), Value(latest)),
+        )
+        SensorReading.objects.bulk_create(objects, batch_size=BULK_CREATE_BATCH_SIZE)
+        if rollup_on_ingest():
+            apply_rollups(device.pk, readings)
+        # Push ke dashboard yang sedang terbuka (dikirim setelah commit)
+        publish_device_event(device.pk, telemetry_event(device.pk, readings))
+    return objects
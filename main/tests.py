@@ -1,4 +1,849 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import threading
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
+from . import activity_log, view_counter
+from .activity_log import _write_entries, log_activity, pending_activity_logs
+from .admin_search import apply_search
+from .contact_messages import create_message, get_message_counts, set_status
+from .cs_views import get_cs, get_cs_base_context
+from .forum_search import _IndexPost
+from .image_store import generate_derivatives, store_image
+from .models import (
+    ActivityLog, Admin, ContactMessage, ContactMessageCounter, CustomerService, DetectionHistory, FAQ, ForumPost,
+    ForumSearchTerm, ForumUser, Member, NotificationCounter, PurchaseOrder, RangBotDevice, SensorReading,
+    SensorRollupDay, SequenceCounter,
+)
+from .notifications import mark_all_read, notify
+from .password_hashing import PasswordHashingBusy, PasswordHashPool
+from .provisioning import provision_devices
+from .realtime import DetectionPoller, device_channel, get_broker
+from .sensor_rollups import bucket_start, rebuild_rollups
+from .telemetry import generate_device_api_key
+from .utils import generate_member_id, reserve_sequence, reserve_serial_numbers
+from .view_counter import CacheViewCounter
+
+
+def create_member_device(member_id='MBR-2026-0100', serial_number='RBT-SN-01-90001'):
+    member = Member.objects.create(
+        member_id=member_id, username=member_id.lower(), full_name='Member Uji',
+        email=f'{member_id.lower()}@example.com', is_registered=True,
+    )
+    device = RangBotDevice.objects.create(serial_number=serial_number, member=member)
+    return member, device
+
+
+def login_cs(client, cs):
+    session = client.session
+    session['cs_id'] = cs.id
+    session.save()
+
+
+def file_cache_settings(test):
+    """override_settings CACHES dengan FileBasedCache: cache bersama antar proses seperti Redis"""
+    location = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, location, ignore_errors=True)
+    return override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+    }})
+
+
+def login_member(client, member):
+    session = client.session
+    session['member_id'] = member.member_id
+    session.save()
+
+
+def create_forum_post(title='Panen stroberi', username='petani'):
+    author = ForumUser.objects.create(name=username, username=username, email=f'{username}@example.com')
+    return ForumPost.objects.create(title=title, content='Daun menguning di blok A', author=author)
+
+
+class ActivityLogBufferTests(TestCase):
+    """Penulisan batch ActivityLog dari buffer"""
+
+    def test_entries_for_deleted_member_are_written_without_relation(self):
+        member = Member.objects.create(member_id='MBR-2026-0001', full_name='Budi', email='budi@example.com')
+        entry = {
+            'action_type': 'member_updated',
+            'description': 'Member dihapus sebelum buffer ditulis',
+            'related_member_id': member.pk,
+            'metadata': {},
+            'created_at': timezone.now(),
+        }
+        member.delete()
+
+        self.assertEqual(_write_entries([entry]), 1)
+        log = ActivityLog.objects.get()
+        self.assertIsNone(log.related_member_id)
+
+    def test_entries_for_existing_member_keep_relation(self):
+        member = Member.objects.create(member_id='MBR-2026-0002', full_name='Sari', email='sari@example.com')
+        _write_entries([{
+            'action_type': 'member_updated',
+            'description': 'Member masih ada',
+            'related_member_id': member.pk,
+            'metadata': {},
+            'created_at': timezone.now(),
+        }])
+        self.assertEqual(ActivityLog.objects.get().related_member_id, member.pk)
+
+
+@override_settings(FORUM_VIEW_COUNTER_BACKEND='cache', FORUM_VIEW_FLUSH_IN_PROCESS=False)
+class ActivityLogModeTests(TestCase):
+    """log_activity sinkron saat testing dan buffer dalam mode async"""
+
+    def setUp(self):
+        # Thread flusher berjalan dengan koneksi sendiri; flush di test ini dipicu langsung
+        patcher = mock.patch.object(activity_log._buffer, '_ensure_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(activity_log.flush_activity_logs)
+
+    def log(self, description):
+        return log_activity(action_type='member_updated', description=description)
+
+    def test_tests_write_synchronously_by_default(self):
+        log = self.log('Langsung tertulis')
+        self.assertEqual(ActivityLog.objects.get().pk, log.pk)
+        self.assertEqual(pending_activity_logs(), 0)
+
+    @override_settings(ACTIVITY_LOG_ASYNC=True, ACTIVITY_LOG_BUFFER_SIZE=3)
+    def test_buffer_is_flushed_when_full(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(self.log('Satu'))
+            self.log('Dua')
+        self.assertEqual(pending_activity_logs(), 2)
+        self.assertFalse(ActivityLog.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.log('Tiga')
+        self.assertEqual(pending_activity_logs(), 0)
+        self.assertEqual(ActivityLog.objects.count(), 3)
+
+    @override_settings(ACTIVITY_LOG_ASYNC=True, ACTIVITY_LOG_BUFFER_SIZE=50)
+    def test_buffer_is_flushed_at_request_end(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.log('Menunggu akhir request')
+        self.assertEqual(pending_activity_logs(), 1)
+
+        self.client.get(reverse('main:landing'))
+        self.assertEqual(pending_activity_logs(), 0)
+        self.assertEqual(ActivityLog.objects.get().description, 'Menunggu akhir request')
+
+    @override_settings(ACTIVITY_LOG_ASYNC=True)
+    def test_rolled_back_entries_are_not_buffered(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.log('Batal')
+                    raise RuntimeError('rollback')
+        self.assertEqual(pending_activity_logs(), 0)
+
+
+class CacheViewCounterTests(TestCase):
+    """Buffer view forum di cache yang dibagi beberapa proses"""
+
+    def setUp(self):
+        cache.clear()
+        self.post = create_forum_post()
+
+    def views(self):
+        return ForumPost.objects.values_list('views', flat=True).get(pk=self.post.pk)
+
+    def test_views_from_several_processes_are_applied_once(self):
+        first, second = CacheViewCounter(), CacheViewCounter()
+        first.increment(self.post.pk)
+        second.increment(self.post.pk)
+        first.increment(self.post.pk)
+
+        self.assertEqual(first.flush(), 3)
+        self.assertEqual(second.flush(), 0)
+        self.assertEqual(self.views(), 3)
+
+    def test_flush_is_skipped_while_another_process_holds_the_lock(self):
+        counter = CacheViewCounter()
+        counter.increment(self.post.pk)
+        cache.add(CacheViewCounter.LOCK_KEY, 'proses-lain')
+
+        self.assertEqual(counter.flush(), 0)
+        self.assertEqual(self.views(), 0)
+
+        cache.delete(CacheViewCounter.LOCK_KEY)
+        self.assertEqual(counter.flush(), 1)
+        self.assertEqual(self.views(), 1)
+
+    def test_flush_reads_only_posts_with_views(self):
+        create_forum_post(title='Tanpa view', username='lain')
+        counter = CacheViewCounter()
+        counter.increment(self.post.pk)
+
+        # Hanya UPDATE views; tidak ada SELECT semua id ForumPost
+        with self.assertNumQueries(1):
+            counter.flush()
+        with self.assertNumQueries(0):
+            counter.flush()
+
+    def test_views_arriving_during_flush_are_kept_for_next_flush(self):
+        counter = CacheViewCounter()
+        counter.increment(self.post.pk)
+        apply = view_counter.apply_view_increments
+
+        def apply_with_concurrent_view(increments):
+            counter.increment(self.post.pk)
+            return apply(increments)
+
+        with mock.patch.object(view_counter, 'apply_view_increments', apply_with_concurrent_view):
+            self.assertEqual(counter.flush(), 1)
+        self.assertEqual(counter.flush(), 1)
+        self.assertEqual(self.views(), 2)
+
+    def test_flush_all_posts_picks_up_counters_missing_from_dirty_log(self):
+        counter = CacheViewCounter()
+        counter.increment(self.post.pk)
+        cache.delete(CacheViewCounter._dirty_key(1))
+
+        self.assertEqual(counter.flush(), 0)
+        self.assertEqual(counter.flush(all_posts=True), 1)
+        self.assertEqual(self.views(), 1)
+
+
+class SensorHistoryTests(TestCase):
+    """Endpoint riwayat sensor dan pembangunan ulang rollup"""
+
+    def setUp(self):
+        self.member, self.device = create_member_device()
+        login_member(self.client, self.member)
+        self.url = reverse('main:device_sensor_history', args=[self.device.id])
+
+    def test_naive_start_without_end_is_accepted(self):
+        start = (timezone.localtime() - timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%S')
+        response = self.client.get(self.url, {'start': start})
+        self.assertEqual(response.status_code, 200)
+
+    def test_impossible_dates_are_rejected_as_invalid_range(self):
+        invalid = [
+            {'start': '2026-13-01T00:00:00'},
+            {'start': '2026-01-01T00:00:00', 'end': '2026-02-30T00:00:00'},
+        ]
+        for params in invalid:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(response.json()['error'], 'Rentang waktu tidak valid.')
+
+    def test_rebuild_keeps_rollups_whose_raw_readings_were_pruned(self):
+        now = timezone.now()
+        old_day = now - timedelta(days=10)
+        SensorReading.objects.bulk_create([
+            SensorReading(device=self.device, recorded_at=old_day, temperature=20.0),
+            SensorReading(device=self.device, recorded_at=now - timedelta(hours=1), temperature=25.0),
+        ])
+        rebuild_rollups(self.device.id, now - timedelta(days=30), now)
+
+        # compact_sensor_rollups --prune-raw-days 5, lalu bangun ulang jendela yang lebih panjang
+        SensorReading.objects.filter(recorded_at__lt=now - timedelta(days=5)).delete()
+        rebuild_rollups(self.device.id, now - timedelta(days=30), now)
+
+        old_rollup = SensorRollupDay.objects.get(device=self.device, bucket_start=bucket_start(old_day, 'day'))
+        self.assertEqual(old_rollup.reading_count, 1)
+        self.assertEqual(old_rollup.temperature_sum, 20.0)
+        recent_day = bucket_start(now - timedelta(hours=1), 'day')
+        self.assertEqual(SensorRollupDay.objects.get(device=self.device, bucket_start=recent_day).reading_count, 1)
+
+    def test_rebuild_keeps_partially_pruned_boundary_bucket(self):
+        now = timezone.now()
+        day = bucket_start(now, 'day') - timedelta(days=3)
+        SensorReading.objects.bulk_create([
+            SensorReading(device=self.device, recorded_at=day + timedelta(hours=hour), temperature=20.0 + hour)
+            for hour in (1, 2, 3)
+        ])
+        rebuild_rollups(self.device.id, day, now)
+
+        SensorReading.objects.filter(recorded_at__lt=day + timedelta(hours=2)).delete()
+        rebuild_rollups(self.device.id, day, now)
+
+        self.assertEqual(SensorRollupDay.objects.get(device=self.device, bucket_start=day).reading_count, 3)
+
+
+class DetectionPollerTests(TestCase):
+    """Deteksi yang ditulis proses worker diteruskan ke koneksi SSE"""
+
+    async def test_new_detections_are_published_to_watched_devices(self):
+        _, device = await sync_to_async(create_member_device)()
+        _, other_device = await sync_to_async(create_member_device)('MBR-2026-0101', 'RBT-SN-01-90002')
+        create_detection = sync_to_async(DetectionHistory.objects.create)
+        await create_detection(device=device, image_url='/media/lama.jpg', disease_detected='Leaf Spot')
+
+        broker = get_broker()
+        queue = broker.subscribe(device_channel(device.id))
+        # interval 0: tanpa task latar, poll_once dipanggil langsung
+        poller = DetectionPoller(interval=0)
+        poller.watch(device.id)
+        try:
+            self.assertEqual(await poller.poll_once(), 0)
+            detection = await create_detection(device=device, image_url='/media/baru.jpg', disease_detected='Gray Mold')
+            await create_detection(device=other_device, image_url='/media/lain.jpg')
+
+            self.assertEqual(await poller.poll_once(), 1)
+            event = await asyncio.wait_for(queue.get(), timeout=1)
+            self.assertEqual(event['type'], 'detection')
+            self.assertEqual(event['id'], detection.id)
+            self.assertEqual(event['disease_detected'], 'Gray Mold')
+            self.assertEqual(await poller.poll_once(), 0)
+        finally:
+            poller.unwatch(device.id)
+            broker.unsubscribe(device_channel(device.id), queue)
+
+
+class ImageDerivativeTests(TestCase):
+    """Thumbnail WebP dari StoredImage"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_PIPELINE_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (800, 600), 'red').save(buffer, 'JPEG')
+        return SimpleUploadedFile('daun.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def thumbnail_width(self, stored):
+        from PIL import Image
+
+        with default_storage.open(stored.thumbnail.name, 'rb') as thumbnail, Image.open(thumbnail) as image:
+            return image.width
+
+    def test_overwrite_regenerates_existing_derivatives(self):
+        stored = store_image(self.upload())
+        self.assertEqual(self.thumbnail_width(stored), 320)
+
+        with override_settings(IMAGE_THUMBNAIL_SIZE=160):
+            generate_derivatives(stored)
+            self.assertEqual(self.thumbnail_width(stored), 320)
+            generate_derivatives(stored, overwrite=True)
+        self.assertEqual(self.thumbnail_width(stored), 160)
+
+    def test_detection_accepts_media_path_as_image_url(self):
+        _, device = create_member_device()
+        stored = store_image(self.upload())
+        detection = DetectionHistory(device=device, image=stored, image_url=stored.original.url)
+        detection.full_clean()
+        self.assertTrue(detection.image_url.startswith('/media/'))
+
+
+class ForumSearchIndexTests(TestCase):
+    """Penjadwalan index pencarian forum setelah commit"""
+
+    def test_post_saved_after_rolled_back_transaction_is_indexed(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                create_forum_post(title='Batal disimpan', username='batal')
+                raise RuntimeError('rollback')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post = create_forum_post(title='Embun tepung', username='petani')
+        self.assertTrue(ForumSearchTerm.objects.filter(post=post, term='embun').exists())
+
+    def test_post_saved_twice_in_one_transaction_is_indexed_once(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            post = create_forum_post()
+            post.title = 'Panen stroberi manis'
+            post.save()
+        index_callbacks = [callback for callback in callbacks if isinstance(callback, _IndexPost)]
+        self.assertEqual([callback.post_id for callback in index_callbacks], [post.id])
+
+
+class SharedUsernameLoginTests(TestCase):
+    """Login tunggal saat username yang sama dipakai CS dan Member"""
+
+    def setUp(self):
+        cache.clear()
+        CustomerService.objects.create(
+            username='budi', email='cs.budi@example.com', full_name='CS Budi', password=make_password('rahasia-cs'),
+        )
+        Member.objects.create(
+            member_id='MBR-2026-0200', username='budi', full_name='Member Budi', email='budi@example.com',
+            password=make_password('rahasia-member'), is_registered=True,
+        )
+
+    def test_member_can_log_in_when_cs_shares_username(self):
+        response = self.client.post(reverse('main:login'), {'username': 'budi', 'password': 'rahasia-member'})
+        self.assertRedirects(response, reverse('main:member_dashboard'), fetch_redirect_response=False)
+        self.assertEqual(self.client.session['member_id'], 'MBR-2026-0200')
+
+    def test_higher_priority_role_still_wins_with_its_password(self):
+        response = self.client.post(reverse('main:login'), {'username': 'budi', 'password': 'rahasia-cs'})
+        self.assertRedirects(response, reverse('main:cs_dashboard'), fetch_redirect_response=False)
+        self.assertNotIn('member_id', self.client.session)
+
+
+@override_settings(LOGIN_MAX_FAILURES=2)
+class LoginThrottleTests(TestCase):
+    """Batas login gagal per IP"""
+
+    def setUp(self):
+        cache.clear()
+        Member.objects.create(
+            member_id='MBR-2026-0300', username='sari', full_name='Sari', email='sari@example.com',
+            password=make_password('rahasia-member'), is_registered=True,
+        )
+
+    def login(self, password):
+        return self.client.post(reverse('main:login'), {'username': 'sari', 'password': password})
+
+    def test_blocked_ip_gets_429_without_hashing(self):
+        self.login('salah')
+        self.login('salah')
+        with mock.patch('main.views.acheck_password') as check_password:
+            response = self.login('rahasia-member')
+        self.assertEqual(response.status_code, 429)
+        check_password.assert_not_called()
+        self.assertNotIn('member_id', self.client.session)
+
+    def test_successful_login_clears_failures(self):
+        self.login('salah')
+        response = self.login('rahasia-member')
+        self.assertRedirects(response, reverse('main:member_dashboard'), fetch_redirect_response=False)
+        self.client.logout()
+        # Hitungan mulai dari nol lagi: satu kegagalan baru belum memblokir
+        self.login('salah')
+        self.assertEqual(self.login('rahasia-member').status_code, 302)
+
+
+class NotificationCounterTests(TestCase):
+    """Counter notifikasi belum dibaca dan badge di dashboard"""
+
+    def setUp(self):
+        self.member, self.device = create_member_device()
+
+    def counter(self):
+        return NotificationCounter.objects.get(member=self.member).unread_count
+
+    def test_decrement_below_zero_is_clamped_without_negative_arithmetic(self):
+        for index in range(3):
+            notify(self.member, 'sensor_warning', f'Suhu tinggi {index}', 'Suhu di atas batas')
+        # Counter sempat tidak cocok, mis. notifikasi ditambah langsung dari Django admin
+        NotificationCounter.objects.filter(member=self.member).update(unread_count=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(mark_all_read(self.member), 3)
+        self.assertEqual(self.counter(), 0)
+        update = next(query['sql'] for query in queries if query['sql'].startswith('UPDATE "main_notificationcounter"'))
+        self.assertIn('CASE WHEN', update)
+
+    def test_badge_count_is_available_on_every_member_dashboard_page(self):
+        login_member(self.client, self.member)
+        notify(self.member, 'detection_new', 'Hasil Deteksi Tersedia', 'Gray Mold')
+        notify(self.member, 'sensor_warning', 'Kelembapan rendah', 'Kelembapan di bawah batas')
+
+        response = self.client.get(reverse('main:device_sensor', args=[self.device.id]))
+        self.assertContains(response, 'background: #ef4444;">2</span>')
+
+
+class ContactMessageCounterTests(TestCase):
+    """Jumlah pesan Hubungi CS per status"""
+
+    def create_message(self, subject='Pengiriman paket'):
+        return create_message(name='Rina', email='rina@example.com', subject=subject, message='Kapan dikirim?')
+
+    def test_status_change_clamps_drifted_counter_at_zero(self):
+        message = self.create_message()
+        get_message_counts()
+        ContactMessageCounter.objects.filter(status='new').update(count=0)
+
+        self.assertTrue(set_status(message, 'read'))
+        counts = get_message_counts()
+        self.assertEqual((counts['new'], counts['read']), (0, 1))
+
+    def test_action_on_message_deleted_concurrently_reports_not_found(self):
+        cs = CustomerService.objects.create(
+            username='cs1', email='cs1@example.com', full_name='CS Satu', password=make_password('rahasia'),
+        )
+        session = self.client.session
+        session['cs_id'] = cs.id
+        session.save()
+        message = self.create_message()
+
+        def deleted_before_update(target, status, **fields):
+            ContactMessage.objects.filter(pk=target.pk).delete()
+            return set_status(target, status, **fields)
+
+        with mock.patch('main.cs_views.set_status', deleted_before_update):
+            response = self.client.post(reverse('main:cs_messages'), {'message_id': message.id, 'action': 'archive'})
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)], ['Pesan tidak ditemukan.'])
+
+
+class IdentityCacheTests(TestCase):
+    """Akun login per request dan cache lintas request"""
+
+    def setUp(self):
+        cache.clear()
+        self.cs = CustomerService.objects.create(
+            username='cs-identitas', email='cs-identitas@example.com', full_name='CS Identitas',
+            password=make_password('rahasia'),
+        )
+        login_cs(self.client, self.cs)
+
+    def test_deactivation_in_another_worker_applies_on_next_request_without_shared_cache(self):
+        self.assertEqual(self.client.get(reverse('main:cs_faq')).status_code, 200)
+        # Worker lain menonaktifkan akun; signal-nya tidak berjalan di proses ini
+        CustomerService.objects.filter(pk=self.cs.pk).update(is_active=False)
+        self.assertRedirects(self.client.get(reverse('main:cs_faq')), reverse('main:login'), fetch_redirect_response=False)
+
+    def test_deactivation_invalidates_shared_cache(self):
+        with file_cache_settings(self):
+            self.assertEqual(self.client.get(reverse('main:cs_faq')).status_code, 200)
+            self.assertEqual(self.account_queries(), 0)
+
+            self.cs.is_active = False
+            self.cs.save()
+            response = self.client.get(reverse('main:cs_faq'))
+        self.assertRedirects(response, reverse('main:login'), fetch_redirect_response=False)
+
+    def account_queries(self):
+        """Jumlah SELECT akun CS selama satu request halaman CS"""
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse('main:cs_faq')).status_code, 200)
+        return len([query for query in queries if 'FROM "main_customerservice"' in query['sql']])
+
+    def test_cs_page_reads_the_account_once_per_request(self):
+        self.assertEqual(self.account_queries(), 1)
+
+    def test_get_cs_and_base_context_share_one_lookup(self):
+        request = RequestFactory().get('/')
+        request.session = self.client.session
+        with CaptureQueriesContext(connection) as queries:
+            cs = get_cs(request)
+            context = get_cs_base_context(get_cs(request))
+        self.assertEqual(context['cs'], cs)
+        self.assertEqual(len([query for query in queries if 'FROM "main_customerservice"' in query['sql']]), 1)
+
+
+class ContentCacheTests(TestCase):
+    """Cache konten publik dan cache halaman untuk pengunjung tanpa session"""
+
+    def setUp(self):
+        cache.clear()
+        self.faq = FAQ.objects.create(question='Berapa lama garansi?', answer='Satu tahun.')
+
+    def landing_faqs(self):
+        """Pertanyaan FAQ dari render landing page; None jika dilayani dari cache halaman"""
+        response = self.client.get(reverse('main:landing'))
+        self.assertEqual(response.status_code, 200)
+        if response.context is None:
+            return None
+        return [faq['question'] for faq in response.context['faqs']]
+
+    def edit_faq(self, question):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.question = question
+            self.faq.save()
+
+    def test_faq_edit_changes_next_landing_render_with_shared_cache(self):
+        with file_cache_settings(self):
+            self.assertEqual(self.landing_faqs(), ['Berapa lama garansi?'])
+            self.assertIsNone(self.landing_faqs())
+
+            self.edit_faq('Berapa lama garansi perangkat?')
+            self.assertEqual(self.landing_faqs(), ['Berapa lama garansi perangkat?'])
+
+    def test_process_local_cache_renders_current_content(self):
+        self.assertEqual(self.landing_faqs(), ['Berapa lama garansi?'])
+        # Worker lain mengubah FAQ; invalidasinya tidak sampai ke cache memori proses ini
+        FAQ.objects.filter(pk=self.faq.pk).update(question='Apakah ada garansi?')
+        self.assertEqual(self.landing_faqs(), ['Apakah ada garansi?'])
+
+
+class AdminSearchTests(TestCase):
+    """Pencarian member dan order lewat token yang sama dengan indexing"""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.siti = Member.objects.create(
+                member_id='MBR-2025-00492', username='siti', full_name='Siti Nur-Aini',
+                email='siti.aini@example.com', phone='+62 812-3456-7890', is_registered=True,
+            )
+            RangBotDevice.objects.create(serial_number='RBT-SN-01-88401', device_name='Greenhouse Timur', member=self.siti)
+            self.budi = Member.objects.create(
+                member_id='MBR-2025-00493', username='budi_s', full_name="Budi O'Brien",
+                email='budi@example.com', phone='0813 1111 2222', is_registered=True,
+            )
+            self.order = PurchaseOrder.objects.create(
+                customer_name='Budi Santoso', customer_email='budi@example.com', customer_phone='081311112222',
+                customer_address='Lembang', company_name='PT. Maju Tani', total_price=0,
+            )
+
+    def search_members(self, query):
+        return set(apply_search(Member.objects.all(), 'member', query))
+
+    def test_name_prefix(self):
+        self.assertEqual(self.search_members('bud'), {self.budi})
+        self.assertEqual(self.search_members('sit nur'), {self.siti})
+
+    def test_exact_member_id_and_serial(self):
+        self.assertEqual(self.search_members('MBR-2025-00492'), {self.siti})
+        self.assertEqual(self.search_members('rbt-sn-01-88401'), {self.siti})
+        # ID hanya cocok persis, bukan awalan
+        self.assertEqual(self.search_members('MBR-2025-0049'), set())
+
+    def test_phone_variants(self):
+        self.assertEqual(self.search_members('0812-3456-7890'), {self.siti})
+        self.assertEqual(self.search_members('62813'), {self.budi})
+        self.assertEqual(self.search_members('siti 08123456'), {self.siti})
+
+    def test_punctuation_is_tokenized_like_the_index(self):
+        self.assertEqual(self.search_members('Nur-Aini'), {self.siti})
+        self.assertEqual(self.search_members("O'Brien"), {self.budi})
+        self.assertEqual(self.search_members('budi@exa'), {self.budi})
+        orders = apply_search(PurchaseOrder.objects.all(), 'order', 'PT. Maju')
+        self.assertEqual(list(orders), [self.order])
+        orders = apply_search(PurchaseOrder.objects.all(), 'order', f'#{self.order.pk}')
+        self.assertEqual(list(orders), [self.order])
+
+
+class TelemetryIngestTests(TestCase):
+    """Endpoint ingest telemetri perangkat"""
+
+    def setUp(self):
+        self.member, self.device = create_member_device()
+        self.api_key = generate_device_api_key(self.device)
+        self.url = reverse('main:device_telemetry_ingest', args=[self.device.serial_number])
+
+    def post(self, body, content_type='application/json', api_key=None):
+        return self.client.post(
+            self.url, body, content_type=content_type,
+            HTTP_AUTHORIZATION=f'Bearer {api_key or self.api_key}',
+        )
+
+    def test_bulk_ingest_json_and_ndjson(self):
+        response = self.post({'readings': [
+            {'ts': '2026-10-01T08:00:00Z', 'temperature': 24.5, 'humidity': 70},
+            {'ts': 1790000000, 'position': 3},
+        ]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'accepted': 2})
+
+        ndjson = '{"temperature": 25.0}\n\n{"humidity": 68.5}\n'
+        response = self.post(ndjson, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(SensorReading.objects.filter(device=self.device).count(), 4)
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.status, 'active')
+        self.assertIsNotNone(self.device.last_data_update)
+
+    def test_invalid_api_key_is_rejected(self):
+        response = self.post({'temperature': 24.5}, api_key='salah')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(self.url, {'temperature': 24.5}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(SensorReading.objects.exists())
+
+    @override_settings(TELEMETRY_MAX_BATCH=2)
+    def test_batch_limit(self):
+        response = self.post([{'temperature': 20 + index} for index in range(3)])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SensorReading.objects.exists())
+
+    def test_bad_payloads_are_rejected(self):
+        payloads = [
+            '{"temperature": NaN}',
+            '{"humidity": Infinity}',
+            '{"temperature": -Infinity}',
+            '{"temperature": "24"}',
+            '{"ts": "kemarin", "temperature": 24}',
+            '{"ts": "2026-10-01T08:00:00Z"}',
+            '[]',
+            '[1, 2]',
+            '{"temperature": ',
+        ]
+        for body in payloads:
+            response = self.post(body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn('error', response.json())
+        self.assertFalse(SensorReading.objects.exists())
+
+
+class MemberAddDeviceTests(TestCase):
+    """Tipe paket perangkat yang ditambahkan manual oleh member"""
+
+    def setUp(self):
+        self.member, _ = create_member_device()
+        login_member(self.client, self.member)
+
+    def test_package_type_follows_device_name_without_choice(self):
+        self.client.post(reverse('main:member_add_device'), {'serial_number': 'RBT-SN-01-90002', 'device_name': 'RangBot Pro 2'})
+        self.client.post(reverse('main:member_add_device'), {'serial_number': 'RBT-SN-01-90003', 'device_name': 'Blok Timur'})
+        self.assertEqual(RangBotDevice.objects.get(serial_number='RBT-SN-01-90002').package_type, 'professional')
+        self.assertEqual(RangBotDevice.objects.get(serial_number='RBT-SN-01-90003').package_type, 'basic')
+
+    def test_explicit_package_type_wins(self):
+        self.client.post(reverse('main:member_add_device'), {
+            'serial_number': 'RBT-SN-01-90004', 'device_name': 'Blok Barat', 'package_type': 'professional',
+        })
+        self.assertEqual(RangBotDevice.objects.get(serial_number='RBT-SN-01-90004').package_type, 'professional')
+
+
+class SequenceCounterTests(TestCase):
+    """Alokasi nomor urut Member ID dan nomor seri"""
+
+    def test_reserve_sequence_allocates_consecutive_ranges(self):
+        self.assertEqual(reserve_sequence('uji', 3), 1)
+        self.assertEqual(reserve_sequence('uji', 2), 4)
+        self.assertEqual(reserve_sequence('uji'), 6)
+        self.assertEqual(SequenceCounter.objects.get(name='uji').value, 6)
+
+    def test_serial_numbers_continue_from_counter(self):
+        SequenceCounter.objects.create(name='serial_number', value=5)
+        self.assertEqual(reserve_serial_numbers(2), ['RBT-SN-01-88406', 'RBT-SN-01-88407'])
+
+    def test_first_member_id_of_a_new_year_starts_at_one(self):
+        SequenceCounter.objects.create(name='member_id:2026', value=41)
+        with mock.patch('main.utils.timezone.now', return_value=timezone.now().replace(year=2027, month=1, day=1)):
+            self.assertEqual(generate_member_id(), 'MBR-2027-00001')
+            self.assertEqual(generate_member_id(), 'MBR-2027-00002')
+        self.assertEqual(SequenceCounter.objects.get(name='member_id:2026').value, 41)
+
+    def test_migration_seeds_counters_from_existing_numbers(self):
+        create_member_device(member_id='MBR-2025-00492', serial_number='RBT-SN-01-88410')
+        create_member_device(member_id='MBR-2025-00007', serial_number='RBT-SN-01-88402')
+        PurchaseOrder.objects.create(
+            customer_name='Order Lama', customer_email='lama@example.com', customer_phone='0812',
+            customer_address='Bandung', total_price=0, member_id='MBR-2024-00031',
+        )
+        migration = importlib.import_module('main.migrations.0023_sequence_counter')
+        migration.seed_counters(apps, None)
+        self.assertEqual(
+            dict(SequenceCounter.objects.values_list('name', 'value')),
+            {'member_id:2025': 492, 'member_id:2024': 31, 'serial_number': 10},
+        )
+        self.assertEqual(reserve_serial_numbers(1), ['RBT-SN-01-88411'])
+
+
+@override_settings(DEVICE_PROVISION_BATCH_SIZE=2)
+class ProvisionDevicesTests(TestCase):
+    """Provisioning perangkat untuk order dengan paket campuran"""
+
+    def test_mixed_quantity_order(self):
+        admin = Admin.objects.create(username='admin', email='admin@example.com', password='x', full_name='Admin')
+        SequenceCounter.objects.create(name='serial_number', value=20)
+        order = PurchaseOrder.objects.create(
+            customer_name='Kebun Armada', customer_email='armada@example.com', customer_phone='0812',
+            customer_address='Lembang', total_price=0, qty_basic=3, qty_professional=2,
+            member_id='MBR-2026-0500', status='verified',
+        )
+        member = Member.objects.create(member_id='MBR-2026-0500', full_name='Kebun Armada', email='armada@example.com')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(provision_devices(order, member, admin), 5)
+
+        devices = list(RangBotDevice.objects.filter(member=member).order_by('serial_number'))
+        self.assertEqual(
+            [(device.serial_number, device.device_name, device.package_type) for device in devices],
+            [
+                ('RBT-SN-01-88421', 'RangBot Basic 1', 'basic'),
+                ('RBT-SN-01-88422', 'RangBot Basic 2', 'basic'),
+                ('RBT-SN-01-88423', 'RangBot Basic 3', 'basic'),
+                ('RBT-SN-01-88424', 'RangBot Pro 1', 'professional'),
+                ('RBT-SN-01-88425', 'RangBot Pro 2', 'professional'),
+            ],
+        )
+        self.assertEqual(SequenceCounter.objects.get(name='serial_number').value, 25)
+
+        logs = ActivityLog.objects.filter(action_type='serial_created', related_order=order)
+        self.assertEqual(
+            sorted(logs.values_list('related_device_id', flat=True)), sorted(device.id for device in devices),
+        )
+        self.assertTrue(all(log.performed_by_id == admin.id and log.related_member_id == member.id for log in logs))
+
+        # Satu notifikasi per order, counter belum dibaca ikut bertambah satu
+        self.assertEqual(member.notifications.filter(notification_type='device_added').count(), 1)
+        self.assertEqual(NotificationCounter.objects.get(member=member).unread_count, 1)
+
+
+class PasswordHashPoolTests(TestCase):
+    """Thread pool hashing password: backpressure, statistik, dan login async"""
+
+    def setUp(self):
+        cache.clear()
+        Member.objects.create(
+            member_id='MBR-2026-0600', username='wulan', full_name='Wulan', email='wulan@example.com',
+            password=make_password('rahasia-member'), is_registered=True,
+        )
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1)
+    def test_full_queue_rejects_and_stats_report_it(self):
+        pool = PasswordHashPool()
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait(5)
+            return 'hash'
+
+        async def scenario():
+            job = asyncio.ensure_future(pool.submit(slow_hash))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            busy_stats = pool.stats()
+            with self.assertRaises(PasswordHashingBusy), self.assertLogs('main.password_hashing', 'WARNING'):
+                await pool.submit(slow_hash)
+            release.set()
+            return busy_stats, await job
+
+        busy_stats, result = asyncio.run(scenario())
+        self.assertEqual(result, 'hash')
+        self.assertEqual(busy_stats, {
+            'workers': 1, 'max_pending': 1, 'running': 1, 'queued': 0, 'rejected_total': 0, 'completed_total': 0,
+        })
+        self.assertEqual(pool.stats(), {
+            'workers': 1, 'max_pending': 1, 'running': 0, 'queued': 0, 'rejected_total': 1, 'completed_total': 1,
+        })
+
+    def test_busy_login_returns_503_and_keeps_username(self):
+        with mock.patch('main.views.acheck_password', side_effect=PasswordHashingBusy):
+            response = self.client.post(reverse('main:login'), {'username': 'wulan', 'password': 'rahasia-member'})
+        self.assertEqual(response.status_code, 503)
+        self.assertContains(response, 'value="wulan"', status_code=503)
+        self.assertNotIn('member_id', self.client.session)
+
+    def test_busy_registration_returns_503_and_keeps_form(self):
+        Member.objects.create(member_id='MBR-2026-0601', full_name='Baru', email='baru@example.com')
+        with mock.patch('main.views.amake_password', side_effect=PasswordHashingBusy):
+            response = self.client.post(reverse('main:register'), {
+                'member_id': 'MBR-2026-0601', 'username': 'baru', 'full_name': 'Petani Baru',
+                'email': 'baru@example.com', 'phone': '08123', 'password': 'rahasia-baru', 'confirm_password': 'rahasia-baru',
+            })
+        self.assertEqual(response.status_code, 503)
+        for value in ('MBR-2026-0601', 'baru', 'Petani Baru', 'baru@example.com', '08123'):
+            self.assertContains(response, f'value="{value}"', status_code=503)
+        self.assertFalse(Member.objects.get(member_id='MBR-2026-0601').is_registered)
+
+    async def test_async_login_round_trip(self):
+        response = await self.async_client.post(reverse('main:login'), {'username': 'wulan', 'password': 'rahasia-member'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse('main:member_dashboard'))
+        response = await self.async_client.get(reverse('main:member_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['member'].member_id, 'MBR-2026-0600')
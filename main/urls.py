@@ -2,6 +2,7 @@ from django.urls import path
 from . import views
 from . import admin_views
 from . import cs_views
+from . import api_views
 
 app_name = 'main'
 
@@ -42,7 +43,11 @@ urlpatterns = [
     path('dashboard/device/<int:device_id>/control/', views.device_control, name='device_control'),
     path('dashboard/device/<int:device_id>/streaming/', views.device_streaming, name='device_streaming'),
     path('dashboard/device/<int:device_id>/sensor/', views.device_sensor, name='device_sensor'),
+    path('dashboard/device/<int:device_id>/sensor/history/', views.device_sensor_history, name='device_sensor_history'),
+    path('dashboard/device/<int:device_id>/sensor/stream/', views.device_sensor_stream, name='device_sensor_stream'),
     path('dashboard/device/<int:device_id>/detection-history/', views.device_detection_history, name='device_detection_history'),
+    path('dashboard/device/<int:device_id>/detection-history/export/', views.device_detection_export, name='device_detection_export'),
+    path('dashboard/detection-history/export/', views.member_detection_export, name='member_detection_export'),
     
     # Admin URLs (unified login - no separate admin login)
     path('admin/dashboard/', admin_views.admin_dashboard, name='admin_dashboard'),
@@ -50,6 +55,7 @@ urlpatterns = [
     
     # Purchase Orders
     path('admin/purchase-orders/', admin_views.purchase_orders_list, name='purchase_orders_list'),
+    path('admin/purchase-orders/export/', admin_views.purchase_orders_export, name='purchase_orders_export'),
     path('admin/purchase-orders/<int:order_id>/', admin_views.purchase_order_detail, name='purchase_order_detail'),
     path('admin/purchase-orders/<int:order_id>/verify/', admin_views.verify_purchase, name='verify_purchase'),
     path('admin/purchase-orders/<int:order_id>/reject/', admin_views.reject_purchase, name='reject_purchase'),
@@ -61,6 +67,7 @@ urlpatterns = [
     path('admin/members/<str:member_id>/toggle-active/', admin_views.member_toggle_active, name='member_toggle_active'),
     path('admin/members/<str:member_id>/delete/', admin_views.member_delete, name='member_delete'),
     path('admin/members/<str:member_id>/edit/', admin_views.member_edit, name='member_edit'),
+    path('admin/members/<str:member_id>/detections/export/', admin_views.member_detections_export, name='member_detections_export'),
     
     # Serial Number Management
     path('admin/serial-numbers/', admin_views.serial_numbers_list, name='serial_numbers_list'),
@@ -81,6 +88,7 @@ urlpatterns = [
     
     # Activity Log
     path('admin/activity-log/', admin_views.activity_log_list, name='activity_log_list'),
+    path('admin/activity-log/export/', admin_views.activity_log_export, name='activity_log_export'),
     path('admin/activity-log/<int:log_id>/delete/', admin_views.activity_log_delete, name='activity_log_delete'),
     path('admin/activity-log/delete-all/', admin_views.activity_log_delete_all, name='activity_log_delete_all'),
     
@@ -99,6 +107,7 @@ urlpatterns = [
     path('admin/articles/add/', admin_views.article_add, name='article_add'),
     path('admin/articles/<int:article_id>/edit/', admin_views.article_edit, name='article_edit'),
     path('admin/articles/<int:article_id>/delete/', admin_views.article_delete, name='article_delete'),
+    path('admin/metrics/password-hashing/', admin_views.password_hashing_metrics, name='password_hashing_metrics'),
     
     # Customer Service URLs
     path('cs/dashboard/', cs_views.cs_dashboard, name='cs_dashboard'),
@@ -114,5 +123,8 @@ urlpatterns = [
     path('cs/notifications/', cs_views.cs_notifications, name='cs_notifications'),
     path('cs/activity-log/', cs_views.cs_activity_log_list, name='cs_activity_log_list'),
     path('cs/settings/', cs_views.cs_settings, name='cs_settings'),
+    
+    # Device API
+    path('api/devices/<str:serial_number>/telemetry/', api_views.device_telemetry_ingest, name='device_telemetry_ingest'),
 ]
 
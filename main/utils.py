@@ -2,8 +2,42 @@
 Utility functions untuk sistem admin
 """
 
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, F, Subquery
+from django.db.models.functions import Coalesce
+from django.shortcuts import render
 from django.utils import timezone
-from .models import PurchaseOrder, RangBotDevice
+from .models import RangBotDevice, SequenceCounter
+
+
+MEMBER_ID_SEQUENCE = 'member_id:{year}'
+SERIAL_NUMBER_SEQUENCE = 'serial_number'
+SERIAL_BASE_NUMBER = 88400  # Starting number
+
+# render() untuk view async (login, register, tambah akun dengan hashing password)
+arender = sync_to_async(render)
+
+
+def reserve_sequence(name, count=1):
+    """
+    Alokasikan `count` nomor urut berturut-turut dari SequenceCounter `name`
+    
+    Satu UPDATE value = value + count (atomik di database); baris counter tetap
+    terkunci sampai transaksi pemanggil selesai sehingga alokasi bersamaan
+    menunggu, bukan mendapat nomor yang sama.
+    
+    Returns:
+        Nomor pertama; nomor yang dialokasikan = pertama .. pertama + count - 1
+    """
+    with transaction.atomic():
+        counters = SequenceCounter.objects.filter(name=name)
+        if not counters.update(value=F('value') + count):
+            # Urutan baru (mis. tahun baru); get_or_create aman jika dibuat bersamaan
+            SequenceCounter.objects.get_or_create(name=name)
+            counters.update(value=F('value') + count)
+        last = counters.values_list('value', flat=True).get()
+    return last - count + 1
 
 
 def generate_member_id():
@@ -12,24 +46,8 @@ def generate_member_id():
     Contoh: MBR-2025-00492
     """
     year = timezone.now().year
-    
-    # Cari Member ID terakhir yang sudah dibuat
-    last_order = PurchaseOrder.objects.filter(
-        member_id__isnull=False,
-        member_id__startswith=f'MBR-{year}'
-    ).order_by('-id').first()
-    
-    if last_order and last_order.member_id:
-        # Extract number from last Member ID
-        try:
-            last_num = int(last_order.member_id.split('-')[-1])
-            new_num = last_num + 1
-        except (ValueError, IndexError):
-            new_num = 1
-    else:
-        new_num = 1
-    
-    return f"MBR-{year}-{str(new_num).zfill(5)}"
+    number = reserve_sequence(MEMBER_ID_SEQUENCE.format(year=year))
+    return f"MBR-{year}-{str(number).zfill(5)}"
 
 
 def generate_serial_number(sequence):
@@ -43,29 +61,50 @@ def generate_serial_number(sequence):
     Returns:
         Serial number string
     """
-    base_num = 88400  # Starting number
-    serial_num = base_num + sequence
+    serial_num = SERIAL_BASE_NUMBER + sequence
     return f"RBT-SN-01-{serial_num}"
 
 
-def get_next_serial_sequence():
+def reserve_serial_numbers(count):
     """
-    Mendapatkan sequence number berikutnya untuk serial number
-    Berdasarkan serial number terakhir yang ada
-    """
-    last_device = RangBotDevice.objects.order_by('-id').first()
+    Alokasikan `count` nomor seri sekaligus (satu UPDATE untuk satu order)
     
-    if last_device and last_device.serial_number:
-        try:
-            # Extract number from serial number (format: RBT-SN-01-88401)
-            parts = last_device.serial_number.split('-')
-            if len(parts) >= 4:
-                last_num = int(parts[-1])
-                base_num = 88400
-                sequence = last_num - base_num + 1
-                return sequence
-        except (ValueError, IndexError):
-            pass
+    Returns:
+        List serial number berurutan
+    """
+    start = reserve_sequence(SERIAL_NUMBER_SEQUENCE, count)
+    return [generate_serial_number(start + offset) for offset in range(count)]
+
+
+def count_subquery(queryset, group_field):
+    """
+    COUNT(*) berkorelasi sebagai ekspresi annotate, 0 jika tidak ada baris
     
-    return 1
+    Args:
+        queryset: QuerySet yang sudah difilter dengan OuterRef
+        group_field: field yang dipakai untuk filter OuterRef (mis. 'member')
+    """
+    counted = queryset.order_by().values(group_field).annotate(total=Count('pk')).values('total')[:1]
+    return Coalesce(Subquery(counted), 0)
+
 
+def device_stats_by_member(member_pks):
+    """
+    Statistik perangkat per member dalam satu query
+    (SELECT member_id, package_type, COUNT(*) ... GROUP BY member_id, package_type)
+    
+    Returns:
+        dict {pk member: {'total_devices', 'pro_count', 'basic_count'}}
+    """
+    stats = {pk: {'total_devices': 0, 'pro_count': 0, 'basic_count': 0} for pk in member_pks}
+    rows = (
+        RangBotDevice.objects.filter(member_id__in=list(stats))
+        .order_by()
+        .values_list('member_id', 'package_type')
+        .annotate(total=Count('pk'))
+    )
+    for member_pk, package_type, total in rows:
+        key = 'pro_count' if package_type == 'professional' else 'basic_count'
+        stats[member_pk][key] += total
+        stats[member_pk]['total_devices'] += total
+    return stats
@@ -0,0 +1,309 @@
+"""
+Penghitung view postingan forum yang di-buffer
+
+forum_detail tidak lagi menjalankan post.views += 1; post.save() di setiap
+request. Penambahan view dikumpulkan lalu diterapkan secara periodik dengan
+UPDATE ... SET views = views + n (F expression), satu query untuk setiap
+kelompok postingan dengan jumlah penambahan yang sama.
+
+Backend (FORUM_VIEW_COUNTER_BACKEND):
+- 'memory' (default): buffer di memori proses, di-flush oleh thread background
+  setiap FORUM_VIEW_FLUSH_INTERVAL detik dan saat proses berhenti.
+  Aman untuk banyak proses web: setiap proses hanya menerapkan view miliknya
+  sendiri, sehingga tidak ada view yang diterapkan dua kali. Buffer ini tidak
+  bisa dijangkau dari proses lain (termasuk `manage.py flush_forum_views`).
+- 'cache': buffer di Django cache (Redis/Memcached) sehingga dibagi antar proses;
+  flush dijalankan oleh thread background dan/atau `python manage.py flush_forum_views`.
+  Pada satu waktu hanya satu proses yang boleh flush (lock lewat cache.add), dan
+  flush hanya membaca postingan yang tercatat mendapat view sejak flush terakhir.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F
+
+from .models import ForumPost
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 30.0
+CACHE_KEY_PREFIX = 'forum:views:'
+# Jumlah key yang dibaca per get_many saat flush backend cache
+CACHE_SCAN_CHUNK = 500
+# Lock flush backend cache kedaluwarsa sendiri jika proses pemegangnya mati di tengah flush
+FLUSH_LOCK_TIMEOUT = 300
+
+
+def _backend_name():
+    return getattr(settings, 'FORUM_VIEW_COUNTER_BACKEND', 'memory')
+
+
+def _flush_interval():
+    return getattr(settings, 'FORUM_VIEW_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+
+def apply_view_increments(increments):
+    """
+    Terapkan dict {post_id: jumlah} ke database dengan F('views') + n
+    Postingan dengan jumlah penambahan yang sama digabung dalam satu UPDATE
+    """
+    by_amount = defaultdict(list)
+    for post_id, amount in increments.items():
+        if amount > 0:
+            by_amount[amount].append(post_id)
+    for amount, post_ids in by_amount.items():
+        ForumPost.objects.filter(id__in=post_ids).update(views=F('views') + amount)
+    return sum(increments.values())
+
+
+class MemoryViewCounter:
+    """Buffer view count di memori proses"""
+
+    def __init__(self):
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def increment(self, post_id, amount=1):
+        self._ensure_flusher()
+        with self._lock:
+            self._counts[post_id] += amount
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._counts.get(post_id, 0)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                counts, self._counts = self._counts, defaultdict(int)
+            if not counts:
+                return 0
+            try:
+                return apply_view_increments(counts)
+            except Exception:
+                # Kembalikan ke buffer agar tidak hilang, dicoba lagi di flush berikutnya
+                with self._lock:
+                    for post_id, amount in counts.items():
+                        self._counts[post_id] += amount
+                raise
+
+    def _ensure_flusher(self):
+        """Jalankan thread flusher (sekali per proses, aman setelah fork)"""
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+                return
+            if self._pid != pid:
+                self._counts = defaultdict(int)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='forum-view-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        stop = threading.Event()
+        while not stop.wait(_flush_interval()):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Gagal menulis view count forum')
+            finally:
+                connections.close_all()
+
+
+class CacheViewCounter(MemoryViewCounter):
+    """
+    Buffer view count di Django cache, dibagi oleh semua proses
+
+    - increment: cache.incr pada counter postingan (atomik). Jika hasilnya sama
+      dengan jumlah yang ditambahkan, counter baru saja naik dari 0 dan id
+      postingan dicatat di log dirty (nomor urut dari cache.incr, satu key per entri).
+    - flush: hanya pemegang lock yang berjalan. Flusher membaca log dirty sejak
+      flush terakhir, menerapkan counter postingan tersebut, lalu mengurangi
+      counter dengan cache.decr sebesar nilai yang sudah diterapkan. View yang
+      masuk di antaranya tetap tersisa dan postingannya dicatat ulang di log.
+    """
+
+    LOCK_KEY = f'{CACHE_KEY_PREFIX}flush-lock'
+    SEQUENCE_KEY = f'{CACHE_KEY_PREFIX}dirty:seq'
+    DONE_KEY = f'{CACHE_KEY_PREFIX}dirty:done'
+    RETRY_KEY = f'{CACHE_KEY_PREFIX}dirty:retry'
+
+    @staticmethod
+    def _key(post_id):
+        return f'{CACHE_KEY_PREFIX}{post_id}'
+
+    @staticmethod
+    def _dirty_key(index):
+        return f'{CACHE_KEY_PREFIX}dirty:{index}'
+
+    def increment(self, post_id, amount=1):
+        self._ensure_flusher()
+        key = self._key(post_id)
+        # add() hanya membuat key jika belum ada; incr() atomik di Redis/Memcached
+        cache.add(key, 0, timeout=None)
+        try:
+            value = cache.incr(key, amount)
+        except ValueError:
+            # Key ter-evict di antara add() dan incr()
+            cache.set(key, amount, timeout=None)
+            value = amount
+        if value == amount:
+            self._mark_dirty([post_id])
+
+    def pending(self, post_id):
+        return cache.get(self._key(post_id), 0)
+
+    def _mark_dirty(self, post_ids):
+        cache.add(self.SEQUENCE_KEY, 0, timeout=None)
+        last = cache.incr(self.SEQUENCE_KEY, len(post_ids))
+        first = last - len(post_ids) + 1
+        cache.set_many(
+            {self._dirty_key(index): post_id for index, post_id in zip(range(first, last + 1), post_ids)},
+            timeout=None,
+        )
+
+    def _read_dirty(self, indices):
+        entries = {}
+        for start in range(0, len(indices), CACHE_SCAN_CHUNK):
+            chunk = indices[start:start + CACHE_SCAN_CHUNK]
+            values = cache.get_many([self._dirty_key(index) for index in chunk])
+            for index in chunk:
+                if self._dirty_key(index) in values:
+                    entries[index] = values[self._dirty_key(index)]
+        return entries
+
+    def _read_counts(self, post_ids):
+        counts = {}
+        post_ids = list(post_ids)
+        for start in range(0, len(post_ids), CACHE_SCAN_CHUNK):
+            chunk = post_ids[start:start + CACHE_SCAN_CHUNK]
+            values = cache.get_many([self._key(post_id) for post_id in chunk])
+            for post_id in chunk:
+                amount = values.get(self._key(post_id)) or 0
+                if amount > 0:
+                    counts[post_id] = amount
+        return counts
+
+    def _apply(self, counts):
+        """Terapkan counts lalu kurangi counter di cache; postingan yang masih bersisa dicatat ulang"""
+        if not counts:
+            return 0
+        applied = apply_view_increments(counts)
+        remaining = []
+        for post_id, amount in counts.items():
+            try:
+                left = cache.decr(self._key(post_id), amount)
+            except ValueError:
+                left = 0
+            if left > 0:
+                remaining.append(post_id)
+        if remaining:
+            self._mark_dirty(remaining)
+        return applied
+
+    def flush(self, all_posts=False):
+        """
+        Tulis view yang di-buffer ke database
+
+        Args:
+            all_posts: periksa counter semua postingan, bukan hanya log dirty
+                (untuk counter yang entri log-nya hilang karena cache di-evict)
+
+        Returns:
+            Jumlah view yang ditulis; 0 jika proses lain sedang flush
+        """
+        token = uuid.uuid4().hex
+        if not cache.add(self.LOCK_KEY, token, FLUSH_LOCK_TIMEOUT):
+            return 0
+        try:
+            if all_posts:
+                return self._apply(self._read_counts(ForumPost.objects.values_list('id', flat=True)))
+            return self._flush_dirty()
+        finally:
+            if cache.get(self.LOCK_KEY) == token:
+                cache.delete(self.LOCK_KEY)
+
+    def _flush_dirty(self):
+        done = cache.get(self.DONE_KEY, 0)
+        last = cache.get(self.SEQUENCE_KEY, 0)
+        if last < done:
+            # Nomor urut ter-evict dan dimulai lagi dari awal
+            done = 0
+        retry = cache.get(self.RETRY_KEY, [])
+        new_indices = list(range(done + 1, last + 1))
+        entries = self._read_dirty(retry + new_indices)
+
+        applied = self._apply(self._read_counts(set(entries.values())))
+
+        cache.delete_many([self._dirty_key(index) for index in entries])
+        cache.set(self.DONE_KEY, last, timeout=None)
+        # Entri yang belum ada mungkin sedang ditulis proses lain; dicoba sekali lagi di flush berikutnya
+        cache.set(self.RETRY_KEY, [index for index in new_indices if index not in entries], timeout=None)
+        return applied
+
+    def _ensure_flusher(self):
+        # Thread flusher opsional untuk backend cache; beberapa proses boleh menjalankannya karena flush memakai lock
+        if getattr(settings, 'FORUM_VIEW_FLUSH_IN_PROCESS', True):
+            super()._ensure_flusher()
+
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def get_view_counter():
+    backend = _backend_name()
+    counter = _counters.get(backend)
+    if counter is None:
+        with _counters_lock:
+            counter = _counters.get(backend)
+            if counter is None:
+                counter = CacheViewCounter() if backend == 'cache' else MemoryViewCounter()
+                _counters[backend] = counter
+    return counter
+
+
+def record_view(post):
+    """
+    Catat satu view untuk postingan
+    post.views di instance ikut dinaikkan (tanpa save) agar halaman menampilkan
+    angka terbaru termasuk view yang belum di-flush
+    """
+    counter = get_view_counter()
+    counter.increment(post.id)
+    post.views += counter.pending(post.id)
+
+
+def flush_view_counts(all_posts=False):
+    """Paksa tulis view count yang masih di buffer ke database (backend cache: lihat CacheViewCounter.flush)"""
+    counter = get_view_counter()
+    if isinstance(counter, CacheViewCounter):
+        return counter.flush(all_posts=all_posts)
+    return counter.flush()
+
+
+def _flush_at_exit():
+    # Hanya buffer memori yang hilang saat proses berhenti; buffer cache tetap ada untuk flush berikutnya
+    counter = _counters.get('memory')
+    if counter is None:
+        return
+    try:
+        counter.flush()
+    except Exception:
+        logger.exception('Gagal menulis view count forum saat proses berhenti')
+
+
+atexit.register(_flush_at_exit)
@@ -1,14 +1,35 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from asgiref.sync import sync_to_async
 from django.views.generic import TemplateView
 from django.contrib import messages
 from django.urls import reverse
 from urllib.parse import urlencode
-from datetime import datetime
-from django.db import models
-from .models import ForumUser, ForumPost, ForumComment, Admin, CustomerService, PurchaseOrder, Member, RangBotDevice, DetectionHistory, Notification, FAQ, ProductInfo, ContactMessage
-from .forms import ForumLoginForm, ForumPostForm, ForumCommentForm
-from django.contrib.auth.hashers import check_password, make_password
+from datetime import datetime, timedelta
+import asyncio
+import json
+from django.db import IntegrityError, models
+from .models import ForumUser, ForumPost, ForumComment, PurchaseOrder, Member, RangBotDevice, DetectionHistory
+from .forms import ForumLoginForm, ForumPostForm, ForumCommentForm, ForumRegisterForm
+from .activity_log import log_activity
+from .view_counter import record_view
+from .forum_search import search_posts
+from .sensor_rollups import get_sensor_history, DEFAULT_MAX_POINTS
+from .realtime import detection_poller, device_channel, get_broker
+from .detection import DetectionError, enqueue_detection, DISEASE_LABELS
+from .exports import ExportError, export_detections
+from .identity import get_principal
+from .credentials import ROLE_MODELS, clear_login_failures, find_credentials, is_login_blocked, record_login_failure
+from .contact_messages import create_message
+from .notifications import mark_all_read, mark_read, notify, unread_count
+from .password_hashing import BUSY_MESSAGE as HASHING_BUSY_MESSAGE, PasswordHashingBusy, acheck_password, amake_password
+from .utils import arender
+from .content_cache import FAQS, cache_page_for_anonymous, get_active_products, get_faqs, get_latest_forum_posts
+from django.contrib.auth.hashers import check_password
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 
@@ -18,85 +39,93 @@ def is_staff_user(user):
     return user.is_staff or user.is_superuser
 
 
-def member_login(request):
-    """Login tunggal: Admin, Member, atau CS - diarahkan sesuai peran."""
+LOGIN_CONTEXT = {'page_title': 'Login - RangBot'}
+
+
+def _start_login_session(request, credential):
+    """Isi session sesuai peran dan arahkan ke dashboard-nya"""
+    # last_login lewat UPDATE langsung: tanpa SELECT akun dan tanpa signal
+    ROLE_MODELS[credential.role].objects.filter(pk=credential.account_id).update(last_login=timezone.now())
+
+    if credential.role == 'admin':
+        request.session['admin_id'] = credential.account_id
+        request.session['admin_username'] = credential.username
+        request.session['admin_name'] = credential.full_name
+        request.session['user_role'] = 'admin'
+        # Tidak menampilkan pesan welcome untuk admin
+        return redirect('main:admin_dashboard')
+
+    if credential.role == 'cs':
+        request.session['cs_id'] = credential.account_id
+        request.session['cs_username'] = credential.username
+        request.session['cs_name'] = credential.full_name
+        request.session['user_role'] = 'cs'
+        messages.success(request, f'Selamat datang, {credential.full_name}!')
+        return redirect('main:cs_dashboard')
+
+    request.session['member_id'] = credential.member_id
+    request.session['member_username'] = credential.username
+    request.session['member_name'] = credential.full_name
+    request.session['user_role'] = 'member'
+    messages.success(request, f'Selamat datang, {credential.full_name}!')
+    return redirect('main:member_dashboard')
+
+
+async def member_login(request):
+    """
+    Login tunggal: Admin, Member, atau CS - diarahkan sesuai peran.
+    Peran dicari lewat satu query ke LoginCredential; password diverifikasi per peran yang memakai
+    username itu di thread pool hashing (main/password_hashing.py); lebih dari satu hanya jika
+    username dipakai beberapa peran (lihat main/credentials.py).
+    """
     if request.method == 'POST':
         username = request.POST.get('username', '').strip()
         password = request.POST.get('password', '')
+        # Username tetap terisi saat form ditampilkan ulang
+        context = {**LOGIN_CONTEXT, 'username': username}
 
         if not username or not password:
             messages.error(request, 'Mohon lengkapi username dan password.')
-            return render(request, 'login.html', { 'page_title': 'Login - RangBot' })
+            return await arender(request, 'login.html', context)
 
-        # 1) Coba sebagai Admin
-        try:
-            admin = Admin.objects.get(username=username, is_active=True)
-            if admin.password and check_password(password, admin.password):
-                request.session['admin_id'] = admin.id
-                request.session['admin_username'] = admin.username
-                request.session['admin_name'] = admin.full_name
-                request.session['user_role'] = 'admin'
-                admin.last_login = timezone.now()
-                admin.save(update_fields=['last_login'])
-                # Tidak menampilkan pesan welcome untuk admin
-                return redirect('main:admin_dashboard')
-        except Admin.DoesNotExist:
-            pass
-
-        # 2) Coba sebagai Customer Service (CS)
-        try:
-            cs = CustomerService.objects.get(username=username, is_active=True)
-            if cs.password and check_password(password, cs.password):
-                request.session['cs_id'] = cs.id
-                request.session['cs_username'] = cs.username
-                request.session['cs_name'] = cs.full_name
-                request.session['user_role'] = 'cs'
-                cs.last_login = timezone.now()
-                cs.save(update_fields=['last_login'])
-                messages.success(request, f'Selamat datang, {cs.full_name}!')
-                return redirect('main:cs_dashboard')
-        except CustomerService.DoesNotExist:
-            pass
-
-        # 3) Coba sebagai Member terdaftar
-        try:
-            member = Member.objects.get(username=username, is_registered=True)
-            if not member.is_active:
+        # Tolak burst percobaan dari IP yang sama sebelum query dan hashing
+        if await sync_to_async(is_login_blocked)(request):
+            messages.error(request, 'Terlalu banyak percobaan login gagal. Silakan coba lagi dalam beberapa menit.')
+            return await arender(request, 'login.html', context, status=429)
+
+        credentials = await sync_to_async(find_credentials)(username)
+
+        # Username yang sama bisa dipakai beberapa peran: coba sesuai prioritas
+        for credential in credentials:
+            if credential.role == 'member' and not credential.is_active:
                 messages.error(request, 'Akun Anda telah dinonaktifkan. Silakan hubungi admin untuk informasi lebih lanjut.')
-                return render(request, 'login.html', { 'page_title': 'Login - RangBot' })
-            if member.password and check_password(password, member.password):
-                request.session['member_id'] = member.member_id
-                request.session['member_username'] = member.username
-                request.session['member_name'] = member.full_name
-                request.session['user_role'] = 'member'
-                member.last_login = timezone.now()
-                member.save(update_fields=['last_login'])
-                messages.success(request, f'Selamat datang, {member.full_name}!')
-                return redirect('main:member_dashboard')
-        except Member.DoesNotExist:
-            pass
+                return await arender(request, 'login.html', context)
+
+            try:
+                verified = await acheck_password(password, credential.password)
+            except PasswordHashingBusy:
+                messages.error(request, HASHING_BUSY_MESSAGE)
+                return await arender(request, 'login.html', context, status=503)
+
+            if verified:
+                await sync_to_async(clear_login_failures)(request)
+                return await sync_to_async(_start_login_session)(request, credential)
 
-        # Jika gagal semua
+        # Jika gagal
+        await sync_to_async(record_login_failure)(request)
         messages.error(request, 'Username atau password salah.')
+        return await arender(request, 'login.html', context)
 
-    return render(request, 'login.html', { 'page_title': 'Login - RangBot' })
+    return await arender(request, 'login.html', LOGIN_CONTEXT)
 
+@cache_page_for_anonymous('landing', groups=[FAQS])
 def landing_page(request):
     """
     View untuk menampilkan landing page RangBot.
+    Pengunjung tanpa session dilayani dari cache halaman (tanpa query database).
     """
-    # Get FAQ from database (only active ones, ordered by order field)
-    try:
-        faqs_queryset = FAQ.objects.filter(is_active=True).order_by('order', 'created_at')
-        faqs_list = []
-        for faq in faqs_queryset:
-            faqs_list.append({
-                'question': faq.question,
-                'answer': faq.answer,
-            })
-    except:
-        # If database tables don't exist yet, use empty list
-        faqs_list = []
+    # FAQ aktif dari cache konten
+    faqs_list = get_faqs()
     
     context = {
         'page_title': 'RangBot - Sistem Deteksi Penyakit Stroberi',
@@ -256,52 +285,13 @@ def product_info(request):
     show_sales_success = request.GET.get('sales_success') == '1'
     sales_success_name = request.GET.get('sales_name', '')
     
-    # Get FAQ from database (only active ones)
-    try:
-        faqs_queryset = FAQ.objects.filter(is_active=True).order_by('order', 'created_at')
-        faqs_list = []
-        for faq in faqs_queryset:
-            faqs_list.append({
-                'question': faq.question,
-                'answer': faq.answer,
-            })
-    except:
-        # If database tables don't exist yet, use empty list
-        faqs_list = []
-    
-    # Get pricing plans from database (only active ones)
-    try:
-        products_queryset = ProductInfo.objects.filter(is_active=True).order_by('package_type')
-        pricing_plans_list = []
-        for product in products_queryset:
-            features = product.get_features_list() if hasattr(product, 'get_features_list') else []
-            pricing_plans_list.append({
-                'name': product.name,
-                'price': f"{product.price:,.0f}".replace(',', '.'),
-                'description': product.description or 'Paket untuk kebutuhan Anda',
-                'features': features if features else [],
-                'highlight': product.package_type == 'professional',  # Professional is highlighted
-            })
-    except:
-        # If database tables don't exist yet, use empty list
-        pricing_plans_list = []
-    
-    # Get latest forum posts (limit 3)
-    try:
-        forum_posts = ForumPost.objects.all()[:3]
-        forum_posts_list = []
-        for post in forum_posts:
-            forum_posts_list.append({
-                'title': post.title,
-                'author': post.author.name,
-                'date': post.created_at.strftime('%d %b %Y'),
-                'excerpt': post.get_excerpt(100),
-                'replies': post.get_comment_count(),
-                'category': post.get_category_display(),
-            })
-    except:
-        # If database tables don't exist yet, use empty list
-        forum_posts_list = []
+    # FAQ, paket produk, dan postingan forum terbaru dari cache konten
+    faqs_list = get_faqs()
+    pricing_plans_list = [
+        {**plan, 'description': plan['description'] or 'Paket untuk kebutuhan Anda'}
+        for plan in get_active_products()
+    ]
+    forum_posts_list = get_latest_forum_posts()
     
     context = {
         'page_title': 'Informasi Produk - RangBot',
@@ -329,29 +319,13 @@ def purchase(request):
     # Get selected package from URL parameter
     selected_package = request.GET.get('paket', '').lower()
     
-    # Get pricing plans from database (only active ones)
-    try:
-        products_queryset = ProductInfo.objects.filter(is_active=True).order_by('package_type')
-        pricing_plans_list = []
-        products_dict = {}  # Store products by package_type for price calculation
-        
-        for product in products_queryset:
-            features = product.get_features_list() if hasattr(product, 'get_features_list') else []
-            pricing_plans_list.append({
-                'name': product.name,
-                'package_type': product.package_type,  # Add package_type for reference
-                'price': f"{product.price:,.0f}".replace(',', '.'),
-                'price_decimal': product.price,  # Store decimal for calculation
-                'description': product.description or 'Paket untuk kebutuhan Anda',
-                'features': features if features else [],
-                'highlight': product.package_type == 'professional',  # Professional is highlighted
-            })
-            # Store product for price lookup
-            products_dict[product.package_type] = product
-    except:
-        # If database tables don't exist yet, use empty list
-        pricing_plans_list = []
-        products_dict = {}
+    # Paket produk aktif dari cache konten
+    pricing_plans_list = [
+        {**plan, 'description': plan['description'] or 'Paket untuk kebutuhan Anda'}
+        for plan in get_active_products()
+    ]
+    # Harga per package_type untuk perhitungan total
+    product_prices = {plan['package_type']: plan['price_value'] for plan in pricing_plans_list}
     
     # Handle form submission
     if request.method == 'POST':
@@ -390,10 +364,10 @@ def purchase(request):
             price_basic = Decimal('0')
             price_professional = Decimal('0')
             
-            if 'basic' in products_dict:
-                price_basic = Decimal(str(products_dict['basic'].price))
-            if 'professional' in products_dict:
-                price_professional = Decimal(str(products_dict['professional'].price))
+            if 'basic' in product_prices:
+                price_basic = Decimal(str(product_prices['basic']))
+            if 'professional' in product_prices:
+                price_professional = Decimal(str(product_prices['professional']))
             
             total_price = (qty_basic * price_basic) + (qty_professional * price_professional)
             
@@ -413,8 +387,7 @@ def purchase(request):
             )
             
             # Create ActivityLog for new purchase order (system notification for admin)
-            from .models import ActivityLog
-            ActivityLog.objects.create(
+            log_activity(
                 action_type='order_created',
                 description=f'Pembelian baru: Order #{purchase_order.id} dari {customer_name} ({customer_email}). Total: {purchase_order.get_total_units()} unit (Basic: {qty_basic}, Pro: {qty_professional}). Total harga: Rp {total_price:,.0f}',
                 performed_by=None,  # Created by customer, not admin
@@ -489,106 +462,137 @@ def login_view(request):
     return render(request, 'login.html', context)
 
 
-def register_view(request):
+def _registration_context(member_id, username, full_name, email, phone):
+    """Isian form registrasi (tanpa password) agar tidak perlu diketik ulang"""
+    return {
+        'page_title': 'Register - RangBot',
+        'member_id': member_id,
+        'username': username,
+        'full_name': full_name,
+        'email': email,
+        'phone': phone,
+    }
+
+
+def _registration_form_response(request, member_id, username, full_name, email, phone):
+    return render(request, 'register.html', _registration_context(member_id, username, full_name, email, phone))
+
+
+def _validate_registration(request):
+    """
+    Validasi form registrasi member (tanpa hashing)
+
+    Returns:
+        (member, data) jika valid, HttpResponse untuk respons langsung,
+        atau None jika ada error (pesan sudah ditambahkan)
+    """
+    member_id = request.POST.get('member_id', '').strip().upper()
+    username = request.POST.get('username', '').strip()
+    full_name = request.POST.get('full_name', '').strip()
+    email = request.POST.get('email', '').strip()
+    phone = request.POST.get('phone', '').strip()
+    password = request.POST.get('password', '')
+    confirm_password = request.POST.get('confirm_password', '')
+    
+    # Validation
+    if not all([member_id, username, full_name, email, password, confirm_password]):
+        messages.error(request, 'Harap isi semua field yang wajib.')
+        return None
+    if password != confirm_password:
+        messages.error(request, 'Password tidak cocok.')
+        return None
+    if len(password) < 8:
+        messages.error(request, 'Password minimal 8 karakter.')
+        return None
+    
+    # Validasi Member ID: harus sudah ada di database dan belum terdaftar
+    try:
+        member = Member.objects.get(member_id=member_id)
+    except Member.DoesNotExist:
+        messages.error(request, 'ID Member tidak valid atau tidak ditemukan. Pastikan Anda menggunakan Member ID yang diberikan oleh admin setelah verifikasi pembelian.')
+        return None
+    
+    # Cek apakah sudah terdaftar
+    if member.is_registered:
+        messages.error(request, 'ID Member ini sudah terdaftar. Silakan login.')
+        return redirect('main:login')
+    
+    # Validasi email harus sesuai dengan email di purchase order
+    if member.email.lower() != email.lower():
+        messages.error(request, f'Email tidak sesuai dengan email yang terdaftar di pembelian. Email yang benar: {member.email}')
+        return _registration_form_response(request, member_id, username, full_name, email, phone)
+    
+    # Cek username dan email tidak digunakan oleh member lain
+    if Member.objects.filter(username=username).exclude(member_id=member_id).exists():
+        messages.error(request, 'Username sudah digunakan.')
+        return _registration_form_response(request, member_id, username, full_name, email, phone)
+    elif Member.objects.filter(email=email).exclude(member_id=member_id).exists():
+        messages.error(request, 'Email sudah terdaftar.')
+        return _registration_form_response(request, member_id, username, full_name, email, phone)
+    
+    return member, {'username': username, 'full_name': full_name, 'email': email, 'phone': phone, 'password': password}
+
+
+def _complete_registration(request, member, data, password_hash):
+    # Update member dengan data registrasi
+    member.username = data['username']
+    member.full_name = data['full_name']
+    member.phone = data['phone'] or member.phone
+    member.password = password_hash
+    member.is_registered = True
+    try:
+        member.save()
+    except IntegrityError:
+        # Username diambil member lain selama password di-hash
+        messages.error(request, 'Username sudah digunakan.')
+        return _registration_form_response(request, member.member_id, data['username'], data['full_name'], data['email'], data['phone'])
+    
+    # Create ActivityLog for user registration (system notification for admin)
+    log_activity(
+        action_type='member_registered',
+        description=f'Member {member.member_id} ({data["full_name"]}) berhasil terdaftar dengan username: {data["username"]}',
+        performed_by=None,  # Registered by user, not admin
+        related_member=member,
+        metadata={
+            'member_id': member.member_id,
+            'username': data['username'],
+            'full_name': data['full_name'],
+            'email': data['email'],
+        }
+    )
+    
+    messages.success(request, 'Registrasi berhasil! Silakan login.')
+    return redirect('main:login')
+
+
+async def register_view(request):
     """
     View untuk halaman Register
     Member ID harus sudah ada di database (dibuat saat admin verifikasi purchase order)
     Customer tidak bisa membuat Member ID sendiri
+    Hash password dibuat di thread pool hashing (main/password_hashing.py)
     """
     if request.method == 'POST':
-        member_id = request.POST.get('member_id', '').strip().upper()
-        username = request.POST.get('username', '').strip()
-        full_name = request.POST.get('full_name', '').strip()
-        email = request.POST.get('email', '').strip()
-        phone = request.POST.get('phone', '').strip()
-        password = request.POST.get('password', '')
-        confirm_password = request.POST.get('confirm_password', '')
-        
-        # Validation
-        if not all([member_id, username, full_name, email, password, confirm_password]):
-            messages.error(request, 'Harap isi semua field yang wajib.')
-        elif password != confirm_password:
-            messages.error(request, 'Password tidak cocok.')
-        elif len(password) < 8:
-            messages.error(request, 'Password minimal 8 karakter.')
-        else:
-            # Validasi Member ID: harus sudah ada di database dan belum terdaftar
+        result = await sync_to_async(_validate_registration)(request)
+        if isinstance(result, HttpResponse):
+            return result
+        if result is not None:
+            member, data = result
             try:
-                member = Member.objects.get(member_id=member_id)
-                
-                # Cek apakah sudah terdaftar
-                if member.is_registered:
-                    messages.error(request, 'ID Member ini sudah terdaftar. Silakan login.')
-                    return redirect('main:login')
-                
-                # Validasi email harus sesuai dengan email di purchase order
-                if member.email.lower() != email.lower():
-                    messages.error(request, f'Email tidak sesuai dengan email yang terdaftar di pembelian. Email yang benar: {member.email}')
-                    return render(request, 'register.html', {
-                        'page_title': 'Register - RangBot',
-                        'member_id': member_id,
-                        'username': username,
-                        'full_name': full_name,
-                        'email': email,
-                        'phone': phone,
-                    })
-                
-                # Cek username dan email tidak digunakan oleh member lain
-                if Member.objects.filter(username=username).exclude(member_id=member_id).exists():
-                    messages.error(request, 'Username sudah digunakan.')
-                    return render(request, 'register.html', {
-                        'page_title': 'Register - RangBot',
-                        'member_id': member_id,
-                        'username': username,
-                        'full_name': full_name,
-                        'email': email,
-                        'phone': phone,
-                    })
-                elif Member.objects.filter(email=email).exclude(member_id=member_id).exists():
-                    messages.error(request, 'Email sudah terdaftar.')
-                    return render(request, 'register.html', {
-                        'page_title': 'Register - RangBot',
-                        'member_id': member_id,
-                        'username': username,
-                        'full_name': full_name,
-                        'email': email,
-                        'phone': phone,
-                    })
-                
-                # Update member dengan data registrasi
-                member.username = username
-                member.full_name = full_name
-                member.phone = phone or member.phone
-                member.password = make_password(password)
-                member.is_registered = True
-                member.save()
-                
-                # Create ActivityLog for user registration (system notification for admin)
-                from .models import ActivityLog
-                ActivityLog.objects.create(
-                    action_type='member_registered',
-                    description=f'Member {member.member_id} ({full_name}) berhasil terdaftar dengan username: {username}',
-                    performed_by=None,  # Registered by user, not admin
-                    related_member=member,
-                    metadata={
-                        'member_id': member.member_id,
-                        'username': username,
-                        'full_name': full_name,
-                        'email': email,
-                    }
+                password_hash = await amake_password(data['password'])
+            except PasswordHashingBusy:
+                messages.error(request, HASHING_BUSY_MESSAGE)
+                context = _registration_context(
+                    member.member_id, data['username'], data['full_name'], data['email'], data['phone'],
                 )
-                
-                messages.success(request, 'Registrasi berhasil! Silakan login.')
-                return redirect('main:login')
-                    
-            except Member.DoesNotExist:
-                messages.error(request, 'ID Member tidak valid atau tidak ditemukan. Pastikan Anda menggunakan Member ID yang diberikan oleh admin setelah verifikasi pembelian.')
+                return await arender(request, 'register.html', context, status=503)
+            return await sync_to_async(_complete_registration)(request, member, data, password_hash)
     
     context = {
         'page_title': 'Register - RangBot',
     }
     
-    return render(request, 'register.html', context)
+    return await arender(request, 'register.html', context)
 
 
 def contact_support(request):
@@ -606,13 +610,12 @@ def contact_support(request):
             messages.error(request, 'Mohon lengkapi semua field yang wajib diisi.')
             return redirect('main:contact_support')
         
-        # Save to database
-        ContactMessage.objects.create(
+        # Save to database (counter pesan baru CS ikut bertambah)
+        create_message(
             name=name,
             email=email,
             subject=subject,
             message=message,
-            status='new'
         )
         
         # Set success flag in session for popup
@@ -687,84 +690,111 @@ def contact_sales(request):
 def get_forum_user(request):
     """
     Helper function untuk mendapatkan forum user dari session
+    Dicari sekali per request (lihat main/identity.py)
     """
-    user_id = request.session.get('forum_user_id')
-    if user_id:
-        try:
-            return ForumUser.objects.get(id=user_id)
-        except ForumUser.DoesNotExist:
-            return None
+    return get_principal(request, 'forum_user')
+
+
+def _validate_forum_registration(form):
+    """
+    Cek username/email forum belum dipakai
+
+    Returns:
+        pesan error, atau None jika valid
+    """
+    username = form.cleaned_data['username'].strip()
+    email = form.cleaned_data['email'].strip().lower()
+    if ForumUser.objects.filter(username=username).exists():
+        return 'Username sudah digunakan. Silakan pilih username lain.'
+    if ForumUser.objects.filter(email=email).exists():
+        return 'Email sudah terdaftar. Silakan login atau gunakan email lain.'
     return None
 
 
-def forum_register(request):
+def _create_forum_user(form, password_hash):
+    username = form.cleaned_data['username'].strip()
+    return ForumUser.objects.create(
+        email=form.cleaned_data['email'].strip().lower(),
+        username=username,
+        name=username,  # Default name = username, bisa diubah nanti
+        role=form.cleaned_data['role'],
+        password=password_hash,
+    )
+
+
+async def forum_register(request):
     """
     View untuk registrasi forum user baru
     Sistem terpisah dari login utama
+    Hash password dibuat di thread pool hashing (main/password_hashing.py)
     """
+    status = 200
     if request.method == 'POST':
-        from .forms import ForumRegisterForm
         form = ForumRegisterForm(request.POST)
         
         if form.is_valid():
-            username = form.cleaned_data['username'].strip()
-            email = form.cleaned_data['email'].strip().lower()
-            role = form.cleaned_data['role']
-            password = form.cleaned_data['password']
-            
-            # Cek username sudah digunakan (handle if username field doesn't exist yet)
-            username_exists = False
-            try:
-                username_exists = ForumUser.objects.filter(username=username).exists()
-            except Exception:
-                # If username field doesn't exist in database yet, skip this check
-                pass
-            
-            if username_exists:
-                messages.error(request, 'Username sudah digunakan. Silakan pilih username lain.')
-            # Cek email sudah digunakan
-            elif ForumUser.objects.filter(email=email).exists():
-                messages.error(request, 'Email sudah terdaftar. Silakan login atau gunakan email lain.')
+            error = await sync_to_async(_validate_forum_registration)(form)
+            if error:
+                messages.error(request, error)
             else:
-                # Buat user baru
-                user_data = {
-                    'email': email,
-                    'name': username,  # Default name = username, bisa diubah nanti
-                    'role': role,
-                    'password': make_password(password)
-                }
-                # Only add username if field exists in database
                 try:
-                    # Test if username field exists by trying to filter
-                    ForumUser.objects.filter(username__isnull=False).exists()
-                    user_data['username'] = username
-                except Exception:
-                    # Username field doesn't exist yet, skip it
-                    pass
-                forum_user = ForumUser.objects.create(**user_data)
-                
-                messages.success(request, 'Registrasi berhasil! Silakan login untuk melanjutkan.')
-                return redirect('main:forum_login')
+                    password_hash = await amake_password(form.cleaned_data['password'])
+                except PasswordHashingBusy:
+                    messages.error(request, HASHING_BUSY_MESSAGE)
+                    status = 503
+                else:
+                    await sync_to_async(_create_forum_user)(form, password_hash)
+                    messages.success(request, 'Registrasi berhasil! Silakan login untuk melanjutkan.')
+                    return redirect('main:forum_login')
     else:
-        from .forms import ForumRegisterForm
         form = ForumRegisterForm()
     
     context = {
         'page_title': 'Daftar Forum - RangBot',
         'form': form,
     }
-    return render(request, 'forum_register.html', context)
+    return await arender(request, 'forum_register.html', context, status=status)
+
+
+def _find_forum_user(identifier):
+    """Cari pengguna forum dari email atau username (fallback ke email)"""
+    if '@' in identifier:
+        return ForumUser.objects.filter(email=identifier.lower()).first()
+    return (
+        ForumUser.objects.filter(username=identifier).first()
+        or ForumUser.objects.filter(email=identifier.lower()).first()
+    )
+
+
+def _start_forum_session(request, forum_user, next_url):
+    # Set session
+    request.session['forum_user_id'] = forum_user.id
+    request.session['forum_user_username'] = forum_user.get_display_name()
+    request.session['forum_user_name'] = forum_user.name
+    request.session['forum_user_email'] = forum_user.email
+    request.session['forum_user_role'] = forum_user.role
+    
+    # Update last login
+    forum_user.last_login = timezone.now()
+    forum_user.save(update_fields=['last_login'])
+    
+    messages.success(request, f'Selamat datang kembali, {forum_user.get_display_name()}!')
+    # Redirect ke forum_list jika next_url tidak valid atau kosong
+    if next_url and next_url != reverse('main:forum_login'):
+        return redirect(next_url)
+    return redirect('main:forum_list')
 
 
-def forum_login(request):
+async def forum_login(request):
     """
     View untuk login forum
     Sistem terpisah dari login utama
+    Password diverifikasi di thread pool hashing (main/password_hashing.py)
     """
     next_url = request.GET.get('next', reverse('main:forum_list'))
+    status = 200
     
     if request.method == 'POST':
-        from .forms import ForumLoginForm
         form = ForumLoginForm(request.POST)
         
         if form.is_valid():
@@ -772,42 +802,20 @@ def forum_login(request):
             password = form.cleaned_data['password']
             
             # Coba login dengan email atau username
-            try:
-                if '@' in identifier:
-                    forum_user = ForumUser.objects.get(email=identifier.lower())
-                else:
-                    # Try username, but handle if username field doesn't exist yet
-                    try:
-                        forum_user = ForumUser.objects.get(username=identifier)
-                    except Exception:
-                        # Fallback: try by email if username search fails
-                        forum_user = ForumUser.objects.get(email=identifier.lower())
-                
-                # Cek password (handle if password field doesn't exist yet)
-                if forum_user.password and check_password(password, forum_user.password):
-                    # Set session
-                    request.session['forum_user_id'] = forum_user.id
-                    request.session['forum_user_username'] = forum_user.get_display_name()
-                    request.session['forum_user_name'] = forum_user.name
-                    request.session['forum_user_email'] = forum_user.email
-                    request.session['forum_user_role'] = forum_user.role
-                    
-                    # Update last login
-                    forum_user.last_login = timezone.now()
-                    forum_user.save(update_fields=['last_login'])
-                    
-                    messages.success(request, f'Selamat datang kembali, {forum_user.get_display_name()}!')
-                    # Redirect ke forum_list jika next_url tidak valid atau kosong
-                    if next_url and next_url != reverse('main:forum_login'):
-                        return redirect(next_url)
-                    else:
-                        return redirect('main:forum_list')
+            forum_user = await sync_to_async(_find_forum_user)(identifier)
+            if forum_user is None:
+                messages.error(request, 'Email/Username tidak ditemukan.')
+            else:
+                try:
+                    verified = await acheck_password(password, forum_user.password)
+                except PasswordHashingBusy:
+                    messages.error(request, HASHING_BUSY_MESSAGE)
+                    status = 503
                 else:
+                    if verified:
+                        return await sync_to_async(_start_forum_session)(request, forum_user, next_url)
                     messages.error(request, 'Password salah.')
-            except ForumUser.DoesNotExist:
-                messages.error(request, 'Email/Username tidak ditemukan.')
     else:
-        from .forms import ForumLoginForm
         form = ForumLoginForm()
     
     context = {
@@ -815,7 +823,7 @@ def forum_login(request):
         'form': form,
         'next_url': next_url,
     }
-    return render(request, 'forum_login.html', context)
+    return await arender(request, 'forum_login.html', context, status=status)
 
 
 def forum_profile(request):
@@ -881,10 +889,10 @@ def forum_list(request):
     if category:
         posts = posts.filter(category=category)
     
-    # Search jika ada
-    search = request.GET.get('search', '')
+    # Search jika ada: inverted index, urut relevansi, 20 hasil per halaman
+    search = request.GET.get('search', '').strip()
     if search:
-        posts = posts.filter(title__icontains=search) | posts.filter(content__icontains=search)
+        posts = search_posts(search, request, per_page=20, filters=models.Q(post__category=category) if category else None)
     
     # Form untuk posting (hanya jika user login)
     from .forms import ForumPostForm
@@ -908,9 +916,8 @@ def forum_detail(request, post_id):
     post = get_object_or_404(ForumPost, id=post_id)
     forum_user = get_forum_user(request)
     
-    # Tambah view count
-    post.views += 1
-    post.save()
+    # Tambah view count (di-buffer, ditulis batch dengan F('views') + n)
+    record_view(post)
     
     # Handle comment form
     comment_form = None
@@ -924,8 +931,7 @@ def forum_detail(request, post_id):
                 comment.save()
                 
                 # Create ActivityLog for new forum comment (system notification for admin)
-                from .models import ActivityLog
-                ActivityLog.objects.create(
+                log_activity(
                     action_type='forum_comment_created',
                     description=f'Komentar baru pada postingan "{post.title}" oleh {forum_user.get_display_name()} ({forum_user.email})',
                     performed_by=None,  # Created by forum user, not admin
@@ -974,8 +980,7 @@ def forum_create(request):
             post.save()
             
             # Create ActivityLog for new forum post (system notification for admin)
-            from .models import ActivityLog
-            ActivityLog.objects.create(
+            log_activity(
                 action_type='forum_post_created',
                 description=f'Postingan forum baru: "{post.title}" oleh {forum_user.get_display_name()} ({forum_user.email}) di kategori {post.get_category_display()}',
                 performed_by=None,  # Created by forum user, not admin
@@ -1065,14 +1070,8 @@ def forum_delete(request, post_id):
 # ==================== DASHBOARD MEMBER VIEWS ====================
 
 def get_member(request):
-    """Helper function untuk mendapatkan member dari session"""
-    member_id = request.session.get('member_id')
-    if member_id:
-        try:
-            return Member.objects.get(member_id=member_id)
-        except Member.DoesNotExist:
-            return None
-    return None
+    """Helper function untuk mendapatkan member dari session (sekali per request, lihat main/identity.py)"""
+    return get_principal(request, 'member')
 
 
 def member_dashboard(request):
@@ -1095,8 +1094,9 @@ def member_dashboard(request):
     # Count active devices
     active_devices_count = devices.filter(status='active').count()
     
-    # Get unread notifications
+    # Get unread notifications (jumlah dari counter, lihat main/notifications.py)
     unread_notifications = member.notifications.filter(is_read=False)[:5]
+    unread_notifications_count = unread_count(member)
     
     # Get recent detections
     recent_detections = DetectionHistory.objects.filter(device__member=member)[:5]
@@ -1107,6 +1107,7 @@ def member_dashboard(request):
         'devices': devices,
         'active_devices_count': active_devices_count,
         'unread_notifications': unread_notifications,
+        'unread_notifications_count': unread_notifications_count,
         'recent_detections': recent_detections,
     }
     return render(request, 'dashboard/dashboard.html', context)
@@ -1132,6 +1133,8 @@ def device_detail(request, device_id):
         'member': member,
         'device': device,
         'detections': detections,
+        'disease_labels': DISEASE_LABELS[1:],
+        'history_limit': DETECTION_HISTORY_LIMIT,
     }
     return render(request, 'dashboard/device_detail.html', context)
 
@@ -1178,7 +1181,7 @@ def device_streaming(request, device_id):
 
 def device_sensor(request, device_id):
     """
-    View untuk data sensor perangkat (Firebase)
+    View untuk data sensor perangkat
     """
     member = get_member(request)
     
@@ -1187,15 +1190,126 @@ def device_sensor(request, device_id):
         return redirect('main:login')
     
     device = get_object_or_404(RangBotDevice, id=device_id, member=member)
+    latest_reading = device.sensor_readings.order_by('-recorded_at').first()
     
     context = {
         'page_title': f'Data Sensor {device.device_name or device.serial_number}',
         'member': member,
         'device': device,
+        'latest_reading': latest_reading,
+        'history_ranges': [('1h', '1 Jam'), ('24h', '24 Jam'), ('7d', '7 Hari'), ('30d', '30 Hari'), ('1y', '1 Tahun')],
     }
     return render(request, 'dashboard/device_sensor.html', context)
 
 
+# Rentang waktu yang tersedia untuk grafik riwayat sensor
+SENSOR_HISTORY_RANGES = {
+    '1h': timedelta(hours=1),
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    '1y': timedelta(days=365),
+}
+
+
+def _parse_aware_datetime(value):
+    """
+    parse_datetime yang selalu menghasilkan datetime aware (zona waktu default untuk input tanpa offset)
+
+    Raises:
+        ValueError: format benar tetapi tanggal tidak ada (mis. bulan 13)
+    """
+    value = parse_datetime(value)
+    if value is not None and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def device_sensor_history(request, device_id):
+    """
+    API JSON untuk grafik riwayat sensor (dibaca dari tabel rollup)
+    Parameter: ?range=1h|24h|7d|30d|1y atau ?start=..&end=.. (ISO 8601), ?points=maks jumlah titik
+    """
+    member = get_member(request)
+    if not member:
+        return JsonResponse({'error': 'Anda harus login terlebih dahulu.'}, status=401)
+    
+    device = get_object_or_404(RangBotDevice, id=device_id, member=member)
+    
+    end = timezone.now()
+    start = end - SENSOR_HISTORY_RANGES.get(request.GET.get('range'), SENSOR_HISTORY_RANGES['24h'])
+    if request.GET.get('start'):
+        try:
+            custom_start = _parse_aware_datetime(request.GET['start'])
+            custom_end = _parse_aware_datetime(request.GET['end']) if request.GET.get('end') else end
+        except ValueError:
+            custom_start = custom_end = None
+        if custom_start is None or custom_end is None or custom_start >= custom_end:
+            return JsonResponse({'error': 'Rentang waktu tidak valid.'}, status=400)
+        start, end = custom_start, custom_end
+    
+    try:
+        max_points = int(request.GET.get('points', DEFAULT_MAX_POINTS))
+    except ValueError:
+        max_points = DEFAULT_MAX_POINTS
+    
+    return JsonResponse(get_sensor_history(device.id, start, end, max_points))
+
+
+def _get_member_device(request, device_id):
+    member = get_member(request)
+    if not member:
+        return None
+    return RangBotDevice.objects.filter(id=device_id, member=member).first()
+
+
+async def device_sensor_stream(request, device_id):
+    """
+    Server-Sent Events untuk telemetri dan deteksi baru satu perangkat
+    Hanya aktif di server ASGI (mis. uvicorn rangbot_system.asgi:application);
+    runserver/gunicorn WSGI selalu menjawab 204 dan halaman tidak mendapat data live
+    """
+    if not isinstance(request, ASGIRequest):
+        # Di WSGI satu koneksi streaming menahan satu worker; 204 membuat EventSource berhenti
+        # dan halaman memakai fallback refresh berkala
+        return HttpResponse(status=204)
+    
+    device = await sync_to_async(_get_member_device)(request, device_id)
+    if device is None:
+        return HttpResponse(status=403)
+    
+    response = StreamingHttpResponse(_sensor_event_stream(device.id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def _sensor_event_stream(device_id):
+    broker = get_broker()
+    channel = device_channel(device_id)
+    queue = broker.subscribe(channel)
+    detection_poller.watch(device_id)
+    loop = asyncio.get_running_loop()
+    # Koneksi ditutup berkala; EventSource otomatis reconnect setelah 'retry' ms
+    deadline = loop.time() + settings.SSE_MAX_DURATION
+    try:
+        yield 'retry: 3000\n\n'
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(channel, queue)
+        detection_poller.unwatch(device_id)
+
+
+# Jumlah deteksi terbaru yang ditampilkan di halaman riwayat
+DETECTION_HISTORY_LIMIT = 60
+
+
 def device_detection_history(request, device_id):
     """
     View untuk riwayat deteksi perangkat
@@ -1207,17 +1321,60 @@ def device_detection_history(request, device_id):
         return redirect('main:login')
     
     device = get_object_or_404(RangBotDevice, id=device_id, member=member)
-    detections = device.detections.all()
+    # Thumbnail WebP diambil dari StoredImage dalam query yang sama; riwayat lengkap lewat export
+    detections = device.detections.select_related('image').order_by('-created_at')[:DETECTION_HISTORY_LIMIT]
     
     context = {
         'page_title': f'Riwayat Deteksi {device.device_name or device.serial_number}',
         'member': member,
         'device': device,
         'detections': detections,
+        'disease_labels': DISEASE_LABELS[1:],
+        'history_limit': DETECTION_HISTORY_LIMIT,
     }
     return render(request, 'dashboard/device_detection_history.html', context)
 
 
+def device_detection_export(request, device_id):
+    """
+    Export riwayat deteksi satu perangkat (streaming CSV/NDJSON)
+    Parameter: ?format=csv|ndjson, ?gzip=1, ?date_from, ?date_to, ?disease, ?detection_type
+    """
+    member = get_member(request)
+    if not member:
+        messages.warning(request, 'Anda harus login terlebih dahulu.')
+        return redirect('main:login')
+    
+    device = get_object_or_404(RangBotDevice, id=device_id, member=member)
+    try:
+        return export_detections(
+            DetectionHistory.objects.filter(device=device),
+            request.GET,
+            f'deteksi-{device.serial_number}',
+        )
+    except ExportError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
+def member_detection_export(request):
+    """
+    Export riwayat deteksi semua perangkat milik member (streaming CSV/NDJSON)
+    """
+    member = get_member(request)
+    if not member:
+        messages.warning(request, 'Anda harus login terlebih dahulu.')
+        return redirect('main:login')
+    
+    try:
+        return export_detections(
+            DetectionHistory.objects.filter(device__member=member),
+            request.GET,
+            f'deteksi-{member.member_id}',
+        )
+    except ExportError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
 def manual_detection(request):
     """
     View untuk deteksi manual menggunakan R-CNN
@@ -1228,19 +1385,50 @@ def manual_detection(request):
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
+    devices = list(member.rangbot_devices.filter(is_active=True).order_by('created_at'))
+    
     if request.method == 'POST':
-        # Handle file upload and detection
-        # TODO: Implement R-CNN detection logic
-        messages.success(request, 'Deteksi manual berhasil dilakukan!')
-        return redirect('main:member_dashboard')
+        image = request.FILES.get('image')
+        device = next((d for d in devices if str(d.id) == request.POST.get('device_id', '')), None)
+        if device is None and len(devices) == 1:
+            device = devices[0]
+        
+        if not image:
+            messages.error(request, 'Silakan pilih foto yang akan dideteksi.')
+        elif device is None:
+            messages.error(request, 'Silakan pilih perangkat untuk menyimpan hasil deteksi.')
+        else:
+            try:
+                # Foto hanya dimasukkan ke antrian; inferensi dijalankan oleh worker deteksi
+                enqueue_detection(member, device, image, detection_type='manual', location=request.POST.get('location', '').strip())
+                messages.success(request, 'Foto berhasil diupload dan sedang dianalisis. Hasil akan muncul di riwayat deteksi dan notifikasi.')
+            except DetectionError as e:
+                messages.error(request, str(e))
+        return redirect('main:manual_detection')
+    
+    recent_jobs = member.detection_jobs.select_related('device', 'detection').order_by('-created_at')[:5]
     
     context = {
         'page_title': 'Deteksi Manual - Dashboard',
         'member': member,
+        'devices': devices,
+        'recent_jobs': recent_jobs,
     }
     return render(request, 'dashboard/manual_detection.html', context)
 
 
+def _device_package_type(request, device_name):
+    """
+    Tipe paket perangkat yang ditambahkan manual oleh member
+    Pilihan di form dipakai jika ada; jika tidak, aturan yang sama dengan migrasi 0022:
+    nama yang mengandung "Pro" (mis. "RangBot Pro 1") berarti paket professional
+    """
+    package_type = request.POST.get('package_type', '').strip()
+    if package_type in dict(PurchaseOrder.PACKAGE_CHOICES):
+        return package_type
+    return 'professional' if 'pro' in (device_name or '').lower() else 'basic'
+
+
 def add_device(request):
     """
     View untuk menambahkan nomor seri perangkat baru
@@ -1268,13 +1456,14 @@ def add_device(request):
                     serial_number=serial_number,
                     member=member,
                     device_name=device_name or None,
+                    package_type=_device_package_type(request, device_name),
                     covered_blocks=covered_blocks or None,
                     status='offline',
                 )
                 
                 # Create notification
-                Notification.objects.create(
-                    member=member,
+                notify(
+                    member,
                     notification_type='device_added',
                     title='Perangkat Ditambahkan',
                     message=f'Perangkat {device.get_display_name()} berhasil ditambahkan ke akun Anda.',
@@ -1286,6 +1475,7 @@ def add_device(request):
     context = {
         'page_title': 'Tambah Perangkat - Dashboard',
         'member': member,
+        'package_choices': PurchaseOrder.PACKAGE_CHOICES,
     }
     return render(request, 'dashboard/add_device.html', context)
 
@@ -1359,13 +1549,14 @@ def member_add_device(request):
                     serial_number=serial_number,
                     member=member,
                     device_name=device_name or None,
+                    package_type=_device_package_type(request, device_name),
                     covered_blocks=covered_blocks or None,
                     status='offline',
                 )
                 
                 # Create notification
-                Notification.objects.create(
-                    member=member,
+                notify(
+                    member,
                     notification_type='device_added',
                     title='Perangkat Ditambahkan',
                     message=f'Perangkat {device.get_display_name()} berhasil ditambahkan ke akun Anda.',
@@ -1377,6 +1568,7 @@ def member_add_device(request):
     context = {
         'page_title': 'Tambah Rangbot - Dashboard',
         'member': member,
+        'package_choices': PurchaseOrder.PACKAGE_CHOICES,
     }
     return render(request, 'dashboard/add_device.html', context)
 
@@ -1395,27 +1587,9 @@ def member_purchase(request):
         messages.warning(request, 'Anda harus login terlebih dahulu.')
         return redirect('main:login')
     
-    # Get pricing plans from database (only active ones)
-    try:
-        products_queryset = ProductInfo.objects.filter(is_active=True).order_by('package_type')
-        pricing_plans_list = []
-        products_dict = {}
-        
-        for product in products_queryset:
-            features = product.get_features_list() if hasattr(product, 'get_features_list') else []
-            pricing_plans_list.append({
-                'name': product.name,
-                'package_type': product.package_type,
-                'price': f"{product.price:,.0f}".replace(',', '.'),
-                'price_value': product.price,
-                'description': product.description or '',
-                'features': features,
-                'highlight': product.package_type == 'professional',
-            })
-            products_dict[product.package_type] = product
-    except:
-        pricing_plans_list = []
-        products_dict = {}
+    # Paket produk aktif dari cache konten
+    pricing_plans_list = get_active_products()
+    product_prices = {plan['package_type']: plan['price_value'] for plan in pricing_plans_list}
     
     # Handle form submission
     if request.method == 'POST':
@@ -1452,10 +1626,10 @@ def member_purchase(request):
             price_basic = Decimal('0')
             price_professional = Decimal('0')
             
-            if 'basic' in products_dict:
-                price_basic = Decimal(str(products_dict['basic'].price))
-            if 'professional' in products_dict:
-                price_professional = Decimal(str(products_dict['professional'].price))
+            if 'basic' in product_prices:
+                price_basic = Decimal(str(product_prices['basic']))
+            if 'professional' in product_prices:
+                price_professional = Decimal(str(product_prices['professional']))
             
             total_price = (price_basic * qty_basic) + (price_professional * qty_professional)
             
@@ -1481,8 +1655,7 @@ def member_purchase(request):
             )
             
             # Create ActivityLog for new purchase order
-            from .models import ActivityLog
-            ActivityLog.objects.create(
+            log_activity(
                 action_type='order_created',
                 description=f'Pembelian tambahan: Order #{purchase_order.id} dari {customer_name} ({customer_email}) - Member ID: {member.member_id}. Total: {purchase_order.get_total_units()} unit (Basic: {qty_basic}, Pro: {qty_professional}). Total harga: Rp {total_price:,.0f}',
                 performed_by=None,
@@ -1569,17 +1742,24 @@ def member_device_management(request, device_id):
             messages.success(request, 'Deteksi berhasil dihapus.')
         
         elif action == 'detect':
-            # Handle image upload and detection
-            # TODO: Implement YOLO detection logic
-            messages.success(request, 'Deteksi berhasil dilakukan!')
+            image = request.FILES.get('image')
+            if not image:
+                messages.error(request, 'Silakan pilih foto yang akan dideteksi.')
+            else:
+                try:
+                    # Foto hanya dimasukkan ke antrian; inferensi dijalankan oleh worker deteksi
+                    enqueue_detection(member, device, image, detection_type='manual')
+                    messages.success(request, 'Foto berhasil diupload dan sedang dianalisis. Hasil akan muncul di riwayat deteksi.')
+                except DetectionError as e:
+                    messages.error(request, str(e))
         
         return redirect('main:member_device_management', device_id=device_id)
     
     # Get all detections for this device
     detections = device.detections.all().order_by('-created_at')
     
-    # Get sensor data (placeholder - integrate with actual sensor data source)
-    sensor_data = []  # TODO: Integrate with Firebase or sensor API
+    # Data sensor terbaru yang dikirim perangkat lewat API telemetri
+    sensor_data = list(device.sensor_readings.order_by('-recorded_at')[:20])
     
     context = {
         'page_title': f'Manajemen {device.get_display_name()} - Dashboard',
@@ -1654,22 +1834,23 @@ def member_notifications(request):
     
     notifications = member.notifications.all()
     
-    # Mark as read if requested
-    if request.method == 'POST' and 'mark_read' in request.POST:
-        notification_id = request.POST.get('notification_id')
-        if notification_id:
-            try:
-                notification = Notification.objects.get(id=notification_id, member=member)
-                notification.is_read = True
-                notification.save()
+    if request.method == 'POST':
+        # Mark as read if requested
+        if 'mark_all_read' in request.POST:
+            updated = mark_all_read(member)
+            if updated:
+                messages.success(request, f'{updated} notifikasi ditandai sebagai sudah dibaca.')
+            return redirect('main:member_notifications')
+        if 'mark_read' in request.POST:
+            notification_id = request.POST.get('notification_id')
+            if notification_id and notification_id.isdigit() and mark_read(member, int(notification_id)):
                 messages.success(request, 'Notifikasi ditandai sebagai sudah dibaca.')
-            except Notification.DoesNotExist:
-                pass
     
     context = {
         'page_title': 'Notifikasi - Dashboard',
         'member': member,
         'notifications': notifications,
+        'unread_notifications_count': unread_count(member),
     }
     return render(request, 'dashboard/notifications.html', context)
 
@@ -1,5 +1,8 @@
 """
 ASGI config for rangbot_system project.
+
+Dibutuhkan untuk endpoint streaming (Server-Sent Events) data sensor realtime.
+Jalankan dengan server ASGI, contoh: uvicorn rangbot_system.asgi:application
 """
 
 import os
@@ -4,6 +4,7 @@ Django settings for rangbot_system project.
 
 from pathlib import Path
 import os
+import sys
 
 # Try to import decouple, fallback if not available
 try:
@@ -71,6 +72,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'main.identity.IdentityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,6 +90,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'main.context_processors.member_notifications',
             ],
         },
     },
@@ -161,3 +164,100 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', 'noreply@rangbot.com')
 SERVER_EMAIL = config('SERVER_EMAIL', DEFAULT_FROM_EMAIL)
 
+# Activity Log
+# Log aktivitas di-buffer dan ditulis batch (bulk_create). Set False untuk menulis langsung.
+# Saat `manage.py test` default-nya langsung: TestCase tidak menjalankan transaction.on_commit,
+# sehingga entri yang menunggu commit untuk masuk buffer tidak pernah tertulis
+TESTING = sys.argv[1:2] == ['test']
+ACTIVITY_LOG_ASYNC = config('ACTIVITY_LOG_ASYNC', default=not TESTING, cast=bool)
+ACTIVITY_LOG_BUFFER_SIZE = config('ACTIVITY_LOG_BUFFER_SIZE', default=50, cast=int)
+ACTIVITY_LOG_FLUSH_INTERVAL = config('ACTIVITY_LOG_FLUSH_INTERVAL', default=2.0, cast=float)
+
+# Retensi Activity Log (python manage.py prune_activity_logs)
+# Log yang lebih tua dari ACTIVITY_LOG_RETENTION_DAYS diarsipkan ke .jsonl.gz lalu dihapus
+ACTIVITY_LOG_RETENTION_DAYS = config('ACTIVITY_LOG_RETENTION_DAYS', default=180, cast=int)
+ACTIVITY_LOG_ARCHIVE_DIR = config('ACTIVITY_LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archives' / 'activity_logs'))
+ACTIVITY_LOG_DELETE_CHUNK_SIZE = config('ACTIVITY_LOG_DELETE_CHUNK_SIZE', default=5000, cast=int)
+
+# Forum view counter
+# View postingan forum di-buffer lalu ditulis dengan UPDATE views = views + n setiap FORUM_VIEW_FLUSH_INTERVAL detik
+# Backend: 'memory' (per proses) atau 'cache' (Django cache bersama, flush juga lewat: python manage.py flush_forum_views)
+FORUM_VIEW_COUNTER_BACKEND = config('FORUM_VIEW_COUNTER_BACKEND', default='memory')
+FORUM_VIEW_FLUSH_INTERVAL = config('FORUM_VIEW_FLUSH_INTERVAL', default=30.0, cast=float)
+# Backend 'cache': thread flusher di setiap proses web; flush memakai lock sehingga hanya satu yang berjalan
+FORUM_VIEW_FLUSH_IN_PROCESS = config('FORUM_VIEW_FLUSH_IN_PROCESS', default=True, cast=bool)
+
+# Admin dashboard stats
+# Statistik dashboard di-cache per tabel dan dihapus otomatis lewat signal; TTL sebagai batas atas
+DASHBOARD_STATS_CACHE_TTL = config('DASHBOARD_STATS_CACHE_TTL', default=300, cast=int)
+
+# Device telemetry API
+# Jumlah maksimal pembacaan sensor per request ke /api/devices/<serial_number>/telemetry/
+TELEMETRY_MAX_BATCH = config('TELEMETRY_MAX_BATCH', default=5000, cast=int)
+# Rollup menit/jam/hari diperbarui langsung saat data masuk; jika False gunakan: python manage.py compact_sensor_rollups
+SENSOR_ROLLUP_ON_INGEST = config('SENSOR_ROLLUP_ON_INGEST', default=True, cast=bool)
+
+# Realtime (Server-Sent Events, butuh server ASGI: uvicorn rangbot_system.asgi:application)
+# Di runserver/WSGI endpoint stream menjawab 204 dan halaman sensor me-refresh grafik setiap menit
+# Broker default hanya menjangkau koneksi di proses yang sama; ganti dengan broker bersama untuk banyak worker
+REALTIME_BROKER = config('REALTIME_BROKER', default='main.realtime.InProcessBroker')
+SSE_KEEPALIVE_INTERVAL = config('SSE_KEEPALIVE_INTERVAL', default=15.0, cast=float)
+SSE_MAX_DURATION = config('SSE_MAX_DURATION', default=300.0, cast=float)
+# Deteksi dari run_detection_worker dibaca dari database setiap N detik (0 = nonaktif)
+SSE_DETECTION_POLL_INTERVAL = config('SSE_DETECTION_POLL_INTERVAL', default=3.0, cast=float)
+
+# Deteksi penyakit (python manage.py run_detection_worker)
+# DETECTION_BACKEND: subclass main.detection.DetectionBackend; default backend dummy untuk development
+DETECTION_BACKEND = config('DETECTION_BACKEND', default='main.detection.DummyDetectionBackend')
+DETECTION_WORKERS = config('DETECTION_WORKERS', default=2, cast=int)
+DETECTION_BATCH_SIZE = config('DETECTION_BATCH_SIZE', default=8, cast=int)
+DETECTION_BATCH_WAIT = config('DETECTION_BATCH_WAIT', default=0.2, cast=float)
+DETECTION_POLL_INTERVAL = config('DETECTION_POLL_INTERVAL', default=1.0, cast=float)
+
+# Penyimpanan foto (content-addressed, thumbnail WebP dibuat di background thread pool)
+# Foto yang belum punya thumbnail: python manage.py generate_image_derivatives
+IMAGE_PIPELINE_ASYNC = config('IMAGE_PIPELINE_ASYNC', default=True, cast=bool)
+IMAGE_PIPELINE_WORKERS = config('IMAGE_PIPELINE_WORKERS', default=2, cast=int)
+IMAGE_THUMBNAIL_SIZE = config('IMAGE_THUMBNAIL_SIZE', default=320, cast=int)
+IMAGE_INFERENCE_SIZE = config('IMAGE_INFERENCE_SIZE', default=1024, cast=int)
+
+# Export streaming (CSV/NDJSON): jumlah baris yang dibaca per query
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Provisioning perangkat saat verifikasi purchase order
+# Jumlah unit per bulk_create (perangkat + ActivityLog); order ribuan unit tetap beberapa query saja
+DEVICE_PROVISION_BATCH_SIZE = config('DEVICE_PROVISION_BATCH_SIZE', default=500, cast=int)
+
+# Cache konten publik (FAQ, paket produk, postingan forum terbaru), diinvalidasi lewat versi
+# Hanya aktif dengan cache bersama (REDIS_URL); dengan LocMemCache konten dibaca dari database setiap request
+CONTENT_CACHE_TTL = config('CONTENT_CACHE_TTL', default=3600, cast=int)
+# Cache HTML landing page untuk pengunjung tanpa session
+PAGE_CACHE_TTL = config('PAGE_CACHE_TTL', default=300, cast=int)
+
+# Login: percobaan gagal dihitung per IP; setelah LOGIN_MAX_FAILURES kali dalam
+# LOGIN_FAILURE_WINDOW detik login ditolak sebelum query dan hashing password
+LOGIN_MAX_FAILURES = config('LOGIN_MAX_FAILURES', default=10, cast=int)
+LOGIN_FAILURE_WINDOW = config('LOGIN_FAILURE_WINDOW', default=300, cast=int)
+
+# Cache
+# Beberapa worker (gunicorn --workers N) butuh cache bersama agar invalidasi dari satu worker terlihat di
+# worker lain: REDIS_URL=redis://localhost:6379/1. Tanpa REDIS_URL dipakai LocMemCache per proses dan
+# cache lintas request yang bergantung pada invalidasi (identitas login, konten publik) dilewati
+# (lihat main/shared_cache.py)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Identitas login (Admin/CS/Member/pengguna forum) di-cache per akun; dihapus saat akun diubah
+# Hanya aktif dengan cache bersama (REDIS_URL); dengan LocMemCache akun dibaca sekali per request
+IDENTITY_CACHE_TTL = config('IDENTITY_CACHE_TTL', default=60, cast=int)
+
+# Hashing password (login/registrasi async) di thread pool khusus; jika berjalan + antre
+# mencapai PASSWORD_HASH_MAX_PENDING, request baru dibalas 503 alih-alih menumpuk
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=4, cast=int)
+PASSWORD_HASH_MAX_PENDING = config('PASSWORD_HASH_MAX_PENDING', default=64, cast=int)
+
+# Fan-out notifikasi ke banyak member: jumlah member per bulk_create + UPDATE counter
+NOTIFICATION_FANOUT_CHUNK_SIZE = config('NOTIFICATION_FANOUT_CHUNK_SIZE', default=1000, cast=int)